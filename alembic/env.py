@@ -8,6 +8,14 @@ import os
 from api.database.base import Base
 from api.models.customer import Customer  # noqa: F401
 from api.models.bank_account import BankAccount  # noqa: F401
+from api.models.administrative_entity import AdministrativeEntity  # noqa: F401
+from api.models.transaction import Transaction  # noqa: F401
+from api.models.account_balance_shard import AccountBalanceShard  # noqa: F401
+from api.models.ledger_entry import LedgerEntry  # noqa: F401
+from api.models.balance_checkpoint import BalanceCheckpoint  # noqa: F401
+from api.models.idempotency_key import IdempotencyKey  # noqa: F401
+from api.models.account_number_counter import AccountNumberCounter  # noqa: F401
+from api.models.transaction_rollup import RollupWatermark, TransactionRollup  # noqa: F401
 
 from dotenv import load_dotenv
 
@@ -39,7 +47,7 @@ if config.config_file_name is not None:
 # for 'autogenerate' support
 # from myapp import mymodel
 # target_metadata = mymodel.Base.metadata
-target_metadata = None
+target_metadata = Base.metadata
 
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
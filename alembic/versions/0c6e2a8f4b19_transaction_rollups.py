@@ -0,0 +1,46 @@
+"""transaction rollups
+
+Revision ID: 0c6e2a8f4b19
+Revises: f3b9d6e1a284
+Create Date: 2026-10-18 18:12:44.305917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0c6e2a8f4b19'
+down_revision: Union[str, None] = 'f3b9d6e1a284'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Both enum types already exist, created with the transactions and ledger_entries tables.
+    op.create_table('transaction_rollups',
+    sa.Column('account_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('transaction_type', postgresql.ENUM('TRANSFER', 'DEPOSIT', 'WITHDRAW', name='transactiontype', create_type=False), nullable=False),
+    sa.Column('entry_type', postgresql.ENUM('DEBIT', 'CREDIT', name='entrytype', create_type=False), nullable=False),
+    sa.Column('transaction_count', sa.Integer(), nullable=False),
+    sa.Column('total_amount', sa.Numeric(precision=18, scale=2), nullable=False),
+    sa.Column('min_amount', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('max_amount', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.ForeignKeyConstraint(['account_id'], ['bank_accounts.id'], ),
+    sa.PrimaryKeyConstraint('account_id', 'day', 'transaction_type', 'entry_type')
+    )
+    op.create_table('rollup_watermarks',
+    sa.Column('name', sa.String(length=64), nullable=False),
+    sa.Column('last_transaction_id', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('rollup_watermarks')
+    op.drop_table('transaction_rollups')
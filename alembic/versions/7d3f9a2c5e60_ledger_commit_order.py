@@ -0,0 +1,40 @@
+"""ledger commit order
+
+Revision ID: 7d3f9a2c5e60
+Revises: 0c6e2a8f4b19
+Create Date: 2026-10-18 20:05:31.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d3f9a2c5e60'
+down_revision: Union[str, None] = '0c6e2a8f4b19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Adding the column waits for every transaction that wrote entries, so the existing rows are all
+    # committed: xid 0 keeps them in id order, before any new row. Existing checkpoints point at (0, last_entry_id).
+    op.add_column('ledger_entries', sa.Column('xid', sa.BigInteger(), server_default='0', nullable=False))
+    op.add_column('balance_checkpoints', sa.Column('last_xid', sa.BigInteger(), server_default='0', nullable=False))
+    if op.get_context().dialect.name == 'postgresql':
+        # Rows inserted outside the ORM get the xid of their transaction too.
+        op.alter_column('ledger_entries', 'xid', server_default=sa.text('(pg_current_xact_id()::text::bigint)'))
+
+    op.drop_index('ix_ledger_entries_account_id_id', table_name='ledger_entries')
+    op.create_index('ix_ledger_entries_account_id_xid_id', 'ledger_entries', ['account_id', 'xid', 'id'], unique=False)
+    op.create_index('ix_ledger_entries_xid_id', 'ledger_entries', ['xid', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_ledger_entries_xid_id', table_name='ledger_entries')
+    op.drop_index('ix_ledger_entries_account_id_xid_id', table_name='ledger_entries')
+    op.create_index('ix_ledger_entries_account_id_id', 'ledger_entries', ['account_id', 'id'], unique=False)
+    op.drop_column('balance_checkpoints', 'last_xid')
+    op.drop_column('ledger_entries', 'xid')
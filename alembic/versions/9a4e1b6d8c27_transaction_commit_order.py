@@ -0,0 +1,36 @@
+"""transaction commit order
+
+Revision ID: 9a4e1b6d8c27
+Revises: 7d3f9a2c5e60
+Create Date: 2026-10-18 20:41:12.630945
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a4e1b6d8c27'
+down_revision: Union[str, None] = '7d3f9a2c5e60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # As for the ledger entries: the existing transactions are all committed once the column is added,
+    # xid 0 keeps them in id order and the watermark at (0, last_transaction_id) keeps its meaning.
+    # On Postgres the column, its default and the index are added to the partitioned parent, which
+    # passes them on to every partition.
+    op.add_column('transactions', sa.Column('xid', sa.BigInteger(), server_default='0', nullable=False))
+    op.add_column('rollup_watermarks', sa.Column('last_xid', sa.BigInteger(), server_default='0', nullable=False))
+    if op.get_context().dialect.name == 'postgresql':
+        op.alter_column('transactions', 'xid', server_default=sa.text('(pg_current_xact_id()::text::bigint)'))
+    op.create_index('ix_transactions_xid_id', 'transactions', ['xid', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_transactions_xid_id', table_name='transactions')
+    op.drop_column('rollup_watermarks', 'last_xid')
+    op.drop_column('transactions', 'xid')
@@ -0,0 +1,27 @@
+"""rollup watermark caught up at
+
+Revision ID: a3c7e9d1f254
+Revises: f6d2b9a4c185
+Create Date: 2026-10-18 22:41:06.218513
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c7e9d1f254'
+down_revision: Union[str, None] = 'f6d2b9a4c185'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('rollup_watermarks', sa.Column('caught_up_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('rollup_watermarks') as batch_op:
+        batch_op.drop_column('caught_up_at')
@@ -0,0 +1,28 @@
+"""account status index
+
+Revision ID: b2c8e5f1d730
+Revises: 9a4e1b6d8c27
+Create Date: 2026-10-18 21:24:06.187342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2c8e5f1d730'
+down_revision: Union[str, None] = '9a4e1b6d8c27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Serves the account listing filtered by status alone. Built concurrently like the other listing indexes.
+    with op.get_context().autocommit_block():
+        op.create_index('ix_bank_accounts_status_id', 'bank_accounts', ['status', 'id'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_bank_accounts_status_id', table_name='bank_accounts')
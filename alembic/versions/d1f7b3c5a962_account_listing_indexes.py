@@ -0,0 +1,32 @@
+"""account listing indexes
+
+Revision ID: d1f7b3c5a962
+Revises: c4d2a9b7e318
+Create Date: 2026-10-18 09:12:41.203118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd1f7b3c5a962'
+down_revision: Union[str, None] = 'c4d2a9b7e318'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Built concurrently on Postgres so the accounts table stays writable meanwhile.
+    with op.get_context().autocommit_block():
+        op.create_index('ix_bank_accounts_account_type_status_id', 'bank_accounts', ['account_type', 'status', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_bank_accounts_customer_id_id', 'bank_accounts', ['customer_id', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_bank_accounts_administrative_entity_id_id', 'bank_accounts', ['administrative_entity_id', 'id'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_bank_accounts_administrative_entity_id_id', table_name='bank_accounts')
+    op.drop_index('ix_bank_accounts_customer_id_id', table_name='bank_accounts')
+    op.drop_index('ix_bank_accounts_account_type_status_id', table_name='bank_accounts')
@@ -0,0 +1,35 @@
+"""account number allocation
+
+Revision ID: e5a8c2d4f017
+Revises: d1f7b3c5a962
+Create Date: 2026-10-18 14:03:27.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a8c2d4f017'
+down_revision: Union[str, None] = 'd1f7b3c5a962'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('account_number_counters',
+    sa.Column('name', sa.String(length=64), nullable=False),
+    sa.Column('last_value', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    # Only Postgres has sequences; other databases allocate from the counter table.
+    if op.get_context().dialect.name == 'postgresql':
+        op.execute(sa.schema.CreateSequence(sa.Sequence('account_number_seq')))
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name == 'postgresql':
+        op.execute(sa.schema.DropSequence(sa.Sequence('account_number_seq')))
+    op.drop_table('account_number_counters')
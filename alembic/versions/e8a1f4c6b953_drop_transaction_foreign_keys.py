@@ -0,0 +1,41 @@
+"""drop transaction foreign keys
+
+Revision ID: e8a1f4c6b953
+Revises: b2c8e5f1d730
+Create Date: 2026-10-18 21:47:53.902164
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8a1f4c6b953'
+down_revision: Union[str, None] = 'b2c8e5f1d730'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The foreign keys were created without a name; batch mode names them after this convention
+# when it reflects the table, so they can be dropped.
+NAMING_CONVENTION = {"fk": "fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s"}
+TABLES = ('ledger_entries', 'idempotency_keys')
+
+
+def upgrade() -> None:
+    # partition_transactions_by_month already dropped them on Postgres. Other databases drop them
+    # here, so every schema matches the models, which archive transactions without their entries and keys.
+    if op.get_context().dialect.name == 'postgresql':
+        return
+    for table in TABLES:
+        with op.batch_alter_table(table, naming_convention=NAMING_CONVENTION) as batch_op:
+            batch_op.drop_constraint(f'fk_{table}_transaction_id_transactions', type_='foreignkey')
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name == 'postgresql':
+        return
+    for table in TABLES:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.create_foreign_key(f'fk_{table}_transaction_id_transactions', 'transactions', ['transaction_id'], ['id'])
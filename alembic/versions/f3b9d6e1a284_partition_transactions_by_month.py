@@ -0,0 +1,126 @@
+"""partition transactions by month
+
+Revision ID: f3b9d6e1a284
+Revises: e5a8c2d4f017
+Create Date: 2026-10-18 16:41:09.774512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b9d6e1a284'
+down_revision: Union[str, None] = 'e5a8c2d4f017'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Partitions created up front after the current month; the maintenance job
+# (api.jobs.transaction_partitions) keeps creating them from then on.
+MONTHS_AHEAD = 3
+
+
+def upgrade() -> None:
+    # Only Postgres supports declarative partitioning; other databases keep the plain table.
+    if op.get_context().dialect.name != 'postgresql':
+        return
+
+    # The primary key of a partitioned table must contain the partition key, so transactions.id
+    # alone is no longer unique in the eyes of Postgres and cannot be the target of a foreign key.
+    # Ids still come from a single sequence.
+    op.drop_constraint('ledger_entries_transaction_id_fkey', 'ledger_entries', type_='foreignkey')
+    op.drop_constraint('idempotency_keys_transaction_id_fkey', 'idempotency_keys', type_='foreignkey')
+
+    op.execute('ALTER TABLE transactions RENAME TO transactions_unpartitioned')
+    op.execute('ALTER INDEX transactions_pkey RENAME TO transactions_unpartitioned_pkey')
+    op.drop_index('ix_transactions_id', table_name='transactions_unpartitioned')
+    op.drop_index('ix_transactions_source_account_id_timestamp_id', table_name='transactions_unpartitioned')
+    op.drop_index('ix_transactions_destination_account_id_timestamp_id', table_name='transactions_unpartitioned')
+    op.execute('ALTER SEQUENCE transactions_id_seq OWNED BY NONE')
+
+    op.execute("""
+        CREATE TABLE transactions (
+            id INTEGER NOT NULL DEFAULT nextval('transactions_id_seq'),
+            amount NUMERIC(10, 2) NOT NULL,
+            timestamp TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT (now() AT TIME ZONE 'utc'),
+            transaction_type transactiontype NOT NULL,
+            source_account_id INTEGER REFERENCES bank_accounts (id),
+            destination_account_id INTEGER REFERENCES bank_accounts (id),
+            PRIMARY KEY (id, timestamp)
+        ) PARTITION BY RANGE (timestamp)
+    """)
+    op.execute('ALTER SEQUENCE transactions_id_seq OWNED BY transactions.id')
+
+    # One partition per month from the oldest transaction up to MONTHS_AHEAD months from now, and a
+    # default partition catching anything outside of them.
+    op.execute(f"""
+        DO $$
+        DECLARE
+            month date;
+        BEGIN
+            FOR month IN
+                SELECT generate_series(
+                    date_trunc('month', coalesce((SELECT min(timestamp) FROM transactions_unpartitioned), now())),
+                    date_trunc('month', now()) + interval '{MONTHS_AHEAD} months',
+                    interval '1 month'
+                )::date
+            LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF transactions FOR VALUES FROM (%L) TO (%L)',
+                    'transactions_' || to_char(month, '"y"YYYY"m"MM'), month, (month + interval '1 month')::date
+                );
+            END LOOP;
+        END $$
+    """)
+    op.execute('CREATE TABLE transactions_default PARTITION OF transactions DEFAULT')
+
+    op.execute("""
+        INSERT INTO transactions (id, amount, timestamp, transaction_type, source_account_id, destination_account_id)
+        SELECT id, amount, coalesce(timestamp, now() AT TIME ZONE 'utc'), transaction_type, source_account_id, destination_account_id
+        FROM transactions_unpartitioned
+    """)
+    op.drop_table('transactions_unpartitioned')
+
+    # Created on the parent, so every partition (existing and future) gets them.
+    op.create_index('ix_transactions_id', 'transactions', ['id'], unique=False)
+    op.create_index('ix_transactions_source_account_id_timestamp_id', 'transactions', ['source_account_id', 'timestamp', 'id'], unique=False)
+    op.create_index('ix_transactions_destination_account_id_timestamp_id', 'transactions', ['destination_account_id', 'timestamp', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name != 'postgresql':
+        return
+
+    op.execute('ALTER TABLE transactions RENAME TO transactions_partitioned')
+    op.execute('ALTER INDEX transactions_pkey RENAME TO transactions_partitioned_pkey')
+    op.drop_index('ix_transactions_id', table_name='transactions_partitioned')
+    op.drop_index('ix_transactions_source_account_id_timestamp_id', table_name='transactions_partitioned')
+    op.drop_index('ix_transactions_destination_account_id_timestamp_id', table_name='transactions_partitioned')
+    op.execute('ALTER SEQUENCE transactions_id_seq OWNED BY NONE')
+
+    op.execute("""
+        CREATE TABLE transactions (
+            id INTEGER NOT NULL DEFAULT nextval('transactions_id_seq') PRIMARY KEY,
+            amount NUMERIC(10, 2) NOT NULL,
+            timestamp TIMESTAMP WITHOUT TIME ZONE,
+            transaction_type transactiontype NOT NULL,
+            source_account_id INTEGER REFERENCES bank_accounts (id),
+            destination_account_id INTEGER REFERENCES bank_accounts (id)
+        )
+    """)
+    op.execute('ALTER SEQUENCE transactions_id_seq OWNED BY transactions.id')
+    op.execute("""
+        INSERT INTO transactions (id, amount, timestamp, transaction_type, source_account_id, destination_account_id)
+        SELECT id, amount, timestamp, transaction_type, source_account_id, destination_account_id
+        FROM transactions_partitioned
+    """)
+    # Dropping the parent drops every partition with it.
+    op.drop_table('transactions_partitioned')
+
+    op.create_index('ix_transactions_id', 'transactions', ['id'], unique=False)
+    op.create_index('ix_transactions_source_account_id_timestamp_id', 'transactions', ['source_account_id', 'timestamp', 'id'], unique=False)
+    op.create_index('ix_transactions_destination_account_id_timestamp_id', 'transactions', ['destination_account_id', 'timestamp', 'id'], unique=False)
+    op.create_foreign_key('ledger_entries_transaction_id_fkey', 'ledger_entries', 'transactions', ['transaction_id'], ['id'])
+    op.create_foreign_key('idempotency_keys_transaction_id_fkey', 'idempotency_keys', 'transactions', ['transaction_id'], ['id'])
@@ -0,0 +1,26 @@
+"""transaction rollups day index
+
+Revision ID: f6d2b9a4c185
+Revises: e8a1f4c6b953
+Create Date: 2026-10-18 22:10:37.441985
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6d2b9a4c185'
+down_revision: Union[str, None] = 'e8a1f4c6b953'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_transaction_rollups_day', 'transaction_rollups', ['day'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_transaction_rollups_day', table_name='transaction_rollups')
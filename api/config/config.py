@@ -28,8 +28,125 @@ print(f"DB URL: {DATABASE_URL}")
 
 DEBUG = os.getenv("DEBUG", "False") == "True"
 
+# Logging of the API process: records go through a queue of LOG_QUEUE_SIZE records (dropped when
+# full) to a background writer. LOG_FORMAT is "json" or "text". LOG_SAMPLE_RATES keeps a fraction
+# of the DEBUG records of a logger and its children, e.g. "api.services.transaction_service=0.01".
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+LOG_SAMPLE_RATES = {
+    name.strip(): float(rate)
+    for name, _, rate in (item.partition("=") for item in os.getenv("LOG_SAMPLE_RATES", "").split(","))
+    if name.strip() and rate
+}
+
+# Statements running at least this long are logged with the types of their parameters (0 disables).
+# In DEBUG mode every response also carries its statement count and database time as headers.
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))
+# Make the relationships that must be loaded eagerly raise on a lazy load, so an N+1 pattern fails
+# instead of slowing down. Enabled by the test suite; elsewhere they fall back to a lazy load.
+STRICT_LAZY_LOADS = os.getenv("STRICT_LAZY_LOADS", "False") == "True"
+
+# Comma separated URLs of read replicas serving the read-only routes. Replicas lagging more than
+# REPLICA_MAX_LAG_SECONDS behind the primary are skipped; requests sent with "X-Read-From: primary"
+# always read from the primary (e.g. right after a write).
+DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "5"))
+REPLICA_LAG_CHECK_INTERVAL_SECONDS = float(os.getenv("REPLICA_LAG_CHECK_INTERVAL_SECONDS", "1"))
+# Connect timeout of the replica engines (whole seconds), so a replica that is down fails its lag check fast.
+REPLICA_CONNECT_TIMEOUT_SECONDS = int(os.getenv("REPLICA_CONNECT_TIMEOUT_SECONDS", "2"))
+
 
 # I am keeping these as environment variables just to simplify the service.
 # In a real-world scenario, these would be configured in the database.
 CASH_HOLDING_ACCOUNT_ID = int(os.getenv('CASH_HOLDING_ACCOUNT_ID', '999999999999'))
 CASH_DISBURSEMENT_ACCOUNT_ID = int(os.getenv('CASH_DISBURSEMENT_ACCOUNT_ID', '999999999998'))
+
+# Upper bound for the number of movements accepted by a single batch transfer request.
+TRANSFER_BATCH_MAX_SIZE = int(os.getenv('TRANSFER_BATCH_MAX_SIZE', '50000'))
+
+# Rows validated, inserted and committed together by the bulk onboarding endpoints.
+ONBOARDING_CHUNK_SIZE = int(os.getenv('ONBOARDING_CHUNK_SIZE', '1000'))
+
+# How new account numbers are generated. "sequence": prefix, sequence value and Luhn check digit,
+# with ACCOUNT_NUMBER_BLOCK_SIZE sequence values reserved per database round trip (Postgres);
+# "uuid": the original prefix and random hex digits.
+ACCOUNT_NUMBER_SCHEME = os.getenv('ACCOUNT_NUMBER_SCHEME', 'sequence')
+ACCOUNT_NUMBER_BLOCK_SIZE = int(os.getenv('ACCOUNT_NUMBER_BLOCK_SIZE', '1000'))
+
+# Retry policy for money movements aborted by deadlocks or serialization failures.
+LOCK_RETRY_MAX_ATTEMPTS = int(os.getenv('LOCK_RETRY_MAX_ATTEMPTS', '5'))
+LOCK_RETRY_BASE_DELAY_MS = int(os.getenv('LOCK_RETRY_BASE_DELAY_MS', '10'))
+LOCK_RETRY_MAX_DELAY_MS = int(os.getenv('LOCK_RETRY_MAX_DELAY_MS', '200'))
+
+# Number of balance shards per administrative account. 0 disables striping and every
+# movement locks the administrative account row directly.
+ADMIN_BALANCE_SHARDS = int(os.getenv('ADMIN_BALANCE_SHARDS', '0'))
+SHARD_CONSOLIDATION_INTERVAL_SECONDS = int(os.getenv('SHARD_CONSOLIDATION_INTERVAL_SECONDS', '60'))
+
+# Ledger balance checkpoints, advanced in commit order (see api.database.commit_order).
+LEDGER_CHECKPOINT_INTERVAL_SECONDS = int(os.getenv('LEDGER_CHECKPOINT_INTERVAL_SECONDS', '300'))
+
+# Monthly partitions of the transactions table (Postgres only). The maintenance job keeps the partitions
+# of the current and the next TRANSACTION_PARTITION_MONTHS_AHEAD months created (0 interval disables it);
+# archived partitions are exported to TRANSACTION_ARCHIVE_DIR.
+TRANSACTION_PARTITION_MONTHS_AHEAD = int(os.getenv('TRANSACTION_PARTITION_MONTHS_AHEAD', '3'))
+TRANSACTION_PARTITION_INTERVAL_SECONDS = int(os.getenv('TRANSACTION_PARTITION_INTERVAL_SECONDS', '86400'))
+TRANSACTION_ARCHIVE_DIR = os.getenv('TRANSACTION_ARCHIVE_DIR', './archive')
+# Creating and detaching partitions takes an ACCESS EXCLUSIVE lock on transactions: each statement waits at
+# most TRANSACTION_PARTITION_LOCK_TIMEOUT_MS for the lock and is tried up to TRANSACTION_PARTITION_DDL_ATTEMPTS times.
+TRANSACTION_PARTITION_LOCK_TIMEOUT_MS = int(os.getenv('TRANSACTION_PARTITION_LOCK_TIMEOUT_MS', '2000'))
+TRANSACTION_PARTITION_DDL_ATTEMPTS = int(os.getenv('TRANSACTION_PARTITION_DDL_ATTEMPTS', '10'))
+
+# Daily reporting rollups of the administrative accounts, caught up from the transactions after a
+# watermark every TRANSACTION_ROLLUP_INTERVAL_SECONDS (0 disables it), TRANSACTION_ROLLUP_BATCH_SIZE
+# transactions per commit, in commit order (see api.database.commit_order).
+TRANSACTION_ROLLUP_INTERVAL_SECONDS = int(os.getenv('TRANSACTION_ROLLUP_INTERVAL_SECONDS', '60'))
+TRANSACTION_ROLLUP_BATCH_SIZE = int(os.getenv('TRANSACTION_ROLLUP_BATCH_SIZE', '10000'))
+# Days of a report: the last REPORT_DEFAULT_DAYS when no range is given, at most REPORT_MAX_DAYS.
+REPORT_DEFAULT_DAYS = int(os.getenv('REPORT_DEFAULT_DAYS', '31'))
+REPORT_MAX_DAYS = int(os.getenv('REPORT_MAX_DAYS', '366'))
+
+# Keyset pagination and streaming of the transaction history.
+TRANSACTION_PAGE_MAX_LIMIT = int(os.getenv('TRANSACTION_PAGE_MAX_LIMIT', '1000'))
+TRANSACTION_STREAM_BATCH_SIZE = int(os.getenv('TRANSACTION_STREAM_BATCH_SIZE', '1000'))
+# Keyset pagination of the account listing.
+ACCOUNT_PAGE_DEFAULT_LIMIT = int(os.getenv('ACCOUNT_PAGE_DEFAULT_LIMIT', '100'))
+ACCOUNT_PAGE_MAX_LIMIT = int(os.getenv('ACCOUNT_PAGE_MAX_LIMIT', '1000'))
+# Rows fetched per round trip by the list endpoints, which encode plain rows straight to JSON.
+LIST_FETCH_BATCH_SIZE = int(os.getenv('LIST_FETCH_BATCH_SIZE', '1000'))
+
+# "sync" serves requests from the threadpool with the blocking driver, "async" uses an
+# AsyncSession on asyncpg (aiosqlite for the sqlite environments).
+DATABASE_MODE = os.getenv("DATABASE_MODE", "sync")
+
+# Connection pool settings (ignored for sqlite). Size the pool per uvicorn worker:
+# pool_size + max_overflow connections per process.
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '5'))
+DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', '10'))
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '30'))
+# Recycle connections older than this many seconds (-1 disables), so connections opened
+# before a failover are eventually replaced.
+DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '1800'))
+# Test connections on checkout and transparently replace the ones that went stale.
+DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'True') == 'True'
+
+# Idempotency keys remembered per process; older keys are still found in the database.
+IDEMPOTENCY_CACHE_SIZE = int(os.getenv('IDEMPOTENCY_CACHE_SIZE', '10000'))
+
+# How money movements update balances. "pessimistic" locks the account rows with SELECT ... FOR UPDATE
+# and validates in Python; "conditional" moves the money with guarded UPDATE ... WHERE balance >= amount
+# statements and treats an unmatched row as the validation failure.
+TRANSACTION_ENGINE_MODE = os.getenv('TRANSACTION_ENGINE_MODE', 'pessimistic')
+
+# Group commit: queue money movements to one writer thread per process, which applies up to
+# GROUP_COMMIT_MAX_BATCH of them, or whatever arrived within GROUP_COMMIT_MAX_DELAY_MS, per commit.
+GROUP_COMMIT_ENABLED = os.getenv('GROUP_COMMIT_ENABLED', 'False') == 'True'
+GROUP_COMMIT_MAX_DELAY_MS = int(os.getenv('GROUP_COMMIT_MAX_DELAY_MS', '2'))
+GROUP_COMMIT_MAX_BATCH = int(os.getenv('GROUP_COMMIT_MAX_BATCH', '100'))
+
+# Per process cache of account metadata (type, owner, number, status) used to reject invalid
+# movements before locking. Closing an account in another process is seen after at most the TTL;
+# the locked rows are always checked again.
+ACCOUNT_METADATA_CACHE_SIZE = int(os.getenv('ACCOUNT_METADATA_CACHE_SIZE', '10000'))
+ACCOUNT_METADATA_CACHE_TTL_SECONDS = float(os.getenv('ACCOUNT_METADATA_CACHE_TTL_SECONDS', '60'))
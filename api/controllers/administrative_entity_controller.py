@@ -1,10 +1,15 @@
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from api.database.session import get_db
+from api.database.session import get_db, get_read_db
 from api.services.administrative_entity_service import AdministrativeEntityService
 from api.dao.administrative_entity_dao import AdministrativeEntityDAO
-from api.schemas.administrative_entity_schema import AdministrativeEntityCreate, AdministrativeEntityResponse, AdministrativeEntityListResponse
+from api.schemas.administrative_entity_schema import (
+    AdministrativeEntityCreate,
+    AdministrativeEntityResponse,
+    AdministrativeEntityListResponse,
+    AdministrativeEntityPortfolioResponse,
+)
 
 router = APIRouter()
 
@@ -21,7 +26,7 @@ def create_corporate_entity(entity_data: AdministrativeEntityCreate, db: Session
 
 
 @router.get("/administrative-entities", response_model=List[AdministrativeEntityListResponse])
-def list_all_administrative_entities(db: Session = Depends(get_db)):
+def list_all_administrative_entities(db: Session = Depends(get_read_db)):
     """
     List all administrative entities.
     """
@@ -37,7 +42,7 @@ def list_all_administrative_entities(db: Session = Depends(get_db)):
 
 
 @router.get("/administrative_entity/{entity_id}", response_model=AdministrativeEntityResponse)
-def get_corporate_entity_details(entity_id: int, db: Session = Depends(get_db)):
+def get_corporate_entity_details(entity_id: int, db: Session = Depends(get_read_db)):
     """
     Get details of a specific administrative entity by its ID.
     """
@@ -52,3 +57,18 @@ def get_corporate_entity_details(entity_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/administrative_entity/{entity_id}/portfolio", response_model=AdministrativeEntityPortfolioResponse)
+def get_corporate_entity_portfolio(entity_id: int, db: Session = Depends(get_read_db)):
+    """
+    Get an administrative entity together with its accounts and their current balances.
+    """
+    try:
+        entity_service = AdministrativeEntityService(AdministrativeEntityDAO())
+        return entity_service.get_administrative_entity_portfolio(db, entity_id)
+
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,81 @@
+"""
+Async variants of the API routers.
+
+Every route declared with a sync Session (db: Session = Depends(get_db) or get_read_db) gets an async
+twin that depends on an AsyncSession instead and runs the very same endpoint code with
+AsyncSession.run_sync. The DAOs and services are therefore shared by both modes, while
+in async mode the database I/O is awaited on the event loop instead of blocking a
+threadpool worker for every in-flight request. Everything else the endpoint does (validation,
+serialization, service logic) runs on the event loop itself and holds up every other request
+while it runs.
+"""
+import functools
+import inspect
+from itertools import islice
+from fastapi import APIRouter, Depends
+from fastapi.params import Depends as DependsParam
+from sqlalchemy.ext.asyncio import AsyncSession
+from api.database.async_session import get_async_db, get_async_read_db
+from api.database.session import get_db, get_read_db
+from api.utils.responses import NDJSONResponse
+
+STREAM_CHUNK_SIZE = 500
+
+ASYNC_SESSION_DEPENDENCIES = {get_db: get_async_db, get_read_db: get_async_read_db}
+
+# Every setting of a route (dependencies, responses, tags, include_in_schema, ...) is copied to its
+# async twin; APIRoute keeps each add_api_route argument as an attribute of the same name.
+ROUTE_OPTIONS = tuple(
+    name for name in inspect.signature(APIRouter.add_api_route).parameters
+    if name not in ("self", "path", "endpoint", "route_class_override")
+)
+
+
+def to_async_router(router: APIRouter) -> APIRouter:
+    async_router = APIRouter()
+    for route in router.routes:
+        options = {name: getattr(route, name) for name in ROUTE_OPTIONS if hasattr(route, name)}
+        options["methods"] = list(route.methods)
+        async_router.add_api_route(route.path, to_async_endpoint(route.endpoint), **options)
+    return async_router
+
+
+def to_async_endpoint(endpoint):
+    signature = inspect.signature(endpoint)
+    db_parameter = next(
+        (
+            parameter for parameter in signature.parameters.values()
+            if isinstance(parameter.default, DependsParam) and parameter.default.dependency in ASYNC_SESSION_DEPENDENCIES
+        ),
+        None,
+    )
+    if db_parameter is None:
+        return endpoint
+
+    @functools.wraps(endpoint)
+    async def async_endpoint(**kwargs):
+        db: AsyncSession = kwargs.pop(db_parameter.name)
+        response = await db.run_sync(lambda session: endpoint(**kwargs, **{db_parameter.name: session}))
+        if isinstance(response, NDJSONResponse):
+            response.body_iterator = _iterate_in_greenlet(db, response.lines)
+        return response
+
+    async_endpoint.__signature__ = signature.replace(parameters=[
+        parameter.replace(default=Depends(ASYNC_SESSION_DEPENDENCIES[db_parameter.default.dependency]), annotation=AsyncSession)
+        if parameter is db_parameter else parameter
+        for parameter in signature.parameters.values()
+    ])
+    return async_endpoint
+
+
+async def _iterate_in_greenlet(db: AsyncSession, lines):
+    """
+    Pull a streamed response in chunks, each chunk inside run_sync, so rows read lazily
+    from the server-side cursor are fetched through the async driver.
+    """
+    while True:
+        chunk = await db.run_sync(lambda session: list(islice(lines, STREAM_CHUNK_SIZE)))
+        if not chunk:
+            break
+        for line in chunk:
+            yield line
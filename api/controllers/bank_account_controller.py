@@ -1,10 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException
+from decimal import Decimal
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from api.database.session import get_db
+from api.database.session import get_db, get_read_db
 from api.services.bank_account_service import BankAccountService
 from api.dao.bank_account_dao import BankAccountDAO
-from api.schemas.bank_account_schema import BankAccountCreate, BankAccountResponse
-from typing import List
+from api.services.ledger_service import LedgerService
+from api.models.bank_account import AccountStatus, AccountType
+from api.schemas.bank_account_schema import AccountFilter, BankAccountCreate, BankAccountResponse, AccountBalanceResponse
+from api.utils.exceptions import AccountNotFoundError
+from api.utils.pagination import decode_cursor, encode_cursor
+from api.utils.responses import FastJSONResponse
+from api.config.config import ACCOUNT_PAGE_DEFAULT_LIMIT, ACCOUNT_PAGE_MAX_LIMIT, LIST_FETCH_BATCH_SIZE
+from api.services.onboarding_service import OnboardingService
+from api.schemas.onboarding_schema import BulkCreateResponse
+from api.utils.bulk import BulkItems, bulk_response, read_bulk_items
+from datetime import datetime
+from typing import List, Optional
 
 router = APIRouter()
 
@@ -28,24 +39,92 @@ def create_account(account_data: BankAccountCreate, db: Session = Depends(get_db
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.post("/bank-accounts:bulk", response_model=BulkCreateResponse)
+def create_accounts_bulk(items: BulkItems = Depends(read_bulk_items), db: Session = Depends(get_db)):
+    """
+    Create many accounts from a JSON array, or from NDJSON (Content-Type: application/x-ndjson).
+    Account numbers are generated for every row; each row is reported individually. NDJSON
+    results are streamed back while the body is still being read.
+    """
+    try:
+        results = OnboardingService().create_accounts(db, items)
+        return bulk_response(results, items.ndjson)
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/bank-accounts/{account_id}/close", response_model=BankAccountResponse)
+def close_account(account_id: int, db: Session = Depends(get_db)):
+    """
+    Close an account. Only accounts with a zero balance can be closed; closed accounts
+    cannot send or receive money anymore.
+    """
+    try:
+        account_service = BankAccountService(BankAccountDAO())
+        return account_service.close_account(db, account_id)
+
+    except AccountNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/bank-accounts", response_model=List[BankAccountResponse])
-def list_all_accounts(db: Session = Depends(get_db)):
+def list_all_accounts(
+    limit: int = Query(ACCOUNT_PAGE_DEFAULT_LIMIT, ge=1, le=ACCOUNT_PAGE_MAX_LIMIT),
+    after: Optional[str] = None,
+    account_type: Optional[AccountType] = None,
+    status: Optional[AccountStatus] = None,
+    customer_id: Optional[int] = None,
+    administrative_entity_id: Optional[int] = None,
+    min_balance: Optional[Decimal] = None,
+    max_balance: Optional[Decimal] = None,
+    with_count: bool = False,
+    db: Session = Depends(get_read_db),
+):
     """
-    List all accounts in the system.
+    List the accounts in the system ordered by id, one page at a time.
+    - limit/after: keyset pagination; the cursor of the next page is returned in the X-Next-Cursor header
+    - account_type, status, customer_id, administrative_entity_id, min_balance, max_balance: filters;
+      a balance range is only accepted together with customer_id or administrative_entity_id
+    - with_count: total number of matching accounts in the X-Total-Count header, estimated from the
+      planner statistics on Postgres (X-Total-Count-Exact tells which one it is)
     """
     try:
         account_dao = BankAccountDAO()
-        account_service = BankAccountService(account_dao)
+        filters = AccountFilter(
+            account_type=account_type,
+            status=status,
+            customer_id=customer_id,
+            administrative_entity_id=administrative_entity_id,
+            min_balance=min_balance,
+            max_balance=max_balance,
+        )
+        after_id = _decode_account_cursor(after) if after else None
 
-        accounts = account_service.get_all_accounts(db)
-        return accounts
+        rows = list(account_dao.stream_account_rows(
+            db, LIST_FETCH_BATCH_SIZE, filters=filters, after_id=after_id, limit=limit
+        ))
+        response = FastJSONResponse.from_rows(rows)
+        if len(rows) == limit:
+            response.headers["X-Next-Cursor"] = encode_cursor([rows[-1].id])
+        if with_count:
+            count, exact = account_dao.estimate_account_count(db, filters)
+            response.headers["X-Total-Count"] = str(count)
+            response.headers["X-Total-Count-Exact"] = str(exact).lower()
+        return response
 
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/bank-accounts/{account_id}", response_model=BankAccountResponse)
-def get_account_details(account_id: int, db: Session = Depends(get_db)):
+def get_account_details(account_id: int, db: Session = Depends(get_read_db)):
     """
     Get details of a specific account by its ID.
     """
@@ -60,3 +139,29 @@ def get_account_details(account_id: int, db: Session = Depends(get_db)):
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/bank-accounts/{account_id}/balance", response_model=AccountBalanceResponse)
+def get_account_balance(account_id: int, as_of: Optional[datetime] = None, db: Session = Depends(get_read_db)):
+    """
+    Get the balance of an account derived from the ledger, optionally at a past point in time (UTC).
+    """
+    try:
+        account_service = BankAccountService(BankAccountDAO())
+        if not account_service.get_account_by_id(db, account_id):
+            raise HTTPException(status_code=404, detail="Account not found")
+
+        balance = LedgerService().get_balance_as_of(db, account_id, as_of)
+        return AccountBalanceResponse(account_id=account_id, balance=float(balance), as_of=as_of)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def _decode_account_cursor(cursor: str) -> int:
+    values = decode_cursor(cursor)
+    if len(values) != 1 or not isinstance(values[0], int):
+        raise ValueError("Invalid pagination cursor.")
+    return values[0]
@@ -1,9 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from api.database.session import get_db
+from api.database.session import get_db, get_read_db
 from api.services.customer_service import CustomerService
 from api.dao.customer_dao import CustomerDAO
-from api.schemas.customer_schema import CustomerCreate, CustomerResponse
+from api.schemas.customer_schema import CustomerCreate, CustomerPortfolioResponse, CustomerResponse
+from api.utils.responses import FastJSONResponse
+from api.config.config import LIST_FETCH_BATCH_SIZE
+from api.services.onboarding_service import OnboardingService
+from api.schemas.onboarding_schema import BulkCreateResponse
+from api.utils.bulk import BulkItems, bulk_response, read_bulk_items
 import logging
 
 router = APIRouter()
@@ -24,24 +29,39 @@ def create_customer(customer_data: CustomerCreate, db: Session = Depends(get_db)
     - customer_name
     """
     try:
-        logging.info(f"Creating new customer: {customer_data}")
+        logger.debug("Creating new customer: %s", customer_data)
 
         new_customer = customer_service.create_new_customer(db, customer_data)
         return new_customer
 
     except Exception as e:
-        print(e)
-        logging.error(e)
+        logger.error("Error creating customer: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.post("/customers:bulk", response_model=BulkCreateResponse)
+def create_customers_bulk(items: BulkItems = Depends(read_bulk_items), db: Session = Depends(get_db)):
+    """
+    Create many customers from a JSON array, or from NDJSON (Content-Type: application/x-ndjson).
+    Each row is reported individually; NDJSON requests get one result per line back, streamed
+    while the body is still being read, one line per row as each chunk commits.
+    """
+    try:
+        results = OnboardingService().create_customers(db, items)
+        return bulk_response(results, items.ndjson)
+
+    except Exception as e:
+        logger.error("Unexpected error during bulk customer onboarding: %s", e)
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
 @router.get("/customers/{customer_id}", response_model=CustomerResponse)
-def get_customer(customer_id: int, db: Session = Depends(get_db)):
+def get_customer(customer_id: int, db: Session = Depends(get_read_db)):
     """
     Get details of a specific customer by ID
     """
     try:
-        logger.info(f"Fetching customer with ID: {customer_id}")
+        logger.debug("Fetching customer with ID: %s", customer_id)
         customer_dao = CustomerDAO()
         customer_service = CustomerService(customer_dao)
 
@@ -54,17 +74,34 @@ def get_customer(customer_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.get("/customers/{customer_id}/portfolio", response_model=CustomerPortfolioResponse)
+def get_customer_portfolio(customer_id: int, db: Session = Depends(get_read_db)):
+    """
+    Get a customer together with their accounts and current balances
+    """
+    try:
+        customer_service = CustomerService(CustomerDAO())
+
+        portfolio = customer_service.get_customer_portfolio(db, customer_id)
+        if not portfolio:
+            raise HTTPException(status_code=404, detail="Customer not found")
+        return portfolio
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.get("/customers", response_model=list[CustomerResponse])
-def get_all_customers(db: Session = Depends(get_db)):
+def get_all_customers(db: Session = Depends(get_read_db)):
     """
     Get a list of all customers
     """
     try:
-        customer_dao = CustomerDAO()
-        customer_service = CustomerService(customer_dao)
-
-        customers = customer_service.get_all_customers(db)
-        return customers
+        rows = CustomerDAO().stream_customer_rows(db, LIST_FETCH_BATCH_SIZE)
+        return FastJSONResponse.from_rows(rows)
 
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
+
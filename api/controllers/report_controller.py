@@ -0,0 +1,43 @@
+from datetime import date
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from api.database.session import get_read_db
+from api.models.transaction import TransactionType
+from api.schemas.report_schema import DailyVolumeReport
+from api.services.reporting_service import ReportingService
+from api.utils.exceptions import AccountNotFoundError
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+@router.get("/reports/daily-volume", response_model=DailyVolumeReport)
+def get_daily_volume(
+    account_id: Optional[int] = None,
+    start_day: Optional[date] = None,
+    end_day: Optional[date] = None,
+    transaction_type: Optional[TransactionType] = None,
+    db: Session = Depends(get_read_db),
+):
+    """
+    Daily transaction count, sum, min and max of the administrative accounts, per transaction type
+    and side (DEBIT: sent by the account, CREDIT: received by it).
+    - account_id: only this administrative account
+    - start_day/end_day: range of days, both included; by default the last REPORT_DEFAULT_DAYS days
+      up to today, and at most REPORT_MAX_DAYS days
+    Served from the rollups: every transaction committed before rolled_up_at is included, later
+    ones may not be yet.
+    """
+    try:
+        return ReportingService().get_daily_volume(db, account_id, start_day, end_day, transaction_type)
+
+    except AccountNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error("Unexpected error building the daily volume report: %s", e)
+        raise HTTPException(status_code=500, detail="Internal server error")
@@ -1,40 +1,65 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
 from sqlalchemy.orm import Session
-from api.database.session import get_db
+from api.database.session import get_db, get_read_db
 from api.services.transaction_service import TransactionService
 from api.services.bank_account_service import BankAccountService
+from api.services.group_commit_service import get_group_commit_writer
 from api.dao.transaction_dao import TransactionDAO
 from api.dao.bank_account_dao import BankAccountDAO
 from api.schemas.transaction_schema import (
     DepositCreate,
     WithdrawCreate,
     TransferCreate,
+    TransferBatchCreate,
+    TransferBatchResponse,
     TransactionResponse,
 )
-from api.utils.exceptions import AccountNotFoundError, InsufficientFundsError
+from api.utils.exceptions import (
+    AccountNotFoundError,
+    InsufficientFundsError,
+    IdempotencyKeyArchivedError,
+    IdempotencyKeyReuseError,
+)
+from api.utils.pagination import decode_cursor, encode_cursor
+from api.utils.responses import FastJSONResponse, NDJSONResponse
+from api.config.config import TRANSACTION_PAGE_MAX_LIMIT, TRANSACTION_STREAM_BATCH_SIZE
 import logging
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Optional Idempotency-Key header of the money movement endpoints; retries with the same key
+# return the original transaction instead of moving the money again.
+IdempotencyKeyHeader = Header(None, alias="Idempotency-Key", min_length=1, max_length=255)
+
 
 @router.post("/transactions/deposit", response_model=TransactionResponse)
-def deposit_funds(deposit_data: DepositCreate, db: Session = Depends(get_db)):
+def deposit_funds(
+    deposit_data: DepositCreate,
+    idempotency_key: Optional[str] = IdempotencyKeyHeader,
+    db: Session = Depends(get_db),
+):
     try:
-        transaction_service = TransactionService(BankAccountService(BankAccountDAO()), TransactionDAO())
+        transaction_service = TransactionService(
+            BankAccountService(BankAccountDAO()), TransactionDAO(), group_commit=get_group_commit_writer()
+        )
 
         transaction = transaction_service.create_deposit_transaction(
             db=db,
             amount=deposit_data.amount,
             source_account_id=deposit_data.source_account_id,
-            destination_account_id=deposit_data.destination_account_id
+            destination_account_id=deposit_data.destination_account_id,
+            idempotency_key=idempotency_key,
         )
 
-        db.refresh(transaction)
-
         return TransactionResponse.model_validate(transaction)
 
+    except IdempotencyKeyReuseError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except IdempotencyKeyArchivedError as e:
+        raise HTTPException(status_code=410, detail=str(e))
     except AccountNotFoundError as e:
         db.rollback()
         raise HTTPException(status_code=404, detail=str(e))
@@ -43,36 +68,43 @@ def deposit_funds(deposit_data: DepositCreate, db: Session = Depends(get_db)):
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         db.rollback()
-        logger.error(f"Unexpected error: {e}")
+        logger.error("Unexpected error: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
     except ValueError as e:
-        logger.error(f"Validation error during deposit: {e}")
+        logger.error("Validation error during deposit: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
     except AccountNotFoundError as e:
-        logger.error(f"Account not found: {e}")
+        logger.error("Account not found: %s", e)
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
-        logger.error(f"Unexpected error during deposit: {e}")
+        logger.error("Unexpected error during deposit: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
 @router.post("/transactions/withdraw", response_model=TransactionResponse)
-def withdraw_funds(withdraw_data: WithdrawCreate, db: Session = Depends(get_db)):
+def withdraw_funds(
+    withdraw_data: WithdrawCreate,
+    idempotency_key: Optional[str] = IdempotencyKeyHeader,
+    db: Session = Depends(get_db),
+):
     """
     Withdraw funds from an account.
     """
     try:
-        logger.info(f"Processing withdrawal: {withdraw_data}")
+        logger.debug("Processing withdrawal: %s", withdraw_data)
         transaction_dao = TransactionDAO()
         account_service = BankAccountService(BankAccountDAO())
-        transaction_service = TransactionService(account_service, transaction_dao)
+        transaction_service = TransactionService(
+            account_service, transaction_dao, group_commit=get_group_commit_writer()
+        )
 
         transaction = transaction_service.create_withdrawal(
             db,
             amount=withdraw_data.amount,
             source_account_id=withdraw_data.source_account_id,
-            destination_account_id=withdraw_data.destination_account_id
+            destination_account_id=withdraw_data.destination_account_id,
+            idempotency_key=idempotency_key,
         )
 
         return TransactionResponse(
@@ -84,36 +116,49 @@ def withdraw_funds(withdraw_data: WithdrawCreate, db: Session = Depends(get_db))
             timestamp=transaction.timestamp,
         )
 
+    except IdempotencyKeyReuseError as e:
+        logger.error("Idempotency key reused during withdrawal: %s", e)
+        raise HTTPException(status_code=409, detail=str(e))
+    except IdempotencyKeyArchivedError as e:
+        logger.error("Idempotency key of an archived transaction replayed during withdrawal: %s", e)
+        raise HTTPException(status_code=410, detail=str(e))
     except ValueError as e:
-        logger.error(f"Validation error during withdrawal: {e}")
+        logger.error("Validation error during withdrawal: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
     except AccountNotFoundError as e:
-        logger.error(f"Account not found: {e}")
+        logger.error("Account not found: %s", e)
         raise HTTPException(status_code=404, detail=str(e))
     except InsufficientFundsError as e:
-        logger.error(f"Insufficient funds: {e}")
+        logger.error("Insufficient funds: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"Unexpected error during withdrawal: {e}")
+        logger.error("Unexpected error during withdrawal: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
 @router.post("/transactions/transfer", response_model=TransactionResponse)
-def transfer_funds(transfer_data: TransferCreate, db: Session = Depends(get_db)):
+def transfer_funds(
+    transfer_data: TransferCreate,
+    idempotency_key: Optional[str] = IdempotencyKeyHeader,
+    db: Session = Depends(get_db),
+):
     """
     Transfer funds between two accounts.
     """
     try:
-        logger.info(f"Processing transfer: {transfer_data}")
+        logger.debug("Processing transfer: %s", transfer_data)
         transaction_dao = TransactionDAO()
         account_service = BankAccountService(BankAccountDAO())
-        transaction_service = TransactionService(account_service, transaction_dao)
+        transaction_service = TransactionService(
+            account_service, transaction_dao, group_commit=get_group_commit_writer()
+        )
 
         transaction = transaction_service.create_transfer(
             db,
             amount=transfer_data.amount,
             source_account_id=transfer_data.source_account_id,
             destination_account_id=transfer_data.destination_account_id,
+            idempotency_key=idempotency_key,
         )
 
         return TransactionResponse(
@@ -125,43 +170,103 @@ def transfer_funds(transfer_data: TransferCreate, db: Session = Depends(get_db))
             timestamp=transaction.timestamp,
         )
 
+    except IdempotencyKeyReuseError as e:
+        logger.error("Idempotency key reused during transfer: %s", e)
+        raise HTTPException(status_code=409, detail=str(e))
+    except IdempotencyKeyArchivedError as e:
+        logger.error("Idempotency key of an archived transaction replayed during transfer: %s", e)
+        raise HTTPException(status_code=410, detail=str(e))
     except ValueError as e:
-        logger.error(f"Validation error during transfer: {e}")
+        logger.error("Validation error during transfer: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
     except AccountNotFoundError as e:
-        logger.error(f"Account not found: {e}")
+        logger.error("Account not found: %s", e)
         raise HTTPException(status_code=404, detail=str(e))
     except InsufficientFundsError as e:
-        logger.error(f"Insufficient funds: {e}")
+        logger.error("Insufficient funds: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"Unexpected error during transfer: {e}")
+        logger.error("Unexpected error during transfer: %s", e)
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.post("/transactions/transfers:batch", response_model=TransferBatchResponse)
+def transfer_funds_batch(batch_data: TransferBatchCreate, db: Session = Depends(get_db)):
+    """
+    Settle a batch of transfers in a single database transaction.
+    Each item is reported individually; failed items do not prevent the others from being committed.
+    """
+    try:
+        logger.info("Processing transfer batch with %d items", len(batch_data.transfers))
+        transaction_dao = TransactionDAO()
+        account_service = BankAccountService(BankAccountDAO())
+        transaction_service = TransactionService(account_service, transaction_dao)
+
+        results = transaction_service.create_transfer_batch(db, batch_data.transfers)
+        completed = sum(1 for result in results if result.status == "COMPLETED")
+
+        return TransferBatchResponse(
+            completed=completed,
+            failed=len(results) - completed,
+            results=results,
+        )
+
+    except ValueError as e:
+        logger.error("Validation error during transfer batch: %s", e)
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error("Unexpected error during transfer batch: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
 # list transactions for a given account
 @router.get("/transactions/{account_id}", response_model=List[TransactionResponse])
-def get_transactions(account_id: int, db: Session = Depends(get_db)):
+def get_transactions(
+    account_id: int,
+    limit: Optional[int] = Query(None, ge=1, le=TRANSACTION_PAGE_MAX_LIMIT),
+    after: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+    db: Session = Depends(get_read_db),
+):
     """
-    Fetch all transactions for a given account.
+    Fetch the transactions of a given account ordered by timestamp.
+    - limit/after: keyset pagination; the cursor of the next page is returned in the X-Next-Cursor header
+    - since/until: only transactions with since <= timestamp < until (only those partitions are read)
+    - format=ndjson: stream the history as newline delimited JSON from a server-side cursor
     """
     try:
-        logger.info(f"Fetching transactions for account: {account_id}")
+        logger.debug("Fetching transactions for account: %s", account_id)
         transaction_dao = TransactionDAO()
-        transactions = transaction_dao.get_transactions_by_account_id(db, account_id)
-
-        return [
-            TransactionResponse(
-                id=transaction.id,
-                amount=float(transaction.amount),
-                transaction_type=transaction.transaction_type.value,
-                source_account_id=transaction.source_account_id,
-                destination_account_id=transaction.destination_account_id,
-                timestamp=transaction.timestamp,
+        after_key = _decode_history_cursor(after) if after else None
+
+        if format == "ndjson":
+            rows = transaction_dao.stream_transactions(
+                db, account_id, TRANSACTION_STREAM_BATCH_SIZE, after=after_key, limit=limit, since=since, until=until
+            )
+            return NDJSONResponse(
+                TransactionResponse.from_transaction(row).model_dump_json() + "\n" for row in rows
             )
-            for transaction in transactions
-        ]
 
+        rows = list(transaction_dao.stream_transactions(
+            db, account_id, TRANSACTION_STREAM_BATCH_SIZE, after=after_key, limit=limit, since=since, until=until
+        ))
+        fast_response = FastJSONResponse.from_rows(rows)
+        if limit is not None and len(rows) == limit:
+            last = rows[-1]
+            fast_response.headers["X-Next-Cursor"] = encode_cursor([last.timestamp.isoformat(), last.id])
+        return fast_response
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"Unexpected error fetching transactions: {e}")
+        logger.error("Unexpected error fetching transactions: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
+
+
+def _decode_history_cursor(cursor: str):
+    values = decode_cursor(cursor)
+    if len(values) != 2:
+        raise ValueError("Invalid pagination cursor.")
+    return datetime.fromisoformat(values[0]), int(values[1])
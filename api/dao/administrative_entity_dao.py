@@ -1,6 +1,8 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session
+from typing import Iterable, List, Optional, Set
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
 from api.models.administrative_entity import AdministrativeEntity
+from api.models.bank_account import BankAccount
 
 
 class AdministrativeEntityDAO:
@@ -23,8 +25,25 @@ class AdministrativeEntityDAO:
         entities = db.query(AdministrativeEntity).all()
         return [{"id": entity.id, "corporate_name": entity.corporate_name, "tax_id": entity.tax_id} for entity in entities]
 
+    def get_existing_ids(self, db: Session, entity_ids: Iterable[int]) -> Set[int]:
+        ids = set(entity_ids)
+        if not ids:
+            return set()
+        return set(db.scalars(select(AdministrativeEntity.id).where(AdministrativeEntity.id.in_(ids))).all())
+
     def get_corporate_entity_by_id(self, db: Session, entity_id: int) -> Optional[AdministrativeEntity]:
         """
         Fetch a administrative entity by its ID.
         """
         return db.query(AdministrativeEntity).filter(AdministrativeEntity.id == entity_id).first()
+
+    def get_corporate_entity_portfolio(self, db: Session, entity_id: int) -> Optional[AdministrativeEntity]:
+        """
+        A administrative entity with its accounts and their shard balances, in two queries.
+        """
+        stmt = (
+            select(AdministrativeEntity)
+            .where(AdministrativeEntity.id == entity_id)
+            .options(selectinload(AdministrativeEntity.bank_accounts).undefer(BankAccount.shard_balance))
+        )
+        return db.execute(stmt).scalar_one_or_none()
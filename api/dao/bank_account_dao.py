@@ -1,21 +1,30 @@
-from typing import List, Optional
-import uuid
-from sqlalchemy.orm import Session
+from decimal import Decimal
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from sqlalchemy import case, insert, select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session, undefer
 from api.models.bank_account import BankAccount
-from api.schemas.bank_account_schema import BankAccountCreate
-from api.models.bank_account import AccountType
+from api.dao.ledger_dao import LedgerDAO
+from api.schemas.bank_account_schema import AccountFilter, BankAccountCreate
+from api.models.bank_account import AccountType, AccountStatus
+from api.database.account_numbers import AccountNumberGenerator, get_account_number_generator
+from api.database.estimates import estimate_row_count
+from api.database.locking import lock_accounts, lock_all_shards
+from api.utils.metrics import phase_timer
 import logging
 
 
 logger = logging.getLogger(__name__)
 
 class BankAccountDAO:
+    def __init__(self, ledger_dao: LedgerDAO = None, account_number_generator: AccountNumberGenerator = None):
+        self.ledger_dao = ledger_dao or LedgerDAO()
+        self.account_number_generator = account_number_generator or get_account_number_generator()
 
     def create_account(self, db: Session, account_data: BankAccountCreate) -> BankAccount:
-        account_number = str(uuid.uuid4()).replace("-", "")[:12].upper()
-        logger.info(f"AccountType: {account_data.account_type}")
+        account_number = self.new_account_numbers(db, account_data.account_type)[0]
+        logger.debug("AccountType: %s", account_data.account_type)
         if account_data.account_type == AccountType.USER:            
-            account_number = "C" + account_number
             db_account = BankAccount(
                 customer_id=account_data.owner_id,
                 administrative_entity_id = None,
@@ -24,7 +33,6 @@ class BankAccountDAO:
                 account_type=account_data.account_type,
             )
         elif account_data.account_type == AccountType.ADMINISTRATIVE:
-            account_number = "A" + account_number
             db_account = BankAccount(
                 customer_id=None,
                 administrative_entity_id=account_data.owner_id,
@@ -36,25 +44,208 @@ class BankAccountDAO:
             raise ValueError("Invalid account type")
 
         db.add(db_account)
+        self.ledger_dao.add_opening_entry(db, db_account, Decimal(str(account_data.balance)))
         db.commit()
         db.refresh(db_account)
 
         return db_account
 
+    def new_account_numbers(self, db: Session, account_type: AccountType, count: int = 1) -> List[str]:
+        """
+        Account numbers for count new accounts of a type, from the configured generator.
+        """
+        return self.account_number_generator.generate(db, account_type, count)
+
+    def create_accounts(self, db: Session, account_rows: List[dict]) -> List[int]:
+        """
+        Bulk insert accounts and their opening ledger entries without committing, returning the
+        new ids in input order. Rows carry every column, account numbers included.
+        """
+        account_ids = db.scalars(
+            insert(BankAccount).returning(BankAccount.id, sort_by_parameter_order=True),
+            account_rows,
+        ).all()
+        self.ledger_dao.insert_opening_entries(db, [row["balance"] for row in account_rows], account_ids)
+        return list(account_ids)
+
     def get_account_by_id(self, db: Session, account_id: int) -> Optional[BankAccount]:
         """
-        Fetch an account by its ID.
+        Fetch an account by its ID, with its shard balance.
         """
-        return db.query(BankAccount).filter(BankAccount.id == account_id).first()
+        return db.query(BankAccount).options(undefer(BankAccount.shard_balance)).filter(BankAccount.id == account_id).first()
 
     def get_all_accounts(self, db: Session) -> List[BankAccount]:
         """
-        Fetch all accounts.
+        Fetch all accounts, with their shard balances.
         """
-        return db.query(BankAccount).all()
+        return db.query(BankAccount).options(undefer(BankAccount.shard_balance)).all()
     
     def get_account_by_name_and_type(self, db: Session, account_name: str, account_type: AccountType) -> BankAccount:
-        return db.query(BankAccount).filter(
+        return db.query(BankAccount).options(undefer(BankAccount.shard_balance)).filter(
             BankAccount.account_number == account_name,
             BankAccount.account_type == account_type
         ).first()
+
+    def apply_balance_deltas(self, db: Session, deltas: Dict[int, Decimal]) -> Dict[int, Decimal]:
+        """
+        Add each delta to the balance of its account with a single UPDATE ... RETURNING and return
+        the new balances. Accounts loaded in the session are not updated in memory.
+        """
+        deltas = {account_id: delta for account_id, delta in deltas.items() if delta}
+        if not deltas:
+            return {}
+        with phase_timer("update"):
+            rows = db.execute(
+                update(BankAccount)
+                .where(BankAccount.id.in_(deltas))
+                .values(balance=BankAccount.balance + case(deltas, value=BankAccount.id))
+                .returning(BankAccount.id, BankAccount.balance)
+                .execution_options(synchronize_session=False)
+            ).all()
+        return {account_id: balance for account_id, balance in rows}
+
+    def conditional_update_balance(
+        self,
+        db: Session,
+        account_id: int,
+        delta: Decimal,
+        min_balance: Optional[Decimal] = None,
+        account_type: Optional[AccountType] = None,
+        require_active: bool = False,
+    ) -> Optional[Decimal]:
+        """
+        Add delta to the balance of an account only if the row matches the guards, in a single
+        UPDATE ... WHERE balance >= :min_balance RETURNING balance.
+        Returns the new balance, or None when the account is missing or a guard did not hold.
+        """
+        stmt = update(BankAccount).where(BankAccount.id == account_id)
+        if require_active:
+            stmt = stmt.where(BankAccount.status == AccountStatus.ACTIVE)
+        if min_balance is not None:
+            stmt = stmt.where(BankAccount.balance >= min_balance)
+        if account_type is not None:
+            stmt = stmt.where(BankAccount.account_type == account_type)
+        with phase_timer("update"):
+            return db.execute(
+                stmt.values(balance=BankAccount.balance + delta)
+                .returning(BankAccount.balance)
+                .execution_options(synchronize_session=False)
+            ).scalar_one_or_none()
+
+    def move_balance(self, db: Session, source_account_id: int, destination_account_id: int, amount: Decimal) -> Dict[int, Decimal]:
+        """
+        Debit the source and credit the destination account in one statement.
+        """
+        deltas = {source_account_id: -amount}
+        deltas[destination_account_id] = deltas.get(destination_account_id, Decimal(0)) + amount
+        return self.apply_balance_deltas(db, deltas)
+
+    def get_account_metadata(self, db: Session, account_id: int = None, account_number: str = None):
+        """
+        The rarely changing columns of an account, looked up by id or by account number.
+        """
+        stmt = select(
+            BankAccount.id,
+            BankAccount.account_number,
+            BankAccount.account_type,
+            BankAccount.status,
+            BankAccount.customer_id,
+            BankAccount.administrative_entity_id,
+        )
+        if account_id is not None:
+            stmt = stmt.where(BankAccount.id == account_id)
+        else:
+            stmt = stmt.where(BankAccount.account_number == account_number)
+        return db.execute(stmt).one_or_none()
+
+    def get_account_ids_of_type(self, db: Session, account_ids: Iterable[int], account_type: AccountType) -> Set[int]:
+        """
+        The given account ids that belong to accounts of account_type. Reads the rows without locking them.
+        """
+        ids = list(account_ids)
+        if not ids:
+            return set()
+        return set(db.execute(
+            select(BankAccount.id).where(BankAccount.id.in_(ids), BankAccount.account_type == account_type)
+        ).scalars().all())
+
+    def close_account(self, db: Session, account_id: int) -> Optional[BankAccount]:
+        """
+        Mark an account as closed. Only accounts without money, shards included, can be closed.
+        The shards are deleted under their locks, so no movement can pick one once the account is closed.
+        """
+        account = lock_accounts(db, [account_id]).get(account_id)
+        if not account:
+            return None
+        if account.status == AccountStatus.CLOSED:
+            return account
+
+        shards = lock_all_shards(db, account_id)
+        if account.balance + sum(shard.balance for shard in shards) != 0:
+            raise ValueError("Only accounts with a zero balance can be closed.")
+
+        for shard in shards:
+            account.balance += shard.balance
+            db.delete(shard)
+        account.status = AccountStatus.CLOSED
+        db.commit()
+        db.refresh(account)
+        return account
+
+    def stream_account_rows(
+        self,
+        db: Session,
+        batch_size: int,
+        filters: Optional[AccountFilter] = None,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[Row]:
+        """
+        Accounts as plain (id, account_number, balance, account_type, status) rows ordered by id,
+        with the logical balance of striped accounts, fetched batch_size rows at a time.
+        Keyset paginated: starts after after_id and stops after limit rows.
+        """
+        stmt = self._account_rows_query(filters)
+        if after_id is not None:
+            stmt = stmt.where(BankAccount.id > after_id)
+        stmt = stmt.order_by(BankAccount.id)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        yield from db.execute(stmt.execution_options(yield_per=batch_size))
+
+    def estimate_account_count(self, db: Session, filters: Optional[AccountFilter] = None) -> Tuple[int, bool]:
+        """
+        (count, exact) of the accounts matching the filters, from planner statistics when available.
+        """
+        return estimate_row_count(db, self._account_rows_query(filters))
+
+    def _account_rows_query(self, filters: Optional[AccountFilter] = None):
+        """
+        The listing filters run on the (account_type, status, id), (status, id), (customer_id, id) and
+        (administrative_entity_id, id) indexes, which also return the rows in keyset order.
+        The shard balance only exists for the few striped accounts, so its subquery stays cheap.
+        No index can serve the logical balance, and one on the stored balance would be rewritten by
+        every money movement, so a balance range is only accepted within the accounts of one owner.
+        """
+        balance = (BankAccount.balance + BankAccount.shard_balance).label("balance")
+        stmt = select(BankAccount.id, BankAccount.account_number, balance, BankAccount.account_type, BankAccount.status)
+        if filters is None:
+            return stmt
+
+        has_balance_range = filters.min_balance is not None or filters.max_balance is not None
+        if has_balance_range and filters.customer_id is None and filters.administrative_entity_id is None:
+            raise ValueError("A balance range needs a customer_id or administrative_entity_id filter.")
+
+        for column, value in (
+            (BankAccount.account_type, filters.account_type),
+            (BankAccount.status, filters.status),
+            (BankAccount.customer_id, filters.customer_id),
+            (BankAccount.administrative_entity_id, filters.administrative_entity_id),
+        ):
+            if value is not None:
+                stmt = stmt.where(column == value)
+        if filters.min_balance is not None:
+            stmt = stmt.where(balance >= filters.min_balance)
+        if filters.max_balance is not None:
+            stmt = stmt.where(balance <= filters.max_balance)
+        return stmt
@@ -1,4 +1,8 @@
-from sqlalchemy.orm import Session
+from typing import Iterable, Iterator, List, Optional, Set
+from sqlalchemy import insert, select
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session, selectinload
+from api.models.bank_account import BankAccount
 from api.models.customer import Customer
 
 
@@ -11,8 +15,42 @@ class CustomerDAO:
         db.refresh(customer)
         return customer
 
+    def create_customers(self, db: Session, customer_rows: List[dict]) -> List[int]:
+        """
+        Bulk insert customers without committing, returning the new ids in input order.
+        """
+        customer_ids = db.scalars(
+            insert(Customer).returning(Customer.id, sort_by_parameter_order=True),
+            customer_rows,
+        ).all()
+        return list(customer_ids)
+
+    def get_existing_ids(self, db: Session, customer_ids: Iterable[int]) -> Set[int]:
+        ids = set(customer_ids)
+        if not ids:
+            return set()
+        return set(db.scalars(select(Customer.id).where(Customer.id.in_(ids))).all())
+
     def get_customer_by_id(self, db: Session, customer_id: int) -> Customer:
         return db.query(Customer).filter(Customer.id == customer_id).first()
 
+    def get_customer_portfolio(self, db: Session, customer_id: int) -> Optional[Customer]:
+        """
+        A customer with its accounts and their shard balances, in two queries.
+        """
+        stmt = (
+            select(Customer)
+            .where(Customer.id == customer_id)
+            .options(selectinload(Customer.bank_accounts).undefer(BankAccount.shard_balance))
+        )
+        return db.execute(stmt).scalar_one_or_none()
+
     def get_all_customers(self, db: Session) -> list[Customer]:
         return db.query(Customer).all()
+
+    def stream_customer_rows(self, db: Session, batch_size: int) -> Iterator[Row]:
+        """
+        Every customer as a plain (id, customer_name) row, fetched batch_size rows at a time.
+        """
+        stmt = select(Customer.id, Customer.customer_name).order_by(Customer.id)
+        yield from db.execute(stmt.execution_options(yield_per=batch_size))
@@ -0,0 +1,20 @@
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from api.models.idempotency_key import IdempotencyKey
+from api.models.transaction import Transaction
+
+
+class IdempotencyKeyDAO:
+
+    def get_key(self, db: Session, key: str) -> Optional[IdempotencyKey]:
+        stmt = select(IdempotencyKey).where(IdempotencyKey.key == key)
+        return db.execute(stmt).scalar_one_or_none()
+
+    def add_key(self, db: Session, key: str, request_fingerprint: str, transaction: Transaction) -> IdempotencyKey:
+        """
+        Attach a key to a transaction inserted in the current database transaction; it is written on commit.
+        """
+        idempotency_key = IdempotencyKey(key=key, request_fingerprint=request_fingerprint, transaction_id=transaction.id)
+        db.add(idempotency_key)
+        return idempotency_key
@@ -0,0 +1,111 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import List, Optional
+from sqlalchemy import case, func, insert, select, tuple_
+from sqlalchemy.orm import Session
+from api.database.commit_order import Position, after, settled, up_to
+from api.models.balance_checkpoint import BalanceCheckpoint
+from api.models.bank_account import BankAccount
+from api.models.ledger_entry import EntryType, LedgerEntry
+from api.models.transaction import Transaction
+
+
+# Credits add to the balance of an account, debits subtract from it.
+SIGNED_AMOUNT = case((LedgerEntry.entry_type == EntryType.CREDIT, LedgerEntry.amount), else_=-LedgerEntry.amount)
+
+
+class LedgerDAO:
+
+    def insert_transaction_entries(self, db: Session, transaction_rows: List[dict], transaction_ids: List[int]):
+        """
+        Bulk insert the entries of transactions inserted with a bulk statement.
+        """
+        entry_rows = []
+        for row, transaction_id in zip(transaction_rows, transaction_ids):
+            entry_rows.append({"transaction_id": transaction_id, "account_id": row["source_account_id"],
+                               "entry_type": EntryType.DEBIT, "amount": row["amount"]})
+            entry_rows.append({"transaction_id": transaction_id, "account_id": row["destination_account_id"],
+                               "entry_type": EntryType.CREDIT, "amount": row["amount"]})
+        if entry_rows:
+            db.execute(insert(LedgerEntry), entry_rows)
+
+    def add_opening_entry(self, db: Session, account: BankAccount, balance: Decimal) -> Optional[LedgerEntry]:
+        """
+        Record the opening balance of an account, so the ledger alone explains its balance.
+        """
+        if not balance:
+            return None
+        entry = LedgerEntry(
+            account=account,
+            entry_type=EntryType.CREDIT if balance > 0 else EntryType.DEBIT,
+            amount=abs(balance),
+        )
+        db.add(entry)
+        return entry
+
+    def insert_opening_entries(self, db: Session, balances: List[Decimal], account_ids: List[int]):
+        """
+        Bulk counterpart of add_opening_entry for accounts inserted with a bulk statement.
+        """
+        entry_rows = [
+            {"account_id": account_id, "entry_type": EntryType.CREDIT if balance > 0 else EntryType.DEBIT,
+             "amount": abs(balance)}
+            for balance, account_id in zip(balances, account_ids)
+            if balance
+        ]
+        if entry_rows:
+            db.execute(insert(LedgerEntry), entry_rows)
+
+    def sum_entries(
+        self,
+        db: Session,
+        account_id: int,
+        after_position: Position = None,
+        up_to_position: Position = None,
+        created_after: datetime = None,
+        created_until: datetime = None,
+    ) -> Decimal:
+        """
+        Signed sum of the entries of an account, optionally restricted to a range of commit order
+        positions and of creation times.
+        """
+        stmt = select(func.coalesce(func.sum(SIGNED_AMOUNT), 0)).where(LedgerEntry.account_id == account_id)
+        if after_position is not None:
+            stmt = stmt.where(after(LedgerEntry, after_position))
+        if up_to_position is not None:
+            stmt = stmt.where(up_to(LedgerEntry, up_to_position))
+        if created_after is not None:
+            stmt = stmt.where(LedgerEntry.created_at > created_after)
+        if created_until is not None:
+            stmt = stmt.where(LedgerEntry.created_at <= created_until)
+        return Decimal(db.execute(stmt).scalar_one())
+
+    def get_last_settled_position(self, db: Session, horizon: Optional[int]) -> Optional[Position]:
+        """
+        Commit order position of the newest entry written below the xid horizon, None without entries.
+        """
+        row = db.execute(
+            select(LedgerEntry.xid, LedgerEntry.id)
+            .where(settled(LedgerEntry, horizon))
+            .order_by(LedgerEntry.xid.desc(), LedgerEntry.id.desc())
+            .limit(1)
+        ).one_or_none()
+        return tuple(row) if row else None
+
+    def get_pending_checkpoint_deltas(self, db: Session, up_to_position: Position):
+        """
+        Per account: the previous checkpoint position (xid, entry id) and the sum of the entries
+        after it, up to and including up_to_position.
+        """
+        previous_xid = func.coalesce(BalanceCheckpoint.last_xid, 0)
+        previous_entry_id = func.coalesce(BalanceCheckpoint.last_entry_id, 0)
+        return db.execute(
+            select(LedgerEntry.account_id, previous_xid, previous_entry_id, func.sum(SIGNED_AMOUNT))
+            .outerjoin(BalanceCheckpoint, BalanceCheckpoint.account_id == LedgerEntry.account_id)
+            .where(tuple_(LedgerEntry.xid, LedgerEntry.id) > tuple_(previous_xid, previous_entry_id))
+            .where(up_to(LedgerEntry, up_to_position))
+            .group_by(LedgerEntry.account_id, previous_xid, previous_entry_id)
+        ).all()
+
+    def get_checkpoint(self, db: Session, account_id: int) -> Optional[BalanceCheckpoint]:
+        return db.get(BalanceCheckpoint, account_id)
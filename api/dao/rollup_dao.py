@@ -0,0 +1,171 @@
+from datetime import date, datetime
+from typing import List, Optional
+from sqlalchemy import Date, func, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from api.database.commit_order import START, Position, after, settled, up_to
+from api.models.bank_account import AccountType, BankAccount
+from api.models.ledger_entry import EntryType
+from api.models.transaction import Transaction, TransactionType
+from api.models.transaction_rollup import RollupWatermark, TransactionRollup
+
+
+class RollupDAO:
+
+    def get_watermark(self, db: Session, name: str) -> Optional[RollupWatermark]:
+        return db.get(RollupWatermark, name)
+
+    def get_watermark_position(self, db: Session, name: str) -> Position:
+        row = db.execute(
+            select(RollupWatermark.last_xid, RollupWatermark.last_transaction_id).where(RollupWatermark.name == name)
+        ).one_or_none()
+        return tuple(row) if row else START
+
+    def advance_watermark(self, db: Session, name: str, previous: Position, last: Position) -> bool:
+        """
+        Move the watermark from the previous to the last position. Returns False when another run moved
+        it first: the conditional update waits for that run to commit and then no longer matches.
+        """
+        (previous_xid, previous_id), (last_xid, last_id) = previous, last
+        result = db.execute(
+            update(RollupWatermark)
+            .where(
+                RollupWatermark.name == name,
+                RollupWatermark.last_xid == previous_xid,
+                RollupWatermark.last_transaction_id == previous_id,
+            )
+            .values(last_xid=last_xid, last_transaction_id=last_id, updated_at=datetime.utcnow())
+        )
+        if result.rowcount:
+            return True
+        if previous != START:
+            return False
+        try:
+            with db.begin_nested():
+                db.add(RollupWatermark(name=name, last_xid=last_xid, last_transaction_id=last_id))
+            return True
+        except IntegrityError:
+            return False
+
+    def mark_caught_up(self, db: Session, name: str, position: Position, caught_up_at: datetime):
+        """
+        Record that the rollups include every transaction committed before caught_up_at, unless another
+        run has moved the watermark past position or recorded a later time.
+        """
+        last_xid, last_id = position
+        result = db.execute(
+            update(RollupWatermark)
+            .where(
+                RollupWatermark.name == name,
+                RollupWatermark.last_xid == last_xid,
+                RollupWatermark.last_transaction_id == last_id,
+                or_(RollupWatermark.caught_up_at.is_(None), RollupWatermark.caught_up_at < caught_up_at),
+            )
+            .values(caught_up_at=caught_up_at)
+        )
+        if result.rowcount or position != START:
+            return
+        try:
+            with db.begin_nested():
+                db.add(RollupWatermark(name=name, last_xid=last_xid, last_transaction_id=last_id, caught_up_at=caught_up_at))
+        except IntegrityError:
+            pass
+
+    def get_next_window(
+        self, db: Session, after_position: Position, horizon: Optional[int], batch_size: int
+    ) -> Optional[Position]:
+        """
+        Position of the last transaction of the next window to roll up: the next batch_size transactions
+        after after_position in commit order, written below the xid horizon. None when there is nothing to do.
+        """
+        window = (
+            select(Transaction.xid, Transaction.id)
+            .where(after(Transaction, after_position), settled(Transaction, horizon))
+            .order_by(Transaction.xid, Transaction.id)
+            .limit(batch_size)
+            .subquery()
+        )
+        row = db.execute(
+            select(window.c.xid, window.c.id).order_by(window.c.xid.desc(), window.c.id.desc()).limit(1)
+        ).one_or_none()
+        return tuple(row) if row else None
+
+    def aggregate_transactions(self, db: Session, after_position: Position, last_position: Position) -> List[tuple]:
+        """
+        (account_id, day, transaction_type, entry_type, count, sum, min, max) of the administrative
+        accounts over the transactions after after_position up to last_position: one group by for the
+        sending side and one for the receiving side, each driven by the (xid, id) index range.
+        """
+        day = func.date(Transaction.timestamp, type_=Date)
+        aggregates = []
+        for entry_type, account_column in (
+            (EntryType.DEBIT, Transaction.source_account_id),
+            (EntryType.CREDIT, Transaction.destination_account_id),
+        ):
+            rows = db.execute(
+                select(
+                    account_column,
+                    day,
+                    Transaction.transaction_type,
+                    func.count(),
+                    func.sum(Transaction.amount),
+                    func.min(Transaction.amount),
+                    func.max(Transaction.amount),
+                )
+                .join(BankAccount, BankAccount.id == account_column)
+                .where(BankAccount.account_type == AccountType.ADMINISTRATIVE)
+                .where(after(Transaction, after_position), up_to(Transaction, last_position))
+                .where(Transaction.timestamp.is_not(None))
+                .group_by(account_column, day, Transaction.transaction_type)
+            ).all()
+            aggregates.extend(
+                (account_id, day_value, transaction_type, entry_type, count, total, minimum, maximum)
+                for account_id, day_value, transaction_type, count, total, minimum, maximum in rows
+            )
+        return aggregates
+
+    def merge_rollups(self, db: Session, aggregates: List[tuple]):
+        """
+        Add aggregates to the rollup rows of the same account, day, type and side, creating the missing ones.
+        """
+        if not aggregates:
+            return
+        existing = {
+            (rollup.account_id, rollup.day, rollup.transaction_type, rollup.entry_type): rollup
+            for rollup in db.scalars(
+                select(TransactionRollup)
+                .where(TransactionRollup.account_id.in_({aggregate[0] for aggregate in aggregates}))
+                .where(TransactionRollup.day.in_({aggregate[1] for aggregate in aggregates}))
+            )
+        }
+        for account_id, day, transaction_type, entry_type, count, total, minimum, maximum in aggregates:
+            rollup = existing.get((account_id, day, transaction_type, entry_type))
+            if rollup is None:
+                db.add(TransactionRollup(
+                    account_id=account_id, day=day, transaction_type=transaction_type, entry_type=entry_type,
+                    transaction_count=count, total_amount=total, min_amount=minimum, max_amount=maximum,
+                ))
+            else:
+                rollup.transaction_count += count
+                rollup.total_amount += total
+                rollup.min_amount = min(rollup.min_amount, minimum)
+                rollup.max_amount = max(rollup.max_amount, maximum)
+
+    def get_daily_rollups(
+        self,
+        db: Session,
+        start_day: date,
+        end_day: date,
+        account_id: Optional[int] = None,
+        transaction_type: Optional[TransactionType] = None,
+    ) -> List[TransactionRollup]:
+        stmt = select(TransactionRollup).where(TransactionRollup.day >= start_day, TransactionRollup.day <= end_day)
+        if account_id is not None:
+            stmt = stmt.where(TransactionRollup.account_id == account_id)
+        if transaction_type is not None:
+            stmt = stmt.where(TransactionRollup.transaction_type == transaction_type)
+        stmt = stmt.order_by(
+            TransactionRollup.account_id, TransactionRollup.day,
+            TransactionRollup.transaction_type, TransactionRollup.entry_type,
+        )
+        return list(db.scalars(stmt))
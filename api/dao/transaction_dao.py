@@ -1,20 +1,148 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import select
+from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import insert, or_, select, tuple_, union_all
+from sqlalchemy.engine import Row
+from api.dao.ledger_dao import LedgerDAO
 from api.models.transaction import Transaction
+from api.utils.metrics import phase_timer
 
 
 class TransactionDAO:
+    def __init__(self, ledger_dao: LedgerDAO = None):
+        self.ledger_dao = ledger_dao or LedgerDAO()
+
     def create_transaction(self, db: Session, transaction: Transaction) -> Transaction:
-        db.add(transaction)
+        """
+        Insert a transaction and its ledger entries. The generated id and timestamp come back through
+        RETURNING and are set on the given object, which is never added to the session: the commit
+        does not expire it, so it can be read afterwards without reloading it.
+        """
+        row = {
+            "amount": transaction.amount,
+            "transaction_type": transaction.transaction_type,
+            "source_account_id": transaction.source_account_id,
+            "destination_account_id": transaction.destination_account_id,
+        }
+        if transaction.timestamp is not None:
+            row["timestamp"] = transaction.timestamp
+        with phase_timer("insert"):
+            transaction.id, transaction.timestamp = db.execute(
+                insert(Transaction).values(**row).returning(Transaction.id, Transaction.timestamp)
+            ).one()
+            self.ledger_dao.insert_transaction_entries(db, [row], [transaction.id])
         return transaction
 
+    def create_transactions(self, db: Session, transaction_rows: List[dict]) -> List[int]:
+        """
+        Bulk insert transactions and their ledger entries, returning the new ids in input order.
+        """
+        with phase_timer("insert"):
+            transaction_ids = db.scalars(
+                insert(Transaction).returning(Transaction.id, sort_by_parameter_order=True),
+                transaction_rows,
+            ).all()
+            self.ledger_dao.insert_transaction_entries(db, transaction_rows, transaction_ids)
+        return list(transaction_ids)
+
     def get_transaction_by_id(self, db: Session, transaction_id: int) -> Transaction:
         stmt = select(Transaction).where(Transaction.id == transaction_id)
         return db.execute(stmt).scalar_one_or_none()
 
-    def get_transactions_by_account_id(self, db: Session, account_id: int) -> list[Transaction]:
-        stmt = select(Transaction).where(
-            (Transaction.source_account_id == account_id) |
-            (Transaction.destination_account_id == account_id)
-        )
+    def get_transactions_by_account_id(
+        self,
+        db: Session,
+        account_id: int,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> list[Transaction]:
+        stmt = self._history_query(account_id, since=since, until=until)
+        return list(db.execute(stmt).scalars().all())
+
+    def get_transactions_page(
+        self,
+        db: Session,
+        account_id: int,
+        limit: int,
+        after: Optional[Tuple[datetime, int]] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> list[Transaction]:
+        """
+        One page of the history of an account ordered by (timestamp, id), starting after the given key.
+        """
+        stmt = self._history_query(account_id, after, limit, since=since, until=until)
         return list(db.execute(stmt).scalars().all())
+
+    def stream_transactions(
+        self,
+        db: Session,
+        account_id: int,
+        batch_size: int,
+        after: Optional[Tuple[datetime, int]] = None,
+        limit: Optional[int] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> Iterator[Row]:
+        """
+        Yield the history of an account as plain rows from a server-side cursor,
+        fetching batch_size rows at a time instead of loading everything in memory.
+        """
+        stmt = self._history_query(account_id, after, limit, columns=True, since=since, until=until)
+        yield from db.execute(stmt.execution_options(yield_per=batch_size))
+
+    def _history_query(
+        self,
+        account_id: int,
+        after: Optional[Tuple[datetime, int]] = None,
+        limit: Optional[int] = None,
+        columns: bool = False,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ):
+        """
+        History of an account as a UNION ALL of the transactions it sent and the ones it received.
+        Each branch is served by its own (account, timestamp, id) index and, when paginating, is
+        cut to the page size before the branches are merged, instead of an OR over both columns
+        that forces a full scan.
+        since (inclusive) and until (exclusive) bound the timestamps. They are plain comparisons on
+        the partition key, so on Postgres only the monthly partitions of that range are scanned.
+        """
+        table = Transaction.__table__
+        source_branch = select(table).where(table.c.source_account_id == account_id)
+        destination_branch = select(table).where(
+            table.c.destination_account_id == account_id,
+            # self transfers are already returned by the source branch
+            or_(table.c.source_account_id.is_(None), table.c.source_account_id != account_id),
+        )
+
+        branches = []
+        for branch in (source_branch, destination_branch):
+            if after:
+                # The row comparison alone cannot prune partitions, the plain bound can.
+                branch = branch.where(tuple_(table.c.timestamp, table.c.id) > tuple_(*after), table.c.timestamp >= after[0])
+            if since:
+                branch = branch.where(table.c.timestamp >= since)
+            if until:
+                branch = branch.where(table.c.timestamp < until)
+            if limit:
+                branch = select(branch.order_by(table.c.timestamp, table.c.id).limit(limit).subquery())
+            branches.append(branch)
+        history = union_all(*branches).subquery("history")
+
+        if columns:
+            stmt = select(
+                history.c.id,
+                history.c.amount,
+                history.c.transaction_type,
+                history.c.source_account_id,
+                history.c.destination_account_id,
+                history.c.timestamp,
+            )
+            stmt = stmt.order_by(history.c.timestamp, history.c.id)
+        else:
+            transaction = aliased(Transaction, history)
+            stmt = select(transaction).order_by(transaction.timestamp, transaction.id)
+        if limit:
+            stmt = stmt.limit(limit)
+        return stmt
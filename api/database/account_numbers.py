@@ -0,0 +1,157 @@
+import threading
+import uuid
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import List
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.orm import Session
+
+from api.config.config import ACCOUNT_NUMBER_BLOCK_SIZE, ACCOUNT_NUMBER_SCHEME
+from api.models.account_number_counter import AccountNumberCounter, account_number_sequence
+from api.models.bank_account import AccountType
+
+ACCOUNT_NUMBER_SCHEMES = ("sequence", "uuid")
+
+# Digits of the zero padded sequence value, followed by one Luhn check digit.
+SEQUENCE_DIGITS = 12
+COUNTER_NAME = "account_number"
+
+
+def account_number_prefix(account_type: AccountType) -> str:
+    return "C" if account_type == AccountType.USER else "A"
+
+
+def luhn_check_digit(digits: str) -> str:
+    """
+    Luhn check digit of a string of digits: catches every single digit typo and most
+    transpositions of adjacent digits.
+    """
+    total = 0
+    for position, digit in enumerate(reversed(digits)):
+        value = int(digit)
+        if position % 2 == 0:
+            value *= 2
+            if value > 9:
+                value -= 9
+        total += value
+    return str((10 - total % 10) % 10)
+
+
+def format_account_number(account_type: AccountType, value: int) -> str:
+    digits = f"{value:0{SEQUENCE_DIGITS}d}"
+    if len(digits) > SEQUENCE_DIGITS:
+        raise ValueError(f"Account number sequence value {value} does not fit in {SEQUENCE_DIGITS} digits.")
+    return account_number_prefix(account_type) + digits + luhn_check_digit(digits)
+
+
+def is_valid_account_number(account_number: str) -> bool:
+    """
+    Whether a number has the shape of a sequence scheme number and a matching check digit.
+    Numbers of the legacy UUID scheme are never valid.
+    """
+    if len(account_number) != SEQUENCE_DIGITS + 2 or account_number[0] not in ("C", "A"):
+        return False
+    digits, check_digit = account_number[1:-1], account_number[-1]
+    return digits.isdigit() and check_digit.isdigit() and luhn_check_digit(digits) == check_digit
+
+
+class AccountNumberGenerator(ABC):
+    """
+    Hands out the account numbers of new accounts. Generators are shared by every request of a
+    process and must be thread safe.
+    """
+
+    @abstractmethod
+    def generate(self, db: Session, account_type: AccountType, count: int = 1) -> List[str]:
+        """
+        count new account numbers for accounts of account_type.
+        """
+
+
+class UUIDAccountNumberGenerator(AccountNumberGenerator):
+    """
+    The original scheme: the prefix and 12 random hex digits. Needs no database round trip, but
+    collisions surface as unique violations and the random values scatter the inserts over the
+    whole account_number index.
+    """
+
+    def generate(self, db: Session, account_type: AccountType, count: int = 1) -> List[str]:
+        prefix = account_number_prefix(account_type)
+        return [prefix + uuid.uuid4().hex[:12].upper() for _ in range(count)]
+
+
+class SequenceBlockAccountNumberGenerator(AccountNumberGenerator):
+    """
+    The prefix, a zero padded sequence value and a Luhn check digit (C0000000012344).
+    Numbers are unique by construction and increase over time, so new index entries land on the
+    rightmost pages of the account_number index.
+
+    On Postgres the values come from account_number_seq, block_size of them per round trip,
+    and are kept by the process until handed out. Sequence values survive a rollback, so a reserved
+    block never has to be given back. Databases without sequences advance the counter row in the
+    caller's transaction instead, which reserves exactly the numbers requested: a rolled back
+    transaction takes its numbers with it.
+    """
+
+    def __init__(self, block_size: int = ACCOUNT_NUMBER_BLOCK_SIZE):
+        if block_size < 1:
+            raise ValueError("block_size must be at least 1.")
+        self.block_size = block_size
+        self._lock = threading.Lock()
+        self._reserved = deque()
+        self.blocks_reserved = 0
+
+    def generate(self, db: Session, account_type: AccountType, count: int = 1) -> List[str]:
+        return [format_account_number(account_type, value) for value in self._allocate(db, count)]
+
+    def _allocate(self, db: Session, count: int) -> List[int]:
+        if db.get_bind().dialect.name != "postgresql":
+            return self._advance_counter(db, count)
+
+        with self._lock:
+            while len(self._reserved) < count:
+                self._reserved.extend(self._reserve_block(db, max(self.block_size, count - len(self._reserved))))
+            return [self._reserved.popleft() for _ in range(count)]
+
+    def _reserve_block(self, db: Session, size: int) -> List[int]:
+        values = db.scalars(
+            select(account_number_sequence.next_value()).select_from(func.generate_series(1, size))
+        ).all()
+        self.blocks_reserved += 1
+        return sorted(values)
+
+    def _advance_counter(self, db: Session, count: int) -> List[int]:
+        last_value = db.execute(
+            update(AccountNumberCounter)
+            .where(AccountNumberCounter.name == COUNTER_NAME)
+            .values(last_value=AccountNumberCounter.last_value + count)
+            .returning(AccountNumberCounter.last_value)
+        ).scalar_one_or_none()
+        if last_value is None:
+            db.execute(insert(AccountNumberCounter).values(name=COUNTER_NAME, last_value=count))
+            last_value = count
+        return list(range(last_value - count + 1, last_value + 1))
+
+
+_generator = None
+_generator_lock = threading.Lock()
+
+
+def get_account_number_generator() -> AccountNumberGenerator:
+    """
+    The process wide generator of the configured ACCOUNT_NUMBER_SCHEME.
+    """
+    global _generator
+    with _generator_lock:
+        if _generator is None:
+            _generator = build_account_number_generator(ACCOUNT_NUMBER_SCHEME)
+    return _generator
+
+
+def build_account_number_generator(scheme: str, block_size: int = ACCOUNT_NUMBER_BLOCK_SIZE) -> AccountNumberGenerator:
+    if scheme == "sequence":
+        return SequenceBlockAccountNumberGenerator(block_size)
+    if scheme == "uuid":
+        return UUIDAccountNumberGenerator()
+    raise ValueError(f"Unknown account number scheme {scheme!r}, expected one of {ACCOUNT_NUMBER_SCHEMES}.")
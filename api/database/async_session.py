@@ -0,0 +1,91 @@
+from typing import Optional
+from fastapi import Header
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from api.config.config import DATABASE_URL, DATABASE_REPLICA_URLS, REPLICA_CONNECT_TIMEOUT_SECONDS
+from api.database.pool_metrics import InstrumentedAsyncQueuePool
+from api.database.query_stats import instrument_engine
+from api.database.session import pool_options, replica_router
+
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+_async_engine = None
+_async_session_factory = None
+# One per DATABASE_REPLICA_URLS entry, in the order of the replica router.
+_async_replica_session_factories = []
+
+
+def get_async_engine_if_created():
+    return _async_engine
+
+
+def to_async_url(database_url: str) -> str:
+    """
+    Swap the driver of a database URL for its asyncio counterpart.
+    """
+    scheme, rest = database_url.split("://", 1)
+    dialect = scheme.split("+", 1)[0]
+    if dialect not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {dialect}")
+    return f"{ASYNC_DRIVERS[dialect]}://{rest}"
+
+
+def create_async_database_engine(database_url: str, connect_timeout: Optional[int] = None):
+    if database_url.startswith("sqlite"):
+        async_engine = create_async_engine(to_async_url(database_url))
+    else:
+        connect_args = {"timeout": connect_timeout} if connect_timeout else {}
+        async_engine = create_async_engine(
+            to_async_url(database_url), poolclass=InstrumentedAsyncQueuePool, connect_args=connect_args,
+            **pool_options()
+        )
+    instrument_engine(async_engine.sync_engine)
+    return async_engine
+
+
+def get_async_engine():
+    """
+    The async engines (primary and replicas) are only created on first use, so the asyncio
+    drivers are only required when DATABASE_MODE is async.
+    """
+    global _async_engine, _async_session_factory, _async_replica_session_factories
+    if _async_engine is None:
+        _async_engine = create_async_database_engine(DATABASE_URL)
+        _async_session_factory = async_sessionmaker(bind=_async_engine, autoflush=False, expire_on_commit=True)
+        _async_replica_session_factories = [
+            async_sessionmaker(
+                bind=create_async_database_engine(replica_url, REPLICA_CONNECT_TIMEOUT_SECONDS),
+                autoflush=False, expire_on_commit=True,
+            )
+            for replica_url in DATABASE_REPLICA_URLS
+        ]
+    return _async_engine
+
+
+async def get_async_db():
+    get_async_engine()
+    db: AsyncSession = _async_session_factory()
+    try:
+        yield db
+    finally:
+        await db.close()
+
+
+async def get_async_read_db(
+    read_from: Optional[str] = Header(None, alias="X-Read-From", pattern="^(primary|replica)$"),
+):
+    """
+    Async counterpart of get_read_db: the replica chosen by the replica router, through its async
+    engine, or the primary. The lag checks run on the background job, so choosing never waits
+    on a replica.
+    """
+    get_async_engine()
+    index = replica_router.choose_replica(prefer_primary=read_from == "primary")
+    session_factory = _async_session_factory if index is None else _async_replica_session_factories[index]
+    db: AsyncSession = session_factory()
+    try:
+        yield db
+    finally:
+        await db.close()
@@ -1,3 +1,10 @@
 from sqlalchemy.orm import declarative_base
+from api.config.config import STRICT_LAZY_LOADS
 
 Base = declarative_base()
+
+# Loader strategies of the relationships that are loaded eagerly (selectinload) where they are needed.
+# In strict mode a lazy load raises; a many-to-one target already in the identity map is still
+# returned, since that needs no SQL.
+EAGER_ONLY = "raise" if STRICT_LAZY_LOADS else "select"
+EAGER_ONLY_MANY_TO_ONE = "raise_on_sql" if STRICT_LAZY_LOADS else "select"
@@ -0,0 +1,93 @@
+"""
+Commit order positions for readers that fold new rows incrementally (ledger checkpoints,
+reporting rollups).
+
+Ids and timestamps are handed out before commit, so a watermark moved over them skips the
+rows of a transaction that commits late with a lower id. Rows therefore carry the id of the
+database transaction that wrote them (xid) and are read in (xid, id) order, only up to the
+oldest transaction still running:
+- Postgres: xid is pg_current_xact_id(). Every transaction below pg_snapshot_xmin(pg_current_snapshot())
+  has finished and new ones always get a higher id, so no row can appear behind a watermark.
+- Other databases (SQLite): writers are serialized by the database lock, so ids already follow
+  commit order. xid is 0 and every visible row is settled.
+A long running writer holds the Postgres horizon back until it finishes.
+"""
+from datetime import datetime
+from typing import Optional, Tuple
+
+from sqlalchemy import BigInteger, text, true, tuple_
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.functions import FunctionElement
+
+# (xid, id) of a row. (0, 0) comes before every row.
+Position = Tuple[int, int]
+START = (0, 0)
+
+
+class current_xid(FunctionElement):
+    """
+    Column default: the id of the writing transaction on Postgres, 0 elsewhere.
+    """
+    type = BigInteger()
+    inherit_cache = True
+
+
+@compiles(current_xid)
+def _compile_current_xid(element, compiler, **kw):
+    return "0"
+
+
+@compiles(current_xid, "postgresql")
+def _compile_current_xid_postgresql(element, compiler, **kw):
+    return "pg_current_xact_id()::text::bigint"
+
+
+def settled_xid_horizon(db: Session) -> Optional[int]:
+    """
+    Rows written by transactions below this id can no longer change or appear. None when every
+    visible row is settled (databases with serialized writers).
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return None
+    return db.execute(text("SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint")).scalar_one()
+
+
+def settled_before(db: Session) -> datetime:
+    """
+    Every transaction committed before this time (UTC) is below a horizon read after it: the
+    start of the oldest transaction still running, or now. Read it before settled_xid_horizon.
+    Postgres only sees the transactions of other roles with pg_read_all_stats.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return datetime.utcnow()
+    return db.execute(text(
+        "SELECT least(statement_timestamp(), min(xact_start)) AT TIME ZONE 'UTC' "
+        "FROM pg_stat_activity WHERE pid <> pg_backend_pid()"
+    )).scalar_one()
+
+
+def settled(model, horizon: Optional[int]):
+    """
+    Condition keeping the rows of model written below horizon.
+    """
+    return model.xid < horizon if horizon is not None else true()
+
+
+def after(model, position: Position):
+    """
+    Condition keeping the rows of model after position, in (xid, id) order.
+    """
+    return tuple_(model.xid, model.id) > _position(model, position)
+
+
+def up_to(model, position: Position):
+    """
+    Condition keeping the rows of model up to and including position, in (xid, id) order.
+    """
+    return tuple_(model.xid, model.id) <= _position(model, position)
+
+
+def _position(model, position: Position):
+    # Bound with the column types: Postgres xids do not fit the INTEGER of a plain int parameter.
+    return tuple_(*position, types=(model.xid.type, model.id.type))
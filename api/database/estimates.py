@@ -0,0 +1,20 @@
+from typing import Tuple
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+
+def estimate_row_count(db: Session, stmt: Select) -> Tuple[int, bool]:
+    """
+    Number of rows a query returns, as (count, exact). On Postgres the count is the planner
+    estimate read from EXPLAIN, which costs no scan but is only as fresh as the table statistics
+    (ANALYZE / autovacuum). Other databases keep no usable statistics and run a COUNT(*).
+    """
+    bind = db.get_bind()
+    if bind.dialect.name != "postgresql":
+        return db.execute(select(func.count()).select_from(stmt.order_by(None).subquery())).scalar_one(), True
+
+    # Parameters are rendered inline: exec_driver_sql would skip their type processing (enums).
+    compiled = stmt.order_by(None).compile(dialect=bind.dialect, compile_kwargs={"literal_binds": True})
+    plan = db.connection().exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}").scalar_one()
+    return int(plan[0]["Plan"]["Plan Rows"]), False
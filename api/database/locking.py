@@ -0,0 +1,196 @@
+import asyncio
+import functools
+import logging
+import random
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+from sqlalchemy.util.concurrency import await_only, in_greenlet
+
+from api.config.config import LOCK_RETRY_MAX_ATTEMPTS, LOCK_RETRY_BASE_DELAY_MS, LOCK_RETRY_MAX_DELAY_MS
+from api.models.bank_account import AccountStatus, BankAccount
+from api.models.account_balance_shard import AccountBalanceShard
+from api.utils.metrics import observe_phase
+
+logger = logging.getLogger(__name__)
+
+# SQLSTATE codes Postgres uses for serialization failures and detected deadlocks.
+RETRYABLE_SQLSTATES = {"40001", "40P01"}
+
+
+class LockContentionStats:
+    """
+    Process wide counters describing how often account locking contends.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.lock_acquisitions = 0
+            self.lock_wait_seconds = 0.0
+            self.conflicts = 0
+            self.retries = 0
+            self.exhausted = 0
+
+    def record_acquisition(self, wait_seconds: float):
+        with self._lock:
+            self.lock_acquisitions += 1
+            self.lock_wait_seconds += wait_seconds
+
+    def record_conflict(self, retried: bool):
+        with self._lock:
+            self.conflicts += 1
+            if retried:
+                self.retries += 1
+            else:
+                self.exhausted += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "lock_acquisitions": self.lock_acquisitions,
+                "lock_wait_seconds": round(self.lock_wait_seconds, 6),
+                "conflicts": self.conflicts,
+                "retries": self.retries,
+                "exhausted": self.exhausted,
+            }
+
+
+lock_stats = LockContentionStats()
+
+
+def lock_accounts(db: Session, account_ids: Iterable[int]) -> Dict[int, BankAccount]:
+    """
+    Fetch and lock bank accounts with a single SELECT ... FOR UPDATE.
+    Rows are always locked in id order, so two movements touching the same accounts
+    queue behind each other instead of deadlocking. With balance striping, the administrative
+    accounts of a movement are locked after all of its other accounts: one account at a time
+    in id order, its row (when the shards cannot be used) before its shards.
+    Missing accounts are simply absent from the returned dict.
+    """
+    ids = sorted({account_id for account_id in account_ids if account_id is not None})
+    if not ids:
+        return {}
+
+    started = time.perf_counter()
+    accounts = db.execute(
+        select(BankAccount)
+        .where(BankAccount.id.in_(ids))
+        .order_by(BankAccount.id)
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    ).scalars().all()
+    waited = time.perf_counter() - started
+    lock_stats.record_acquisition(waited)
+    observe_phase("lock", waited)
+
+    return {account.id: account for account in accounts}
+
+
+def lock_available_shard(db: Session, account_id: int, min_balance=None) -> Optional[AccountBalanceShard]:
+    """
+    Lock one random balance shard of a striped account.
+    Shards already held by other movements are skipped (SKIP LOCKED), so concurrent
+    movements spread over the shards instead of queueing on a single row.
+    Only shards of an active account qualify: the status is read on the account row in the same
+    statement, and closing an account deletes its shards under their locks.
+    """
+    stmt = (
+        select(AccountBalanceShard)
+        .join(BankAccount, BankAccount.id == AccountBalanceShard.account_id)
+        .where(AccountBalanceShard.account_id == account_id, BankAccount.status == AccountStatus.ACTIVE)
+    )
+    if min_balance is not None:
+        stmt = stmt.where(AccountBalanceShard.balance >= min_balance)
+
+    started = time.perf_counter()
+    shard = db.execute(
+        stmt.order_by(func.random())
+        .limit(1)
+        .with_for_update(skip_locked=True, of=AccountBalanceShard)
+        .execution_options(populate_existing=True)
+    ).scalar_one_or_none()
+    waited = time.perf_counter() - started
+    lock_stats.record_acquisition(waited)
+    observe_phase("lock", waited)
+
+    return shard
+
+
+def lock_all_shards(db: Session, account_id: int) -> List[AccountBalanceShard]:
+    """
+    Lock every balance shard of an account in shard order.
+    Callers must already hold the lock on the account row itself.
+    """
+    return list(db.execute(
+        select(AccountBalanceShard)
+        .where(AccountBalanceShard.account_id == account_id)
+        .order_by(AccountBalanceShard.shard_index)
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    ).scalars().all())
+
+
+def is_lock_conflict(error: DBAPIError) -> bool:
+    """
+    Whether a database error is a deadlock or serialization failure that is safe to retry.
+    """
+    original = error.orig
+    sqlstate = getattr(original, "pgcode", None) or getattr(original, "sqlstate", None)
+    if sqlstate in RETRYABLE_SQLSTATES:
+        return True
+    # SQLite reports writer contention as a plain "database is locked" error.
+    return "database is locked" in str(original)
+
+
+def movement_outcome(error: Exception) -> str:
+    """
+    Outcome label of a money movement attempt that raised: "conflict" when it is retried
+    (or gave up) because of a lock conflict, "failed" otherwise.
+    """
+    return "conflict" if isinstance(error, DBAPIError) and is_lock_conflict(error) else "failed"
+
+
+def _backoff_seconds(attempt: int) -> float:
+    delay_ms = min(LOCK_RETRY_MAX_DELAY_MS, LOCK_RETRY_BASE_DELAY_MS * (2 ** (attempt - 1)))
+    return random.uniform(delay_ms / 2, delay_ms) / 1000
+
+
+def retry_on_lock_conflict(operation):
+    """
+    Re-run a money movement when the database aborts it because of a deadlock or a
+    serialization failure. The wrapped function must roll back its own session on error.
+    Retries use jittered exponential backoff and are bounded by LOCK_RETRY_MAX_ATTEMPTS.
+    """
+
+    @functools.wraps(operation)
+    def wrapper(*args, **kwargs):
+        attempt = 1
+        while True:
+            try:
+                return operation(*args, **kwargs)
+            except DBAPIError as e:
+                if not is_lock_conflict(e):
+                    raise
+                retry = attempt < LOCK_RETRY_MAX_ATTEMPTS
+                lock_stats.record_conflict(retried=retry)
+                if not retry:
+                    logger.error("Giving up on %s after %d lock conflicts", operation.__name__, attempt)
+                    raise
+                delay = _backoff_seconds(attempt)
+                logger.warning("Lock conflict in %s (attempt %d), retrying in %.3fs", operation.__name__, attempt, delay)
+                if in_greenlet():
+                    # Running under AsyncSession.run_sync: yield to the event loop instead of blocking it.
+                    await_only(asyncio.sleep(delay))
+                else:
+                    time.sleep(delay)
+                attempt += 1
+
+    return wrapper
@@ -0,0 +1,181 @@
+import gzip
+import logging
+import re
+import time
+from datetime import date, datetime
+from pathlib import Path
+from typing import List, NamedTuple, Optional
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from api.config.config import TRANSACTION_PARTITION_DDL_ATTEMPTS, TRANSACTION_PARTITION_LOCK_TIMEOUT_MS
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "transactions"
+DEFAULT_PARTITION = "transactions_default"
+PARTITION_NAME = re.compile(r"^transactions_y(\d{4})m(\d{2})$")
+
+# SQLSTATE of a statement that gave up waiting for a lock (lock_timeout).
+LOCK_NOT_AVAILABLE = "55P03"
+
+# Advisory lock key held by the transaction of each partition DDL statement, so the workers running the
+# maintenance job (and the archive command) never queue their ACCESS EXCLUSIVE locks behind each other.
+MAINTENANCE_LOCK_KEY = 7_354_201_901
+
+# Tables attached to transactions as partitions.
+PARTITIONS_QUERY = text("""
+    SELECT child.relname
+    FROM pg_inherits
+    JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+    JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+    WHERE parent.relname = :parent
+    ORDER BY child.relname
+""")
+
+
+class Partition(NamedTuple):
+    name: str
+    month: date
+
+    @property
+    def upper_bound(self) -> date:
+        return add_months(self.month, 1)
+
+
+def month_start(value) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT_TABLE}_y{month.year:04d}m{month.month:02d}"
+
+
+def is_partitioned(db: Session) -> bool:
+    """
+    Whether transactions is a partitioned table: only on Postgres once the partitioning
+    migration ran. SQLite (tests, local runs) keeps a plain table.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return False
+    return db.execute(
+        text("SELECT relkind = 'p' FROM pg_class WHERE relname = :parent"), {"parent": PARENT_TABLE}
+    ).scalar() is True
+
+
+def list_partitions(db: Session) -> List[Partition]:
+    """
+    The monthly partitions attached to transactions, oldest first. The default partition is left out.
+    """
+    partitions = []
+    for name in db.scalars(PARTITIONS_QUERY, {"parent": PARENT_TABLE}):
+        match = PARTITION_NAME.match(name)
+        if match:
+            partitions.append(Partition(name, date(int(match.group(1)), int(match.group(2)), 1)))
+    return sorted(partitions, key=lambda partition: partition.month)
+
+
+def ensure_partitions(db: Session, months_ahead: int, today: Optional[date] = None) -> List[str]:
+    """
+    Create the partitions of the current month and of the next months_ahead months that are
+    missing, so inserts never fall into the default partition. Returns the created tables.
+    Every worker runs the job: the one holding the maintenance lock creates the partitions, the
+    others skip their run. Each partition is created in its own transaction (see alter_parent).
+    """
+    if not is_partitioned(db):
+        return []
+
+    current = month_start(today or datetime.utcnow())
+    existing = {partition.name for partition in list_partitions(db)}
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        name = partition_name(month)
+        if name in existing:
+            continue
+        if not alter_parent(db, (
+            f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF {PARENT_TABLE} '
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+        )):
+            logger.info("Transaction partitions are maintained by another process, skipping")
+            break
+        created.append(name)
+    db.commit()
+    if created:
+        logger.info("Created transaction partitions: %s", ", ".join(created))
+    return created
+
+
+def alter_parent(db: Session, statement: str) -> bool:
+    """
+    Run a DDL statement locking transactions ACCESS EXCLUSIVE in its own transaction. Returns False,
+    without running it, when another process holds the maintenance lock.
+    The statement only changes the catalog (a new partition also scans the default partition, which
+    stays empty), so the lock itself is short; what would stall every money movement is the statement
+    queued behind a long running query, with all later statements queued behind it. lock_timeout bounds
+    that wait: the statement gives up, lets the queue drain and tries again.
+    """
+    for attempt in range(1, TRANSACTION_PARTITION_DDL_ATTEMPTS + 1):
+        try:
+            if not db.execute(text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": MAINTENANCE_LOCK_KEY}).scalar():
+                db.rollback()
+                return False
+            db.execute(text(f"SET LOCAL lock_timeout = {int(TRANSACTION_PARTITION_LOCK_TIMEOUT_MS)}"))
+            db.execute(text(statement))
+            db.commit()
+            return True
+        except DBAPIError as e:
+            db.rollback()
+            sqlstate = getattr(e.orig, "pgcode", None) or getattr(e.orig, "sqlstate", None)
+            if sqlstate != LOCK_NOT_AVAILABLE or attempt == TRANSACTION_PARTITION_DDL_ATTEMPTS:
+                raise
+            logger.warning("Timed out waiting for the lock on %s (attempt %d), retrying: %s", PARENT_TABLE, attempt, statement)
+            time.sleep(attempt)
+
+
+def detach_partition(db: Session, name: str):
+    """
+    Detach a partition from transactions in its own transaction (DETACH ... CONCURRENTLY is not
+    allowed while the table has a default partition).
+    """
+    if not alter_parent(db, f'ALTER TABLE {PARENT_TABLE} DETACH PARTITION "{name}"'):
+        raise RuntimeError(f"Cannot detach {name}: another process is maintaining the transaction partitions.")
+
+
+def archive_partitions(db: Session, before: date, directory: Path) -> List[Path]:
+    """
+    Detach every monthly partition holding only transactions older than before, export it to
+    <directory>/<partition>.csv.gz (COPY, with a header row) and drop it.
+    Each partition is handled in its own transaction: an export that fails leaves the partition
+    detached but not dropped, to be attached again or exported by hand.
+    """
+    if not is_partitioned(db):
+        return []
+
+    directory.mkdir(parents=True, exist_ok=True)
+    archived = []
+    for partition in list_partitions(db):
+        if partition.upper_bound > before:
+            continue
+        detach_partition(db, partition.name)
+
+        path = directory / f"{partition.name}.csv.gz"
+        cursor = db.connection().connection.cursor()
+        try:
+            with gzip.open(path, "wb") as archive:
+                cursor.copy_expert(f'COPY "{partition.name}" TO STDOUT WITH (FORMAT csv, HEADER)', archive)
+        finally:
+            cursor.close()
+        db.execute(text(f'DROP TABLE "{partition.name}"'))
+        db.commit()
+
+        logger.info("Archived transaction partition %s to %s", partition.name, path)
+        archived.append(path)
+    return archived
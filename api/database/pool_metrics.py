@@ -0,0 +1,93 @@
+import bisect
+import threading
+import time
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Upper bounds (seconds) of the connection wait time histogram buckets.
+WAIT_TIME_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class PoolWaitStats:
+    """
+    How long requests wait for a connection from the pool, as a cumulative histogram.
+    """
+
+    def __init__(self, buckets=WAIT_TIME_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.bucket_counts = [0] * (len(self.buckets) + 1)
+            self.wait_count = 0
+            self.wait_seconds = 0.0
+            self.timeouts = 0
+
+    def record_wait(self, seconds: float):
+        with self._lock:
+            self.bucket_counts[bisect.bisect_left(self.buckets, seconds)] += 1
+            self.wait_count += 1
+            self.wait_seconds += seconds
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            cumulative = 0
+            histogram = {}
+            for bound, count in zip(self.buckets + (float("inf"),), self.bucket_counts):
+                cumulative += count
+                histogram["+Inf" if bound == float("inf") else str(bound)] = cumulative
+            return {
+                "wait_count": self.wait_count,
+                "wait_seconds_total": round(self.wait_seconds, 6),
+                "timeouts": self.timeouts,
+                "wait_seconds_histogram": histogram,
+            }
+
+
+pool_wait_stats = PoolWaitStats()
+
+
+class _WaitTimingMixin:
+    """
+    Times every connection checkout, including the time spent queueing for a free
+    connection when the pool and its overflow are exhausted.
+    """
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            pool_wait_stats.record_timeout()
+            raise
+        pool_wait_stats.record_wait(time.perf_counter() - started)
+        return connection
+
+
+class InstrumentedQueuePool(_WaitTimingMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_WaitTimingMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_status(pool) -> dict:
+    """
+    Live occupancy of a pool. Pools without a fixed size (sqlite) only report their class.
+    """
+    status = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update({
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": max(pool.overflow(), 0),
+        })
+    return status
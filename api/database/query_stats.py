@@ -0,0 +1,115 @@
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from api.config.config import SLOW_QUERY_THRESHOLD_MS
+
+logger = logging.getLogger(__name__)
+
+QUERY_COUNT_HEADER = "X-DB-Query-Count"
+QUERY_TIME_HEADER = "X-DB-Query-Time-Ms"
+
+
+class QueryStats:
+    """
+    Statements sent to the database, and the time spent in them, while a request is served.
+    """
+
+    __slots__ = ("statements", "seconds")
+
+    def __init__(self):
+        self.statements = 0
+        self.seconds = 0.0
+
+    def record(self, seconds: float):
+        self.statements += 1
+        self.seconds += seconds
+
+
+# The stats of the request being served. Sync routes and their dependencies run in the thread pool
+# with a copy of the request context, so they see (and update) the same object.
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def track_queries():
+    """
+    Collect the statements executed by this context (and the threads it hands work to).
+    """
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def parameter_shape(parameters, executemany: bool = False) -> str:
+    """
+    Types of the bound parameters, never their values: account numbers and amounts stay out of the log.
+    """
+    if executemany:
+        return f"{len(parameters)} x {parameter_shape(parameters[0])}" if parameters else "0 x ()"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{name}: {type(value).__name__}" for name, value in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(type(value).__name__ for value in parameters) + ")"
+    return type(parameters).__name__
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Statements of one connection never overlap, a single start time per connection is enough.
+    conn.info["query_started"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"]
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(elapsed)
+    if SLOW_QUERY_THRESHOLD_MS > 0 and elapsed * 1000 >= SLOW_QUERY_THRESHOLD_MS:
+        logger.warning(
+            "Slow query (%.1f ms): %s | parameters: %s",
+            elapsed * 1000, " ".join(statement.split()), parameter_shape(parameters, executemany),
+        )
+
+
+def instrument_engine(engine: Engine) -> Engine:
+    """
+    Count and time every statement of the engine (pass async_engine.sync_engine for async engines).
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    return engine
+
+
+class QueryStatsMiddleware:
+    """
+    ASGI middleware returning the number of statements and the database time of each request in
+    the X-DB-Query-Count and X-DB-Query-Time-Ms headers. Statements a streaming response issues
+    after its headers were sent are not included. Only installed in DEBUG mode.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+            async def send_with_stats(message):
+                if message["type"] == "http.response.start":
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (QUERY_COUNT_HEADER.lower().encode(), str(stats.statements).encode()),
+                        (QUERY_TIME_HEADER.lower().encode(), f"{stats.seconds * 1000:.2f}".encode()),
+                    ]
+                await send(message)
+
+            await self.app(scope, receive, send_with_stats)
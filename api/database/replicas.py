@@ -0,0 +1,141 @@
+import itertools
+import logging
+import threading
+import time
+from typing import Callable, List, Optional
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import sessionmaker
+
+logger = logging.getLogger(__name__)
+
+# Seconds since the last transaction replayed on a Postgres standby, 0 when it has replayed
+# everything it received (an idle primary does not make a standby stale). NULL when the WAL
+# receiver is not streaming: the received and replayed positions are then both stale and say
+# nothing about the primary. Roles without pg_read_all_stats only see whether a receiver runs,
+# not its status.
+POSTGRES_LAG_QUERY = text(
+    "SELECT CASE "
+    "WHEN NOT EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming' OR status IS NULL) THEN NULL "
+    "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+def replication_lag_seconds(connection: Connection) -> Optional[float]:
+    """
+    Replication lag of the database behind a connection, None when it is not replicating
+    (treated as lagging). Databases without streaming replication (sqlite files copied or
+    shipped by other means) report no lag.
+    """
+    if connection.dialect.name != "postgresql":
+        return 0.0
+    lag = connection.execute(POSTGRES_LAG_QUERY).scalar_one()
+    return float(lag) if lag is not None else None
+
+
+# With background checks, a lag older than this many check intervals means the checks are stuck.
+STALE_LAG_INTERVALS = 3
+
+
+class ReplicaRouter:
+    """
+    Picks the session factory a read-only request should use: the replicas in turn, skipping
+    the ones lagging more than max_lag_seconds or failing their lag check, and the primary when
+    no replica qualifies or the request asked for it. Lag checks are cached for
+    lag_check_interval seconds so that they cost one query per replica per interval.
+    In the server the checks run on a background job (refresh) and requests only read the cache.
+    Without it, the request finding an expired lag checks it while the others keep using the
+    previous value, so a replica that is down never holds more than one request at a time.
+    """
+
+    def __init__(
+        self,
+        primary: sessionmaker,
+        replica_engines: List[Engine],
+        max_lag_seconds: float,
+        lag_check_interval: float = 1.0,
+        lag_probe: Callable[[Connection], float] = replication_lag_seconds,
+    ):
+        self.primary = primary
+        self.replica_engines = list(replica_engines)
+        self.replicas = [
+            sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+            for replica_engine in self.replica_engines
+        ]
+        self.max_lag_seconds = max_lag_seconds
+        self.lag_check_interval = lag_check_interval
+        self.lag_probe = lag_probe
+        self.background_checks = False
+        self._lock = threading.Lock()
+        self._probe_locks = [threading.Lock() for _ in self.replicas]
+        self._turns = itertools.cycle(range(len(self.replicas)))
+        self._lags = [(None, float("-inf"))] * len(self.replicas)
+
+    def choose(self, prefer_primary: bool = False) -> sessionmaker:
+        index = self.choose_replica(prefer_primary)
+        return self.primary if index is None else self.replicas[index]
+
+    def choose_replica(self, prefer_primary: bool = False) -> Optional[int]:
+        """
+        Index of the replica a read-only request should use, None for the primary. Lets the async
+        sessions follow the same choice with their own engines.
+        """
+        if prefer_primary or not self.replicas:
+            return None
+        for _ in range(len(self.replicas)):
+            with self._lock:
+                index = next(self._turns)
+            lag = self.replica_lag(index)
+            if lag is not None and lag <= self.max_lag_seconds:
+                return index
+        return None
+
+    def replica_lag(self, index: int) -> Optional[float]:
+        """
+        Cached lag of one replica in seconds, None when it could not be checked.
+        """
+        lag, checked_at = self._lags[index]
+        age = time.monotonic() - checked_at
+        if self.background_checks:
+            return lag if age < self.lag_check_interval * STALE_LAG_INTERVALS else None
+        if age < self.lag_check_interval:
+            return lag
+
+        probe_lock = self._probe_locks[index]
+        if not probe_lock.acquire(blocking=False):
+            return lag
+        try:
+            lag, checked_at = self._lags[index]
+            if time.monotonic() - checked_at < self.lag_check_interval:
+                return lag
+            return self._probe(index)
+        finally:
+            probe_lock.release()
+
+    def refresh(self):
+        """
+        Check the lag of every replica, from the background job.
+        """
+        for index in range(len(self.replicas)):
+            with self._probe_locks[index]:
+                self._probe(index)
+
+    def _probe(self, index: int) -> Optional[float]:
+        try:
+            with self.replica_engines[index].connect() as connection:
+                lag = self.lag_probe(connection)
+            if lag is None:
+                logger.warning("Replica %d is not receiving WAL from the primary", index)
+        except Exception as e:
+            logger.warning("Replication lag check of replica %d failed: %s", index, e)
+            lag = None
+        self._lags[index] = (lag, time.monotonic())
+        return lag
+
+    def status(self) -> list:
+        return [
+            {"replica": index, "lag_seconds": lag, "checked_seconds_ago": round(time.monotonic() - checked_at, 3)}
+            for index, (lag, checked_at) in enumerate(self._lags)
+            if checked_at != float("-inf")
+        ]
@@ -1,22 +1,77 @@
+from typing import Optional
+from fastapi import Header
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
-from api.config.config import DATABASE_URL
+from api.config.config import (
+    DATABASE_URL,
+    DATABASE_REPLICA_URLS,
+    REPLICA_MAX_LAG_SECONDS,
+    REPLICA_LAG_CHECK_INTERVAL_SECONDS,
+    REPLICA_CONNECT_TIMEOUT_SECONDS,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE,
+    DB_POOL_PRE_PING,
+)
+from api.database.pool_metrics import InstrumentedQueuePool
+from api.database.query_stats import instrument_engine
+from api.database.replicas import ReplicaRouter
 
 print(f"Connecting to database: {DATABASE_URL}")
 
-if DATABASE_URL.startswith('sqlite'):
-    engine = create_engine(
-        DATABASE_URL,
-        connect_args={"check_same_thread": False}
-    )
-else:
-    engine = create_engine(DATABASE_URL)
+
+def pool_options() -> dict:
+    """
+    Pool settings shared by the sync and async engines of a server database.
+    """
+    return {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+
+def create_database_engine(database_url: str, connect_timeout: Optional[int] = None):
+    if database_url.startswith('sqlite'):
+        return instrument_engine(create_engine(
+            database_url,
+            connect_args={"check_same_thread": False}
+        ))
+    connect_args = {"connect_timeout": connect_timeout} if connect_timeout else {}
+    return instrument_engine(create_engine(
+        database_url, poolclass=InstrumentedQueuePool, connect_args=connect_args, **pool_options()
+    ))
+
+
+engine = create_database_engine(DATABASE_URL)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+replica_router = ReplicaRouter(
+    SessionLocal,
+    [create_database_engine(replica_url, REPLICA_CONNECT_TIMEOUT_SECONDS) for replica_url in DATABASE_REPLICA_URLS],
+    max_lag_seconds=REPLICA_MAX_LAG_SECONDS,
+    lag_check_interval=REPLICA_LAG_CHECK_INTERVAL_SECONDS,
+)
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+def get_read_db(read_from: Optional[str] = Header(None, alias="X-Read-From", pattern="^(primary|replica)$")):
+    """
+    Session for read-only routes: a replica that is not too far behind, or the primary when
+    none is configured or healthy, or when the request was sent with "X-Read-From: primary".
+    """
+    db = replica_router.choose(prefer_primary=read_from == "primary")()
+    try:
+        yield db
+    finally:
+        db.close()
@@ -0,0 +1,37 @@
+"""
+Background checkpointing of ledger balances.
+
+Run once from the command line with:
+    python -m api.jobs.ledger_checkpoint [--backfill]
+"""
+import sys
+from api.config.config import LEDGER_CHECKPOINT_INTERVAL_SECONDS
+from api.database.session import SessionLocal
+from api.services.ledger_service import LedgerService
+from api.utils.periodic import PeriodicJob
+
+
+def checkpoint_ledger_balances():
+    db = SessionLocal()
+    try:
+        LedgerService().checkpoint_balances(db)
+    finally:
+        db.close()
+
+
+def backfill_opening_entries():
+    db = SessionLocal()
+    try:
+        LedgerService().backfill_opening_entries(db)
+    finally:
+        db.close()
+
+
+def create_ledger_checkpoint_job() -> PeriodicJob:
+    return PeriodicJob("ledger-checkpoint", LEDGER_CHECKPOINT_INTERVAL_SECONDS, checkpoint_ledger_balances)
+
+
+if __name__ == "__main__":
+    if "--backfill" in sys.argv:
+        backfill_opening_entries()
+    checkpoint_ledger_balances()
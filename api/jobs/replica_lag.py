@@ -0,0 +1,12 @@
+"""
+Background replication lag checks of the read replicas, so requests never wait on a replica.
+"""
+from api.config.config import REPLICA_LAG_CHECK_INTERVAL_SECONDS
+from api.database.session import replica_router
+from api.utils.periodic import PeriodicJob
+
+
+def create_replica_lag_job() -> PeriodicJob:
+    # Requests stop checking lags themselves and read the values refreshed by the job.
+    replica_router.background_checks = True
+    return PeriodicJob("replica-lag", REPLICA_LAG_CHECK_INTERVAL_SECONDS, replica_router.refresh)
@@ -0,0 +1,29 @@
+"""
+Background consolidation of administrative account balance shards.
+
+Run once from the command line with:
+    python -m api.jobs.shard_consolidation
+"""
+import logging
+from api.config.config import SHARD_CONSOLIDATION_INTERVAL_SECONDS
+from api.database.session import SessionLocal
+from api.services.balance_shard_service import BalanceShardService
+from api.utils.periodic import PeriodicJob
+
+logger = logging.getLogger(__name__)
+
+
+def consolidate_balance_shards():
+    db = SessionLocal()
+    try:
+        BalanceShardService().consolidate_all(db)
+    finally:
+        db.close()
+
+
+def create_shard_consolidation_job() -> PeriodicJob:
+    return PeriodicJob("balance-shard-consolidation", SHARD_CONSOLIDATION_INTERVAL_SECONDS, consolidate_balance_shards)
+
+
+if __name__ == "__main__":
+    consolidate_balance_shards()
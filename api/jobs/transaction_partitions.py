@@ -0,0 +1,52 @@
+"""
+Maintenance of the monthly transactions partitions (Postgres).
+
+Create the missing partitions from the command line with:
+    python -m api.jobs.transaction_partitions
+Archive the months before a date (detach, export to <dir>/<partition>.csv.gz, drop) with:
+    python -m api.jobs.transaction_partitions --archive-before 2025-01-01 [--archive-dir ./archive]
+"""
+import argparse
+from datetime import date
+from pathlib import Path
+from api.config.config import (
+    TRANSACTION_ARCHIVE_DIR,
+    TRANSACTION_PARTITION_INTERVAL_SECONDS,
+    TRANSACTION_PARTITION_MONTHS_AHEAD,
+)
+from api.database.partitions import archive_partitions, ensure_partitions
+from api.database.session import SessionLocal
+from api.utils.periodic import PeriodicJob
+
+
+def create_future_partitions():
+    db = SessionLocal()
+    try:
+        ensure_partitions(db, TRANSACTION_PARTITION_MONTHS_AHEAD)
+    finally:
+        db.close()
+
+
+def archive_transaction_partitions(before: date, directory: Path):
+    db = SessionLocal()
+    try:
+        return archive_partitions(db, before, directory)
+    finally:
+        db.close()
+
+
+def create_partition_maintenance_job() -> PeriodicJob:
+    return PeriodicJob("transaction-partitions", TRANSACTION_PARTITION_INTERVAL_SECONDS, create_future_partitions)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create and archive monthly transactions partitions.")
+    parser.add_argument("--archive-before", type=date.fromisoformat,
+                        help="Archive the partitions holding only transactions older than this date")
+    parser.add_argument("--archive-dir", type=Path, default=Path(TRANSACTION_ARCHIVE_DIR))
+    args = parser.parse_args()
+
+    create_future_partitions()
+    if args.archive_before:
+        for path in archive_transaction_partitions(args.archive_before, args.archive_dir):
+            print(path)
@@ -0,0 +1,26 @@
+"""
+Background catch-up of the daily reporting rollups.
+
+Run once from the command line (e.g. to build the rollups of an existing history) with:
+    python -m api.jobs.transaction_rollups
+"""
+from api.config.config import TRANSACTION_ROLLUP_INTERVAL_SECONDS
+from api.database.session import SessionLocal
+from api.services.reporting_service import ReportingService
+from api.utils.periodic import PeriodicJob
+
+
+def catch_up_transaction_rollups():
+    db = SessionLocal()
+    try:
+        ReportingService().catch_up(db)
+    finally:
+        db.close()
+
+
+def create_transaction_rollup_job() -> PeriodicJob:
+    return PeriodicJob("transaction-rollups", TRANSACTION_ROLLUP_INTERVAL_SECONDS, catch_up_transaction_rollups)
+
+
+if __name__ == "__main__":
+    catch_up_transaction_rollups()
@@ -1,28 +1,128 @@
 import logging
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
 from api.controllers.bank_account_controller import router as account_router
 from api.controllers.customer_controller import router as customer_router
 from api.controllers.transaction_controller import router as transaction_router
 from api.controllers.administrative_entity_controller import router as administrative_entity_router
-from api.database.session import engine
+from api.controllers.report_controller import router as report_router
+from api.database.session import engine, replica_router
+from api.database.locking import lock_stats
+from api.database.pool_metrics import pool_status, pool_wait_stats
+from api.database.query_stats import QueryStatsMiddleware
+from api.database.async_session import get_async_engine_if_created
+from api.config.config import (
+    ADMIN_BALANCE_SHARDS,
+    LEDGER_CHECKPOINT_INTERVAL_SECONDS,
+    TRANSACTION_PARTITION_INTERVAL_SECONDS,
+    TRANSACTION_ROLLUP_INTERVAL_SECONDS,
+    DATABASE_MODE,
+    DATABASE_REPLICA_URLS,
+    DEBUG,
+)
+from api.controllers.async_routing import to_async_router
+from api.jobs.shard_consolidation import create_shard_consolidation_job
+from api.jobs.ledger_checkpoint import create_ledger_checkpoint_job
+from api.jobs.transaction_partitions import create_partition_maintenance_job
+from api.jobs.transaction_rollups import create_transaction_rollup_job
+from api.jobs.replica_lag import create_replica_lag_job
+from api.services.group_commit_service import get_group_commit_writer, stop_group_commit_writer
+from api.utils.logger import CorrelationIdMiddleware, configure_logging, stop_logging
+from api.utils.metrics import MetricsMiddleware, render_metrics
 from api.database.base import Base
 from api.models.bank_account import BankAccount  # noqa
 from api.models.customer import Customer  # noqa
 
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Start and stop the log writer and the background jobs enabled by configuration.
+    """
+    configure_logging()
+    jobs = []
+    if ADMIN_BALANCE_SHARDS > 0:
+        jobs.append(create_shard_consolidation_job())
+    if LEDGER_CHECKPOINT_INTERVAL_SECONDS > 0:
+        jobs.append(create_ledger_checkpoint_job())
+    # Only Postgres partitions the transactions table.
+    if TRANSACTION_PARTITION_INTERVAL_SECONDS > 0 and engine.dialect.name == "postgresql":
+        jobs.append(create_partition_maintenance_job())
+    if TRANSACTION_ROLLUP_INTERVAL_SECONDS > 0:
+        jobs.append(create_transaction_rollup_job())
+    if DATABASE_REPLICA_URLS:
+        jobs.append(create_replica_lag_job())
+
+    for job in jobs:
+        job.start()
+    yield
+    for job in jobs:
+        job.stop()
+    stop_group_commit_writer()
+    stop_logging()
+
+
 api = FastAPI(
     title="Banking App API",
     description="REST API for Bank Account Management",
     version="0.1.0",
+    lifespan=lifespan,
 )
+api.add_middleware(MetricsMiddleware)
+if DEBUG:
+    api.add_middleware(QueryStatsMiddleware)
+# Added last so it runs first: everything logged while serving a request carries its id.
+api.add_middleware(CorrelationIdMiddleware)
 
-api.include_router(account_router, prefix="/api/v1", tags=["bank-accounts"])
-api.include_router(customer_router, prefix="/api/v1", tags=["customers"])
-api.include_router(administrative_entity_router, prefix="/api/v1", tags=["administrative-entities"])
-api.include_router(transaction_router, prefix="/api/v1", tags=["transactions"])
+routers = [
+    (account_router, "bank-accounts"),
+    (customer_router, "customers"),
+    (administrative_entity_router, "administrative-entities"),
+    (transaction_router, "transactions"),
+    (report_router, "reports"),
+]
+for router, tag in routers:
+    if DATABASE_MODE == "async":
+        router = to_async_router(router)
+    api.include_router(router, prefix="/api/v1", tags=[tag])
 
 
 @api.get("/ping")
 def health_check():
     return {"status": "ok"}
+
+
+@api.get("/metrics", include_in_schema=False)
+def metrics():
+    """
+    Request latencies, money movement counters and phase timings in the Prometheus text format.
+    """
+    content, content_type = render_metrics()
+    return Response(content=content, media_type=content_type)
+
+
+@api.get("/stats/locks")
+def lock_contention_stats():
+    return lock_stats.snapshot()
+
+
+@api.get("/stats/pool")
+def connection_pool_stats():
+    stats = {"sync": pool_status(engine.pool), **pool_wait_stats.snapshot()}
+    async_engine = get_async_engine_if_created()
+    if async_engine is not None:
+        stats["async"] = pool_status(async_engine.sync_engine.pool)
+    return stats
+
+
+@api.get("/stats/group-commit")
+def group_commit_stats():
+    writer = get_group_commit_writer()
+    return writer.stats() if writer else {"enabled": False}
+
+
+@api.get("/stats/replicas")
+def replica_stats():
+    return {"max_lag_seconds": replica_router.max_lag_seconds, "replicas": replica_router.status()}
@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, Numeric, ForeignKey, UniqueConstraint
+from api.database.base import Base
+
+
+class AccountBalanceShard(Base):
+    """
+    A slice of an administrative account balance.
+    The logical balance of a striped account is its own balance plus the sum of its shards.
+    """
+    __tablename__ = "account_balance_shards"
+    __table_args__ = (UniqueConstraint("account_id", "shard_index"),)
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    account_id = Column(Integer, ForeignKey("bank_accounts.id"), nullable=False)
+    shard_index = Column(Integer, nullable=False)
+    balance = Column(Numeric(10, 2), nullable=False, default=0)
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, BigInteger, String, Sequence
+from api.database.base import Base
+
+# Source of account number sequence values on Postgres. nextval() is not transactional, so values
+# reserved by a rolled back transaction are never handed out twice.
+account_number_sequence = Sequence("account_number_seq", metadata=Base.metadata)
+
+
+class AccountNumberCounter(Base):
+    """
+    Last account number sequence value handed out, for databases without sequences (SQLite).
+    A single row, advanced with UPDATE ... RETURNING in the transaction that creates the accounts.
+    """
+    __tablename__ = "account_number_counters"
+
+    name = Column(String(64), primary_key=True)
+    last_value = Column(BigInteger, nullable=False, default=0)
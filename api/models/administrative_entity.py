@@ -1,6 +1,6 @@
 from sqlalchemy import Column, Integer, String
 
-from api.database.base import Base
+from api.database.base import EAGER_ONLY, Base
 from sqlalchemy.orm import relationship
 
 
@@ -11,4 +11,4 @@ class AdministrativeEntity(Base):
     tax_id = Column(String, nullable=False)
     corporate_name = Column(String, nullable=False)
 
-    bank_accounts = relationship("BankAccount", back_populates="administrative_entity")
+    bank_accounts = relationship("BankAccount", back_populates="administrative_entity", lazy=EAGER_ONLY)
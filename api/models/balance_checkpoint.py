@@ -0,0 +1,17 @@
+from sqlalchemy import BigInteger, Column, Integer, Numeric, DateTime, ForeignKey
+from datetime import datetime
+from api.database.base import Base
+
+
+class BalanceCheckpoint(Base):
+    """
+    Balance of an account materialized from the ledger up to (and including) the entries at
+    position (last_xid, last_entry_id) in commit order.
+    """
+    __tablename__ = "balance_checkpoints"
+
+    account_id = Column(Integer, ForeignKey("bank_accounts.id"), primary_key=True)
+    last_xid = Column(BigInteger, nullable=False, default=0)
+    last_entry_id = Column(Integer, nullable=False, default=0)
+    balance = Column(Numeric(10, 2), nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
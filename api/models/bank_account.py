@@ -1,8 +1,9 @@
-from sqlalchemy import Column, Integer, String, Numeric, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Numeric, DateTime, ForeignKey, Enum, Index, func, select
 from datetime import datetime
 from enum import Enum as PythonEnum
-from api.database.base import Base
-from sqlalchemy.orm import relationship
+from api.database.base import EAGER_ONLY_MANY_TO_ONE, Base
+from sqlalchemy.orm import column_property, relationship
+from api.models.account_balance_shard import AccountBalanceShard
 
 
 class AccountType(PythonEnum):
@@ -17,6 +18,14 @@ class AccountStatus(PythonEnum):
 
 class BankAccount(Base):
     __tablename__ = "bank_accounts"
+    __table_args__ = (
+        # Filters of the account listing, each returning the rows in keyset (id) order.
+        Index("ix_bank_accounts_account_type_status_id", "account_type", "status", "id"),
+        Index("ix_bank_accounts_status_id", "status", "id"),
+        Index("ix_bank_accounts_customer_id_id", "customer_id", "id"),
+        Index("ix_bank_accounts_administrative_entity_id_id", "administrative_entity_id", "id"),
+    )
+
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     account_number = Column(String, unique=True, nullable=False)
     balance = Column(Numeric(10, 2), default=0.00)
@@ -27,5 +36,18 @@ class BankAccount(Base):
     customer_id = Column(Integer, ForeignKey("customers.id"), nullable=True)
     administrative_entity_id = Column(Integer, ForeignKey("administrative_entities.id"), nullable=True)
 
-    customer = relationship("Customer", back_populates="bank_accounts")
-    administrative_entity = relationship("AdministrativeEntity", back_populates="bank_accounts")
+    # Part of the logical balance held in balance shards (striped accounts). Deferred: only
+    # loaded when a query asks for it, e.g. with selectinload(...).undefer(BankAccount.shard_balance).
+    shard_balance = column_property(
+        select(func.coalesce(func.sum(AccountBalanceShard.balance), 0))
+        .where(AccountBalanceShard.account_id == id)
+        .correlate_except(AccountBalanceShard)
+        .scalar_subquery(),
+        deferred=True,
+    )
+
+    # Owners and their account lists are loaded eagerly where they are needed (STRICT_LAZY_LOADS).
+    customer = relationship("Customer", back_populates="bank_accounts", lazy=EAGER_ONLY_MANY_TO_ONE)
+    administrative_entity = relationship(
+        "AdministrativeEntity", back_populates="bank_accounts", lazy=EAGER_ONLY_MANY_TO_ONE
+    )
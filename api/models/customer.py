@@ -1,5 +1,5 @@
 from sqlalchemy import Column, Integer, String
-from api.database.base import Base
+from api.database.base import EAGER_ONLY, Base
 from sqlalchemy.orm import relationship
 
 
@@ -7,4 +7,4 @@ class Customer(Base):
     __tablename__ = "customers"
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     customer_name = Column(String, nullable=False)
-    bank_accounts = relationship("BankAccount", back_populates="customer")
+    bank_accounts = relationship("BankAccount", back_populates="customer", lazy=EAGER_ONLY)
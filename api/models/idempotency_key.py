@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from api.database.base import Base
+
+
+class IdempotencyKey(Base):
+    """
+    Client supplied Idempotency-Key of a money movement, stored in the same database
+    transaction as the Transaction it produced. The primary key doubles as the unique index
+    that rejects a concurrent duplicate.
+    """
+    __tablename__ = "idempotency_keys"
+
+    key = Column(String(255), primary_key=True)
+    request_fingerprint = Column(String(255), nullable=False)
+    # No database foreign key: on Postgres transactions is partitioned and its id alone is not unique.
+    # The transaction may also have been archived; the key is kept (see IdempotencyService.find).
+    transaction_id = Column(Integer, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    transaction = relationship("Transaction", primaryjoin="foreign(IdempotencyKey.transaction_id) == Transaction.id")
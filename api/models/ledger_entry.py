@@ -0,0 +1,38 @@
+from sqlalchemy import BigInteger, Column, Integer, Numeric, DateTime, ForeignKey, Enum, Index
+from datetime import datetime
+from enum import Enum as PythonEnum
+from api.database.base import Base
+from api.database.commit_order import current_xid
+from sqlalchemy.orm import relationship
+
+
+class EntryType(PythonEnum):
+    DEBIT = "DEBIT"
+    CREDIT = "CREDIT"
+
+
+class LedgerEntry(Base):
+    """
+    Append-only double-entry audit record: every transaction writes one debit for its source
+    account and one credit for its destination account, in the same database transaction as
+    the balance updates. Entries without a transaction record the opening balance of an account.
+    """
+    __tablename__ = "ledger_entries"
+    __table_args__ = (
+        Index("ix_ledger_entries_account_id_xid_id", "account_id", "xid", "id"),
+        Index("ix_ledger_entries_account_id_created_at", "account_id", "created_at"),
+        Index("ix_ledger_entries_xid_id", "xid", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    # No database foreign key: on Postgres transactions is partitioned and its id alone is not unique.
+    transaction_id = Column(Integer, nullable=True)
+    account_id = Column(Integer, ForeignKey("bank_accounts.id"), nullable=False)
+    entry_type = Column(Enum(EntryType), nullable=False)
+    amount = Column(Numeric(10, 2), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    # Writing database transaction: checkpoints read the entries in (xid, id) commit order (api.database.commit_order).
+    xid = Column(BigInteger, default=current_xid(), nullable=False)
+
+    transaction = relationship("Transaction", primaryjoin="foreign(LedgerEntry.transaction_id) == Transaction.id")
+    account = relationship("BankAccount")
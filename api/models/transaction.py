@@ -1,8 +1,9 @@
-from sqlalchemy import Column, Integer, Numeric, DateTime, ForeignKey, Enum
+from sqlalchemy import BigInteger, Column, Integer, Numeric, DateTime, ForeignKey, Enum, Index
 from datetime import datetime
 from datetime import timezone
 from enum import Enum as PythonEnum
 from api.database.base import Base
+from api.database.commit_order import current_xid
 
 class TransactionType(PythonEnum):
     TRANSFER = "TRANSFER"
@@ -11,11 +12,23 @@ class TransactionType(PythonEnum):
 
 
 class Transaction(Base):
+    # On Postgres the table is range partitioned by month on timestamp (see the
+    # partition_transactions_by_month migration and api.database.partitions); the
+    # mapping stays a plain table so SQLite and create_all keep working.
     __tablename__ = "transactions"
-    
+    __table_args__ = (
+        # Serve the account history (keyset ordered by timestamp, id) from the index alone.
+        Index("ix_transactions_source_account_id_timestamp_id", "source_account_id", "timestamp", "id"),
+        Index("ix_transactions_destination_account_id_timestamp_id", "destination_account_id", "timestamp", "id"),
+        # Rollup windows in commit order.
+        Index("ix_transactions_xid_id", "xid", "id"),
+    )
+
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     amount = Column(Numeric(10, 2), nullable=False)
-    timestamp = Column(DateTime, default=datetime.now(timezone.utc))
+    timestamp = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     transaction_type = Column(Enum(TransactionType), nullable=False)
     source_account_id = Column(Integer, ForeignKey("bank_accounts.id"), nullable=True)
     destination_account_id = Column(Integer, ForeignKey("bank_accounts.id"), nullable=True)
+    # Writing database transaction: rollups read the transactions in (xid, id) commit order (api.database.commit_order).
+    xid = Column(BigInteger, default=current_xid(), nullable=False)
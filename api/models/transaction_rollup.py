@@ -0,0 +1,42 @@
+from sqlalchemy import BigInteger, Column, Integer, Numeric, Date, DateTime, Enum, ForeignKey, Index, String
+from datetime import datetime
+from api.database.base import Base
+from api.models.ledger_entry import EntryType
+from api.models.transaction import TransactionType
+
+
+class TransactionRollup(Base):
+    """
+    Daily totals of the transactions of an administrative account, per transaction type and side
+    (DEBIT when the account sent the money, CREDIT when it received it). Maintained incrementally
+    from the transactions after the rollup watermark, so reports never scan the history.
+    """
+    __tablename__ = "transaction_rollups"
+    __table_args__ = (
+        # Reports over every administrative account read one range of days.
+        Index("ix_transaction_rollups_day", "day"),
+    )
+
+    account_id = Column(Integer, ForeignKey("bank_accounts.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    transaction_type = Column(Enum(TransactionType), primary_key=True)
+    entry_type = Column(Enum(EntryType), primary_key=True)
+    transaction_count = Column(Integer, nullable=False, default=0)
+    total_amount = Column(Numeric(18, 2), nullable=False, default=0)
+    min_amount = Column(Numeric(10, 2), nullable=False)
+    max_amount = Column(Numeric(10, 2), nullable=False)
+
+
+class RollupWatermark(Base):
+    """
+    Commit order position (last_xid, last_transaction_id) of the last transaction included in the
+    rollups named name. caught_up_at is set when a run has rolled up everything settled: every
+    transaction committed before it is included.
+    """
+    __tablename__ = "rollup_watermarks"
+
+    name = Column(String(64), primary_key=True)
+    last_xid = Column(BigInteger, nullable=False, default=0)
+    last_transaction_id = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    caught_up_at = Column(DateTime, nullable=True)
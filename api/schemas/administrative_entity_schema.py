@@ -1,5 +1,7 @@
+from typing import List
 from pydantic import BaseModel
 from pydantic.dataclasses import ConfigDict
+from api.schemas.bank_account_schema import BankAccountResponse
 
 
 class AdministrativeEntityCreate(BaseModel):
@@ -23,3 +25,10 @@ class AdministrativeEntityListResponse(BaseModel):
     corporate_name: str
     tax_id: str
 
+
+class AdministrativeEntityPortfolioResponse(BaseModel):
+    id: int
+    tax_id: str
+    corporate_name: str
+    accounts: List[BankAccountResponse]
+    total_balance: float
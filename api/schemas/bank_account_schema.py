@@ -1,3 +1,6 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional
 from pydantic import BaseModel
 from api.models.bank_account import AccountType
 from pydantic.dataclasses import ConfigDict
@@ -21,3 +24,36 @@ class BankAccountResponse(BaseModel):
     account_type: AccountType
     status: AccountStatus
 
+    @classmethod
+    def from_account(cls, account):
+        """
+        Response with the logical balance; load shard_balance with the account to avoid a query per account.
+        """
+        return cls(
+            id=account.id,
+            account_number=account.account_number,
+            balance=float(account.balance + account.shard_balance),
+            account_type=account.account_type,
+            status=account.status,
+        )
+
+
+
+class AccountFilter(BaseModel):
+    """
+    Server-side filters of the account listing. The balance range applies to the logical
+    balance, shards of striped accounts included, and needs a customer_id or
+    administrative_entity_id filter.
+    """
+    account_type: Optional[AccountType] = None
+    status: Optional[AccountStatus] = None
+    customer_id: Optional[int] = None
+    administrative_entity_id: Optional[int] = None
+    min_balance: Optional[Decimal] = None
+    max_balance: Optional[Decimal] = None
+
+
+class AccountBalanceResponse(BaseModel):
+    account_id: int
+    balance: float
+    as_of: Optional[datetime] = None
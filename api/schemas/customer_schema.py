@@ -1,4 +1,6 @@
+from typing import List
 from pydantic import BaseModel
+from api.schemas.bank_account_schema import BankAccountResponse
 
 
 class CustomerBase(BaseModel):
@@ -13,3 +15,7 @@ class CustomerResponse(CustomerBase):
     id: int
     customer_name: str
 
+
+class CustomerPortfolioResponse(CustomerResponse):
+    accounts: List[BankAccountResponse]
+    total_balance: float
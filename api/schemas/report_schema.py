@@ -0,0 +1,26 @@
+from datetime import date, datetime
+from typing import List, Optional
+from pydantic import BaseModel
+from pydantic.dataclasses import ConfigDict
+from api.models.ledger_entry import EntryType
+from api.models.transaction import TransactionType
+
+
+class DailyVolume(BaseModel):
+    account_id: int
+    day: date
+    transaction_type: TransactionType
+    entry_type: EntryType
+    transaction_count: int
+    total_amount: float
+    min_amount: float
+    max_amount: float
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class DailyVolumeReport(BaseModel):
+    # Every transaction committed before this time is included, None before the first complete
+    # catch-up run. Later ones may or may not be included yet.
+    rolled_up_at: Optional[datetime]
+    days: List[DailyVolume]
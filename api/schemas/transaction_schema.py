@@ -1,7 +1,7 @@
 from decimal import Decimal
 from datetime import datetime
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from api.models.transaction import TransactionType
 from pydantic.dataclasses import ConfigDict
 
@@ -35,6 +35,23 @@ class TransferCreate(BaseModel):
     destination_account_id: int
 
 
+class TransferBatchCreate(BaseModel):
+    transfers: List[TransferCreate]
+
+
+class TransferBatchItemResult(BaseModel):
+    index: int
+    status: str
+    transaction_id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class TransferBatchResponse(BaseModel):
+    completed: int
+    failed: int
+    results: List[TransferBatchItemResult]
+
+
 class TransactionResponse(BaseModel):
     id: int
     amount: float
@@ -0,0 +1,67 @@
+from typing import NamedTuple, Optional
+from sqlalchemy.orm import Session
+from api.config.config import ACCOUNT_METADATA_CACHE_SIZE, ACCOUNT_METADATA_CACHE_TTL_SECONDS
+from api.dao.bank_account_dao import BankAccountDAO
+from api.models.bank_account import AccountStatus, AccountType
+from api.utils.cache import LRUCache
+
+# account id -> AccountMetadata, and account number -> account id
+account_metadata_cache = LRUCache(ACCOUNT_METADATA_CACHE_SIZE, ttl_seconds=ACCOUNT_METADATA_CACHE_TTL_SECONDS)
+account_number_cache = LRUCache(ACCOUNT_METADATA_CACHE_SIZE, ttl_seconds=ACCOUNT_METADATA_CACHE_TTL_SECONDS)
+
+
+class AccountMetadata(NamedTuple):
+    id: int
+    account_number: str
+    account_type: AccountType
+    status: AccountStatus
+    customer_id: Optional[int]
+    administrative_entity_id: Optional[int]
+
+
+class AccountMetadataService:
+    """
+    Cached view of the columns of an account that almost never change. Good enough to reject
+    invalid requests early; anything that must be exact (status included) is checked again on
+    the locked row. Unknown accounts are not cached, so new accounts are found right away.
+    """
+
+    def __init__(
+        self,
+        account_dao: BankAccountDAO = None,
+        cache: LRUCache = account_metadata_cache,
+        number_cache: LRUCache = account_number_cache,
+    ):
+        self.account_dao = account_dao or BankAccountDAO()
+        self.cache = cache
+        self.number_cache = number_cache
+
+    def get(self, db: Session, account_id: int) -> Optional[AccountMetadata]:
+        metadata = self.cache.get(account_id)
+        if metadata is None:
+            metadata = self._load(db, account_id=account_id)
+        return metadata
+
+    def get_by_account_number(self, db: Session, account_number: str) -> Optional[AccountMetadata]:
+        account_id = self.number_cache.get(account_number)
+        if account_id is not None:
+            metadata = self.cache.get(account_id)
+            if metadata is not None:
+                return metadata
+        return self._load(db, account_number=account_number)
+
+    def invalidate(self, account_id: int, account_number: str = None):
+        metadata = self.cache.pop(account_id)
+        if metadata is not None:
+            self.number_cache.pop(metadata.account_number)
+        if account_number is not None:
+            self.number_cache.pop(account_number)
+
+    def _load(self, db: Session, account_id: int = None, account_number: str = None) -> Optional[AccountMetadata]:
+        row = self.account_dao.get_account_metadata(db, account_id=account_id, account_number=account_number)
+        if row is None:
+            return None
+        metadata = AccountMetadata(*row)
+        self.cache.set(metadata.id, metadata)
+        self.number_cache.set(metadata.account_number, metadata.id)
+        return metadata
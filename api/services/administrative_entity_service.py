@@ -1,6 +1,12 @@
+from decimal import Decimal
 from sqlalchemy.orm import Session
 from api.dao.administrative_entity_dao import AdministrativeEntityDAO
-from api.schemas.administrative_entity_schema import AdministrativeEntityResponse, AdministrativeEntityListResponse
+from api.schemas.administrative_entity_schema import (
+    AdministrativeEntityResponse,
+    AdministrativeEntityListResponse,
+    AdministrativeEntityPortfolioResponse,
+)
+from api.schemas.bank_account_schema import BankAccountResponse
 from api.models.administrative_entity import AdministrativeEntity
 from typing import List
 
@@ -40,3 +46,22 @@ class AdministrativeEntityService:
         if not entity:
             raise ValueError("administrative entity not found")
         return AdministrativeEntityResponse.model_validate(entity)
+
+    def get_administrative_entity_portfolio(self, db: Session, entity_id: int) -> AdministrativeEntityPortfolioResponse:
+        """
+        Fetch a administrative entity together with its accounts and their current balances.
+        """
+        entity = self.entity_dao.get_corporate_entity_portfolio(db, entity_id)
+        if not entity:
+            raise ValueError("administrative entity not found")
+        accounts = [
+            BankAccountResponse.from_account(account)
+            for account in sorted(entity.bank_accounts, key=lambda account: account.id)
+        ]
+        return AdministrativeEntityPortfolioResponse(
+            id=entity.id,
+            tax_id=entity.tax_id,
+            corporate_name=entity.corporate_name,
+            accounts=accounts,
+            total_balance=sum((account.balance + account.shard_balance for account in entity.bank_accounts), Decimal(0)),
+        )
@@ -0,0 +1,139 @@
+from decimal import Decimal, ROUND_DOWN
+from typing import List, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from api.config.config import ADMIN_BALANCE_SHARDS
+from api.database.locking import lock_accounts, lock_all_shards, lock_available_shard
+from api.models.account_balance_shard import AccountBalanceShard
+from api.models.bank_account import AccountStatus, AccountType, BankAccount
+from api.utils.exceptions import AccountNotFoundError
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class BalanceShardService:
+    """
+    Spreads the balance of hot administrative accounts over several shard rows so that
+    concurrent deposits and withdrawals do not all serialize on one row lock.
+    The logical balance of an account is its own balance plus the sum of its shards.
+    """
+
+    def __init__(self, shard_count: int = ADMIN_BALANCE_SHARDS):
+        self.shard_count = shard_count
+
+    @property
+    def enabled(self) -> bool:
+        return self.shard_count > 0
+
+    def debit(self, db: Session, account_id: int, amount: Decimal) -> bool:
+        """
+        Take money out of a striped account. Returns False when the logical balance is not enough.
+        A shard that can cover the whole amount is used when one is free. Otherwise the account
+        row and all shards are locked, folded into the account row and debited there.
+        Raises ValueError when the account is closed.
+        """
+        shard = lock_available_shard(db, account_id, min_balance=amount)
+        if shard:
+            shard.balance -= amount
+            return True
+
+        account, shards = self.lock_account(db, account_id)
+        self._ensure_active(account_id, account)
+        if account.balance + sum(shard.balance for shard in shards) < amount:
+            return False
+
+        self.settle(account, shards, -amount)
+        return True
+
+    def credit(self, db: Session, account_id: int, amount: Decimal):
+        """
+        Put money into a striped account, on a free shard when there is one.
+        Raises ValueError when the account is closed.
+        """
+        shard = lock_available_shard(db, account_id)
+        if shard:
+            shard.balance += amount
+            return
+
+        account = lock_accounts(db, [account_id]).get(account_id)
+        self._ensure_active(account_id, account)
+        account.balance += amount
+
+    def lock_account(self, db: Session, account_id: int) -> Tuple[Optional[BankAccount], List[AccountBalanceShard]]:
+        """
+        Lock the row of a striped account, then all of its shards, for movements that need the
+        exact logical balance. Returns (None, []) when the account does not exist.
+        """
+        account = lock_accounts(db, [account_id]).get(account_id)
+        if not account:
+            return None, []
+        return account, lock_all_shards(db, account_id)
+
+    @staticmethod
+    def settle(account: BankAccount, shards: List[AccountBalanceShard], delta: Decimal):
+        """
+        Apply delta to an account locked with lock_account. The change goes to the account row;
+        the shards are folded into it only when the row alone cannot cover a debit.
+        """
+        account.balance += delta
+        if account.balance < 0:
+            for shard in shards:
+                account.balance += shard.balance
+                shard.balance = Decimal("0")
+
+    @staticmethod
+    def _ensure_active(account_id: int, account: Optional[BankAccount]):
+        # The status cached in the account metadata may be stale: this one is read on the locked row.
+        if not account:
+            raise AccountNotFoundError(f"Account {account_id} not found.")
+        if account.status == AccountStatus.CLOSED:
+            raise ValueError(f"Account {account_id} is closed.")
+
+    def consolidate(self, db: Session, account_id: int):
+        """
+        Fold the shards of an account together and spread the logical balance evenly over
+        shard_count shards again, creating missing shards. With striping disabled every
+        shard is folded back into the account row, and closed accounts get no shards.
+        """
+        try:
+            account = lock_accounts(db, [account_id]).get(account_id)
+            if not account:
+                raise AccountNotFoundError(f"Account {account_id} not found.")
+
+            shard_count = self.shard_count if account.status == AccountStatus.ACTIVE else 0
+            shards = lock_all_shards(db, account_id)
+            existing = {shard.shard_index for shard in shards}
+            for shard_index in range(shard_count):
+                if shard_index not in existing:
+                    shard = AccountBalanceShard(account_id=account_id, shard_index=shard_index, balance=Decimal("0"))
+                    db.add(shard)
+                    shards.append(shard)
+
+            total = account.balance + sum(shard.balance for shard in shards)
+            active = [shard for shard in shards if shard.shard_index < shard_count]
+            share = Decimal("0")
+            if active and total > 0:
+                share = (total / len(active)).quantize(Decimal("0.01"), rounding=ROUND_DOWN)
+
+            for shard in shards:
+                shard.balance = share if shard.shard_index < shard_count else Decimal("0")
+            account.balance = total - share * len(active)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error("Error consolidating balance shards of account %s: %s", account_id, e)
+            raise e
+
+    def consolidate_all(self, db: Session) -> List[int]:
+        """
+        Consolidate every administrative account, one short transaction per account.
+        """
+        account_ids = db.execute(
+            select(BankAccount.id).where(BankAccount.account_type == AccountType.ADMINISTRATIVE)
+        ).scalars().all()
+        db.rollback()
+        for account_id in account_ids:
+            self.consolidate(db, account_id)
+        logger.info("Consolidated balance shards of %d administrative accounts", len(account_ids))
+        return list(account_ids)
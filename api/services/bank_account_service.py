@@ -3,31 +3,54 @@ from sqlalchemy.orm import Session
 from api.dao.bank_account_dao import BankAccountDAO
 from api.schemas.bank_account_schema import BankAccountCreate, BankAccountResponse
 from api.models.bank_account import BankAccount, AccountType
+from api.services.account_metadata_service import AccountMetadataService
+from api.utils.exceptions import AccountNotFoundError
 from sqlalchemy.orm import Session, attributes
 from typing import Optional
 
 
 
 class BankAccountService:
-    def __init__(self, account_dao: BankAccountDAO):
+    def __init__(self, account_dao: BankAccountDAO, account_metadata_service: AccountMetadataService = None):
         self.account_dao = account_dao
+        self.account_metadata_service = account_metadata_service or AccountMetadataService(account_dao)
 
     def create_new_account(self, db: Session, account_data: BankAccountCreate) -> BankAccountResponse:
         created_account = self.account_dao.create_account(db, account_data)
+        self.account_metadata_service.invalidate(created_account.id, created_account.account_number)
         return BankAccountResponse.model_validate(attributes.instance_dict(created_account))
 
+    def close_account(self, db: Session, account_id: int) -> BankAccountResponse:
+        try:
+            account = self.account_dao.close_account(db, account_id)
+        except Exception:
+            db.rollback()
+            raise
+        if not account:
+            db.rollback()
+            raise AccountNotFoundError(f"Account {account_id} not found.")
+        self.account_metadata_service.invalidate(account.id, account.account_number)
+        return self._to_responses(db, [account])[0]
+
     def get_all_accounts(self, db: Session) -> List[BankAccountResponse]:
         accounts = self.account_dao.get_all_accounts(db)
-        return [BankAccountResponse.model_validate(attributes.instance_dict(account)) for account in accounts] 
+        return self._to_responses(db, accounts)
 
     def get_account_by_id(self, db: Session, account_id: int) -> Optional[BankAccountResponse]:
         account = self.account_dao.get_account_by_id(db, account_id)
         if account:
-            return BankAccountResponse.model_validate(attributes.instance_dict(account))
+            return self._to_responses(db, [account])[0]
         return None
 
     def get_administrative_account(self, db: Session, account_name: str) -> Optional[BankAccountResponse]:
         account = self.account_dao.get_account_by_name_and_type(db, account_name, AccountType.ADMINISTRATIVE)
         if account:
-            return BankAccountResponse.model_validate(attributes.instance_dict(account))
+            return self._to_responses(db, [account])[0]
         return None
+
+    def _to_responses(self, db: Session, accounts: List[BankAccount]) -> List[BankAccountResponse]:
+        """
+        Build responses with the logical balance, which for striped administrative
+        accounts includes the balance held in their shards (BankAccount.shard_balance).
+        """
+        return [BankAccountResponse.from_account(account) for account in accounts]
@@ -1,6 +1,8 @@
+from decimal import Decimal
 from sqlalchemy.orm import Session
 from api.dao.customer_dao import CustomerDAO
-from api.schemas.customer_schema import CustomerCreate, CustomerResponse
+from api.schemas.bank_account_schema import BankAccountResponse
+from api.schemas.customer_schema import CustomerCreate, CustomerPortfolioResponse, CustomerResponse
 
 
 class CustomerService:
@@ -29,6 +31,21 @@ class CustomerService:
             return CustomerResponse.model_validate(customer_dict)
         return None
 
+    def get_customer_portfolio(self, db: Session, customer_id: int) -> CustomerPortfolioResponse:
+        customer = self.customer_dao.get_customer_portfolio(db, customer_id)
+        if not customer:
+            return None
+        accounts = [
+            BankAccountResponse.from_account(account)
+            for account in sorted(customer.bank_accounts, key=lambda account: account.id)
+        ]
+        return CustomerPortfolioResponse(
+            id=customer.id,
+            customer_name=customer.customer_name,
+            accounts=accounts,
+            total_balance=sum((account.balance + account.shard_balance for account in customer.bank_accounts), Decimal(0)),
+        )
+
     def get_all_customers(self, db: Session) -> list[CustomerResponse]:
         customers = self.customer_dao.get_all_customers(db)
         return [
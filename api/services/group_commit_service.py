@@ -0,0 +1,239 @@
+import asyncio
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from decimal import Decimal
+from typing import Callable, List, Optional
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+from sqlalchemy.util.concurrency import await_only, in_greenlet
+from api.config.config import GROUP_COMMIT_ENABLED, GROUP_COMMIT_MAX_BATCH, GROUP_COMMIT_MAX_DELAY_MS
+from api.dao.bank_account_dao import BankAccountDAO
+from api.dao.transaction_dao import TransactionDAO
+from api.models.transaction import Transaction, TransactionType
+from api.services.bank_account_service import BankAccountService
+from api.services.idempotency_service import IdempotencyService
+from api.utils.metrics import count_transactions, phase_timer
+from api.services.transaction_service import TransactionService
+
+logger = logging.getLogger(__name__)
+
+
+class _QueuedMovement:
+
+    def __init__(self, transaction_type, amount, source_account_id, destination_account_id, idempotency_key):
+        self.transaction_type = transaction_type
+        self.amount = amount
+        self.source_account_id = source_account_id
+        self.destination_account_id = destination_account_id
+        self.idempotency_key = idempotency_key
+        self.fingerprint = IdempotencyService.fingerprint(
+            transaction_type, amount, source_account_id, destination_account_id
+        )
+        self.future = Future()
+
+
+class GroupCommitWriter:
+    """
+    Single writer thread that applies queued money movements in shared database transactions.
+    The writer waits up to max_delay_ms for more movements after the first one (or until
+    max_batch are queued), applies each of them inside its own savepoint and commits the
+    group once. Callers block on their own future and get the same result or exception as
+    with a commit per request.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        transaction_service: TransactionService = None,
+        max_delay_ms: int = GROUP_COMMIT_MAX_DELAY_MS,
+        max_batch: int = GROUP_COMMIT_MAX_BATCH,
+    ):
+        self.session_factory = session_factory
+        self.transaction_service = transaction_service or TransactionService(
+            BankAccountService(BankAccountDAO()), TransactionDAO()
+        )
+        self.max_delay = max_delay_ms / 1000
+        self.max_batch = max_batch
+        self._queue = queue.Queue()
+        self._thread = None
+        self._stats_lock = threading.Lock()
+        self.groups = 0
+        self.movements = 0
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name="group-commit-writer", daemon=True)
+        self._thread.start()
+        logger.info("Started group commit writer (%d movements / %gms)", self.max_batch, self.max_delay * 1000)
+
+    def stop(self, timeout: float = 5.0):
+        """
+        Commit what is already queued, then stop the writer thread.
+        """
+        self._queue.put(None)
+        if self._thread:
+            self._thread.join(timeout)
+        logger.info("Stopped group commit writer")
+
+    def submit(
+        self,
+        transaction_type: TransactionType,
+        amount: Decimal,
+        source_account_id: Optional[int],
+        destination_account_id: Optional[int],
+        idempotency_key: Optional[str] = None,
+    ) -> Future:
+        movement = _QueuedMovement(transaction_type, amount, source_account_id, destination_account_id, idempotency_key)
+        self._queue.put(movement)
+        return movement.future
+
+    def execute(
+        self,
+        transaction_type: TransactionType,
+        amount: Decimal,
+        source_account_id: Optional[int],
+        destination_account_id: Optional[int],
+        idempotency_key: Optional[str] = None,
+    ) -> Transaction:
+        """
+        Queue a movement and wait until its group is committed.
+        """
+        future = self.submit(transaction_type, amount, source_account_id, destination_account_id, idempotency_key)
+        if in_greenlet():
+            # Running under AsyncSession.run_sync: wait on the event loop instead of blocking it.
+            return await_only(asyncio.wrap_future(future))
+        return future.result()
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                "enabled": True,
+                "groups": self.groups,
+                "movements": self.movements,
+                "queued": self._queue.qsize(),
+            }
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            movement = self._queue.get()
+            if movement is None:
+                break
+            group = [movement]
+            deadline = time.monotonic() + self.max_delay
+            while len(group) < self.max_batch:
+                try:
+                    movement = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if movement is None:
+                    stopping = True
+                    break
+                group.append(movement)
+
+            try:
+                self._commit_group(group)
+            except Exception as e:
+                logger.error("Group commit of %d movements failed: %s", len(group), e)
+                for movement in group:
+                    if not movement.future.done():
+                        movement.future.set_exception(e)
+
+    def _commit_group(self, group: List[_QueuedMovement]):
+        service = self.transaction_service
+        applied = []
+        run_alone = []
+        db = self.session_factory()
+        try:
+            for movement in group:
+                savepoint = db.begin_nested()
+                try:
+                    transaction = service.apply_movement(
+                        db, movement.transaction_type, movement.amount, movement.source_account_id,
+                        movement.destination_account_id, movement.idempotency_key, movement.fingerprint,
+                    )
+                    savepoint.commit()
+                except DBAPIError:
+                    # Lock conflicts and idempotency key races: retried on their own after the group.
+                    savepoint.rollback()
+                    run_alone.append(movement)
+                except Exception as e:
+                    savepoint.rollback()
+                    count_transactions(movement.transaction_type, "failed")
+                    movement.future.set_exception(e)
+                else:
+                    applied.append((movement, transaction))
+
+            try:
+                with phase_timer("commit"):
+                    db.commit()
+            except DBAPIError as e:
+                logger.warning("Group commit of %d movements failed, applying them one by one: %s", len(applied), e)
+                db.rollback()
+                run_alone.extend(movement for movement, _ in applied)
+                applied = []
+
+            for movement, transaction in applied:
+                if service.idempotency_service.is_replay(transaction):
+                    count_transactions(movement.transaction_type, "replayed")
+                else:
+                    service.idempotency_service.remember(movement.idempotency_key, movement.fingerprint, transaction)
+                    count_transactions(movement.transaction_type, "completed")
+                movement.future.set_result(transaction)
+            for movement in run_alone:
+                self._run_alone(db, movement)
+        finally:
+            db.close()
+
+        with self._stats_lock:
+            self.groups += 1
+            self.movements += len(group)
+
+    def _run_alone(self, db: Session, movement: _QueuedMovement):
+        create = {
+            TransactionType.DEPOSIT: self.transaction_service.create_deposit_transaction,
+            TransactionType.TRANSFER: self.transaction_service.create_transfer,
+            TransactionType.WITHDRAW: self.transaction_service.create_withdrawal,
+        }[movement.transaction_type]
+        try:
+            movement.future.set_result(create(
+                db,
+                amount=movement.amount,
+                source_account_id=movement.source_account_id,
+                destination_account_id=movement.destination_account_id,
+                idempotency_key=movement.idempotency_key,
+            ))
+        except Exception as e:
+            movement.future.set_exception(e)
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_group_commit_writer() -> Optional[GroupCommitWriter]:
+    """
+    The process wide writer, started on first use. None when group commit is disabled.
+    """
+    global _writer
+    if not GROUP_COMMIT_ENABLED:
+        return None
+    with _writer_lock:
+        if _writer is None:
+            # Imported here so the service layer stays importable without the application engine.
+            from api.database.session import SessionLocal
+            _writer = GroupCommitWriter(SessionLocal)
+            _writer.start()
+    return _writer
+
+
+def stop_group_commit_writer():
+    global _writer
+    with _writer_lock:
+        if _writer is not None:
+            _writer.stop()
+            _writer = None
@@ -0,0 +1,88 @@
+from decimal import Decimal
+from typing import Optional
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session
+from api.config.config import IDEMPOTENCY_CACHE_SIZE
+from api.dao.idempotency_key_dao import IdempotencyKeyDAO
+from api.dao.transaction_dao import TransactionDAO
+from api.models.transaction import Transaction, TransactionType
+from api.utils.cache import LRUCache
+from api.utils.exceptions import IdempotencyKeyArchivedError, IdempotencyKeyReuseError
+
+# key -> (request fingerprint, transaction id) of committed movements
+idempotency_cache = LRUCache(IDEMPOTENCY_CACHE_SIZE)
+
+
+class IdempotencyService:
+    """
+    Deduplicates retried money movements. Keys are looked up in the process local cache first
+    and then in the database, so a replay never has to lock account rows.
+    """
+
+    def __init__(
+        self,
+        idempotency_key_dao: IdempotencyKeyDAO = None,
+        transaction_dao: TransactionDAO = None,
+        cache: LRUCache = idempotency_cache,
+    ):
+        self.idempotency_key_dao = idempotency_key_dao or IdempotencyKeyDAO()
+        self.transaction_dao = transaction_dao or TransactionDAO()
+        self.cache = cache
+
+    @staticmethod
+    def fingerprint(
+        transaction_type: TransactionType,
+        amount,
+        source_account_id: Optional[int],
+        destination_account_id: Optional[int],
+    ) -> str:
+        amount = Decimal(str(amount)).normalize()
+        return f"{transaction_type.value}:{amount}:{source_account_id}:{destination_account_id}"
+
+    def find(self, db: Session, key: Optional[str], fingerprint: str) -> Optional[Transaction]:
+        """
+        The transaction previously created with this key, or None when the key is new.
+        Raises IdempotencyKeyReuseError when the key belongs to a different request, and
+        IdempotencyKeyArchivedError when its transaction was archived with its partition: the
+        key is kept so the request is not applied a second time.
+        """
+        if key is None:
+            return None
+
+        cached = self.cache.get(key)
+        if cached is None:
+            stored = self.idempotency_key_dao.get_key(db, key)
+            if stored is None:
+                return None
+            cached = (stored.request_fingerprint, stored.transaction_id)
+            self.cache.set(key, cached)
+
+        stored_fingerprint, transaction_id = cached
+        if stored_fingerprint != fingerprint:
+            raise IdempotencyKeyReuseError()
+        transaction = self.transaction_dao.get_transaction_by_id(db, transaction_id)
+        if transaction is None:
+            raise IdempotencyKeyArchivedError()
+        return transaction
+
+    @staticmethod
+    def is_replay(transaction: Transaction) -> bool:
+        """
+        Whether a movement returned a stored transaction instead of creating one. New transactions are
+        inserted with RETURNING and never join the session, replayed ones are loaded through it.
+        """
+        return inspect(transaction).has_identity
+
+    def record(self, db: Session, key: Optional[str], fingerprint: str, transaction: Transaction):
+        """
+        Store the key with a pending transaction. Must be called before the commit.
+        """
+        if key is not None:
+            self.idempotency_key_dao.add_key(db, key, fingerprint, transaction)
+
+    def remember(self, key: Optional[str], fingerprint: str, transaction: Transaction):
+        """
+        Cache a key once its transaction is committed.
+        """
+        if key is not None:
+            self.cache.set(key, (fingerprint, transaction.id))
@@ -0,0 +1,100 @@
+from datetime import datetime
+from decimal import Decimal
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from api.dao.ledger_dao import LedgerDAO
+from api.database.commit_order import START, settled_xid_horizon
+from api.database.locking import lock_accounts, lock_all_shards
+from api.models.balance_checkpoint import BalanceCheckpoint
+from api.models.bank_account import BankAccount
+from api.models.ledger_entry import LedgerEntry
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class LedgerService:
+    """
+    Balances derived from the audit ledger. BankAccount.balance (plus its shards) stays the
+    balance money movements check and update; the ledger records every movement next to it so
+    past balances can be rebuilt. A checkpoint per account sums the ledger up to a known position
+    in commit order, so a historical balance only needs the entries between that checkpoint and
+    the requested point in time.
+    """
+
+    def __init__(self, ledger_dao: LedgerDAO = None):
+        self.ledger_dao = ledger_dao or LedgerDAO()
+
+    def get_balance_as_of(self, db: Session, account_id: int, as_of: datetime = None) -> Decimal:
+        checkpoint = self.ledger_dao.get_checkpoint(db, account_id)
+        balance = checkpoint.balance if checkpoint else Decimal("0")
+        position = (checkpoint.last_xid, checkpoint.last_entry_id) if checkpoint else START
+
+        balance += self.ledger_dao.sum_entries(db, account_id, after_position=position, created_until=as_of)
+        if as_of is not None and checkpoint:
+            # Undo the entries the checkpoint already includes but that happened after as_of.
+            balance -= self.ledger_dao.sum_entries(db, account_id, up_to_position=position, created_after=as_of)
+        return balance
+
+    def checkpoint_balances(self, db: Session) -> int:
+        """
+        Incrementally advance the checkpoint of every account with new ledger entries, up to the
+        newest entry no transaction still running can precede in commit order (api.database.commit_order).
+        Checkpoints are only moved forward from the position they were read at, so concurrent
+        runs (one per worker) never apply the same entries twice.
+        """
+        position = self.ledger_dao.get_last_settled_position(db, settled_xid_horizon(db))
+        if position is None:
+            return 0
+        last_xid, last_entry_id = position
+        deltas = self.ledger_dao.get_pending_checkpoint_deltas(db, position)
+
+        updated = 0
+        for account_id, previous_xid, previous_entry_id, delta in deltas:
+            try:
+                if (previous_xid, previous_entry_id) != START:
+                    result = db.execute(
+                        update(BalanceCheckpoint)
+                        .where(BalanceCheckpoint.account_id == account_id)
+                        .where(BalanceCheckpoint.last_xid == previous_xid)
+                        .where(BalanceCheckpoint.last_entry_id == previous_entry_id)
+                        .values(balance=BalanceCheckpoint.balance + delta, last_xid=last_xid,
+                                last_entry_id=last_entry_id, updated_at=datetime.utcnow())
+                    )
+                    updated += result.rowcount
+                else:
+                    with db.begin_nested():
+                        db.add(BalanceCheckpoint(
+                            account_id=account_id, balance=delta, last_xid=last_xid, last_entry_id=last_entry_id
+                        ))
+                    updated += 1
+            except IntegrityError:
+                logger.info("Checkpoint of account %s was created concurrently, skipping", account_id)
+        db.commit()
+
+        logger.info("Advanced %d balance checkpoints", updated)
+        return updated
+
+    def backfill_opening_entries(self, db: Session) -> int:
+        """
+        Give accounts created before the ledger existed an opening entry equal to the part of
+        their balance the ledger cannot explain. Each account is locked while it is backfilled.
+        """
+        account_ids = db.execute(
+            select(BankAccount.id).where(
+                ~select(LedgerEntry.id)
+                .where(LedgerEntry.account_id == BankAccount.id, LedgerEntry.transaction_id.is_(None))
+                .exists()
+            )
+        ).scalars().all()
+
+        backfilled = 0
+        for account_id in account_ids:
+            account = lock_accounts(db, [account_id])[account_id]
+            logical_balance = account.balance + sum(shard.balance for shard in lock_all_shards(db, account_id))
+            unexplained = logical_balance - self.ledger_dao.sum_entries(db, account_id)
+            if self.ledger_dao.add_opening_entry(db, account, unexplained):
+                backfilled += 1
+            db.commit()
+        return backfilled
@@ -0,0 +1,144 @@
+from decimal import Decimal
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, List, Tuple
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.orm import Session
+from api.config.config import ONBOARDING_CHUNK_SIZE
+from api.dao.administrative_entity_dao import AdministrativeEntityDAO
+from api.dao.bank_account_dao import BankAccountDAO
+from api.dao.customer_dao import CustomerDAO
+from api.models.bank_account import AccountType
+from api.schemas.bank_account_schema import BankAccountCreate
+from api.schemas.customer_schema import CustomerCreate
+from api.schemas.onboarding_schema import BulkItemResult
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class OnboardingService:
+    """
+    Bulk creation of customers and accounts. Rows are validated and inserted one chunk at a
+    time, with a multi-row INSERT ... RETURNING and one commit per chunk. Invalid rows are
+    reported and skipped; a chunk the database rejects is reported as failed as a whole, and
+    the chunks committed before it stay committed.
+    """
+
+    def __init__(
+        self,
+        customer_dao: CustomerDAO = None,
+        account_dao: BankAccountDAO = None,
+        entity_dao: AdministrativeEntityDAO = None,
+        chunk_size: int = ONBOARDING_CHUNK_SIZE,
+    ):
+        self.customer_dao = customer_dao or CustomerDAO()
+        self.account_dao = account_dao or BankAccountDAO()
+        self.entity_dao = entity_dao or AdministrativeEntityDAO()
+        self.chunk_size = chunk_size
+
+    def create_customers(self, db: Session, items: Iterable[Any]) -> Iterator[BulkItemResult]:
+        return self._create_in_chunks(db, items, CustomerCreate, self._insert_customers)
+
+    def create_accounts(self, db: Session, items: Iterable[Any]) -> Iterator[BulkItemResult]:
+        return self._create_in_chunks(db, items, BankAccountCreate, self._insert_accounts)
+
+    def _create_in_chunks(
+        self,
+        db: Session,
+        items: Iterable[Any],
+        schema: type,
+        insert_chunk: Callable[[Session, List[Tuple[int, BaseModel]]], List[BulkItemResult]],
+    ) -> Iterator[BulkItemResult]:
+        indexed_items = enumerate(items)
+        while True:
+            chunk = list(islice(indexed_items, self.chunk_size))
+            if not chunk:
+                return
+
+            results = []
+            valid = []
+            for index, item in chunk:
+                try:
+                    valid.append((index, schema.model_validate(item)))
+                except ValidationError as e:
+                    results.append(BulkItemResult(index=index, status="FAILED", error=_describe(e)))
+
+            if valid:
+                try:
+                    results.extend(insert_chunk(db, valid))
+                    db.commit()
+                except Exception as e:
+                    db.rollback()
+                    logger.error("Bulk insert of rows %d..%d failed: %s", valid[0][0], valid[-1][0], e)
+                    results = [result for result in results if result.status == "FAILED"]
+                    results.extend(
+                        BulkItemResult(index=index, status="FAILED", error="The chunk could not be stored.")
+                        for index, _ in valid
+                    )
+
+            results.sort(key=lambda result: result.index)
+            yield from results
+
+    def _insert_customers(self, db: Session, valid: List[Tuple[int, CustomerCreate]]) -> List[BulkItemResult]:
+        results = []
+        rows = []
+        indexes = []
+        for index, customer in valid:
+            if not customer.customer_name:
+                results.append(BulkItemResult(index=index, status="FAILED", error="Customer name cannot be empty"))
+                continue
+            rows.append({"customer_name": customer.customer_name})
+            indexes.append(index)
+
+        if rows:
+            customer_ids = self.customer_dao.create_customers(db, rows)
+            results.extend(
+                BulkItemResult(index=index, status="CREATED", id=customer_id)
+                for index, customer_id in zip(indexes, customer_ids)
+            )
+        return results
+
+    def _insert_accounts(self, db: Session, valid: List[Tuple[int, BankAccountCreate]]) -> List[BulkItemResult]:
+        customers = self.customer_dao.get_existing_ids(
+            db, [account.owner_id for _, account in valid if account.account_type == AccountType.USER]
+        )
+        entities = self.entity_dao.get_existing_ids(
+            db, [account.owner_id for _, account in valid if account.account_type == AccountType.ADMINISTRATIVE]
+        )
+
+        results = []
+        rows = []
+        indexes = []
+        for index, account in valid:
+            user_account = account.account_type == AccountType.USER
+            if account.owner_id not in (customers if user_account else entities):
+                owner = "Customer" if user_account else "Administrative entity"
+                results.append(BulkItemResult(index=index, status="FAILED", error=f"{owner} {account.owner_id} not found."))
+                continue
+            rows.append({
+                "balance": Decimal(str(account.balance)),
+                "account_type": account.account_type,
+                "status": account.status,
+                "customer_id": account.owner_id if user_account else None,
+                "administrative_entity_id": None if user_account else account.owner_id,
+            })
+            indexes.append(index)
+
+        if rows:
+            for account_type in AccountType:
+                typed_rows = [row for row in rows if row["account_type"] == account_type]
+                numbers = self.account_dao.new_account_numbers(db, account_type, len(typed_rows)) if typed_rows else []
+                for row, account_number in zip(typed_rows, numbers):
+                    row["account_number"] = account_number
+            account_ids = self.account_dao.create_accounts(db, rows)
+            results.extend(
+                BulkItemResult(index=index, status="CREATED", id=account_id, account_number=row["account_number"])
+                for index, row, account_id in zip(indexes, rows, account_ids)
+            )
+        return results
+
+
+def _describe(error: ValidationError) -> str:
+    first = error.errors()[0]
+    location = ".".join(str(part) for part in first["loc"])
+    return f"{location}: {first['msg']}" if location else first["msg"]
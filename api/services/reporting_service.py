@@ -0,0 +1,91 @@
+from datetime import date, datetime, timedelta
+from typing import Optional
+from sqlalchemy.orm import Session
+from api.config.config import REPORT_DEFAULT_DAYS, REPORT_MAX_DAYS, TRANSACTION_ROLLUP_BATCH_SIZE
+from api.dao.rollup_dao import RollupDAO
+from api.database.commit_order import Position, settled_before, settled_xid_horizon
+from api.models.bank_account import AccountType
+from api.models.transaction import TransactionType
+from api.schemas.report_schema import DailyVolume, DailyVolumeReport
+from api.services.account_metadata_service import AccountMetadataService
+from api.utils.exceptions import AccountNotFoundError
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Name of the watermark row of the daily administrative account rollups.
+DAILY_ROLLUP = "daily_admin_volume"
+
+
+class ReportingService:
+    """
+    Reports on the administrative accounts served from daily rollups. A catch-up run folds the
+    transactions committed since the watermark into the rollups, one window of the commit order
+    (api.database.commit_order) per commit, so a report reads a few rows per day whatever the size
+    of the transaction history.
+    """
+
+    def __init__(self, rollup_dao: RollupDAO = None, metadata_service: AccountMetadataService = None):
+        self.rollup_dao = rollup_dao or RollupDAO()
+        self.metadata_service = metadata_service or AccountMetadataService()
+
+    def catch_up(self, db: Session, batch_size: int = TRANSACTION_ROLLUP_BATCH_SIZE) -> Position:
+        """
+        Roll up the transactions after the watermark that no running transaction can precede in
+        commit order, then record the time before which every committed transaction is included.
+        Returns the new watermark position.
+        """
+        caught_up_at = settled_before(db)
+        horizon = settled_xid_horizon(db)
+        watermark = self.rollup_dao.get_watermark_position(db, DAILY_ROLLUP)
+        while True:
+            last = self.rollup_dao.get_next_window(db, watermark, horizon, batch_size)
+            if last is None:
+                self.rollup_dao.mark_caught_up(db, DAILY_ROLLUP, watermark, caught_up_at)
+                db.commit()
+                break
+            # The watermark moves first: a concurrent run waits on its row, then finds it moved and stops.
+            if not self.rollup_dao.advance_watermark(db, DAILY_ROLLUP, watermark, last):
+                db.rollback()
+                logger.info("Rollups were advanced concurrently, stopping at %s", watermark)
+                break
+            aggregates = self.rollup_dao.aggregate_transactions(db, watermark, last)
+            self.rollup_dao.merge_rollups(db, aggregates)
+            db.commit()
+            logger.debug("Rolled up transactions after %s up to %s into %d groups", watermark, last, len(aggregates))
+            watermark = last
+        return watermark
+
+    def get_daily_volume(
+        self,
+        db: Session,
+        account_id: Optional[int] = None,
+        start_day: Optional[date] = None,
+        end_day: Optional[date] = None,
+        transaction_type: Optional[TransactionType] = None,
+    ) -> DailyVolumeReport:
+        """
+        Daily count, sum, min and max of the transactions of one administrative account, or of all
+        of them, for the days from start_day to end_day (both included). end_day defaults to today and
+        start_day to REPORT_DEFAULT_DAYS before end_day; the range spans at most REPORT_MAX_DAYS, so a
+        report reads a bounded number of rows whatever the size of the history.
+        """
+        end_day = end_day or datetime.utcnow().date()
+        start_day = start_day or end_day - timedelta(days=REPORT_DEFAULT_DAYS - 1)
+        if start_day > end_day:
+            raise ValueError("start_day must not be after end_day.")
+        if (end_day - start_day).days + 1 > REPORT_MAX_DAYS:
+            raise ValueError(f"Reports span at most {REPORT_MAX_DAYS} days.")
+        if account_id is not None:
+            account = self.metadata_service.get(db, account_id)
+            if account is None:
+                raise AccountNotFoundError()
+            if account.account_type != AccountType.ADMINISTRATIVE:
+                raise ValueError("Reports are only kept for administrative accounts.")
+
+        rollups = self.rollup_dao.get_daily_rollups(db, start_day, end_day, account_id, transaction_type)
+        watermark = self.rollup_dao.get_watermark(db, DAILY_ROLLUP)
+        return DailyVolumeReport(
+            rolled_up_at=watermark.caught_up_at if watermark else None,
+            days=[DailyVolume.model_validate(rollup) for rollup in rollups],
+        )
@@ -1,213 +1,668 @@
 from decimal import Decimal
-from typing import List
+from typing import Dict, List, Optional, Set
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from sqlalchemy import select
-from api.models.bank_account import AccountType, BankAccount
+from api.models.bank_account import AccountStatus, AccountType, BankAccount
 from api.models.transaction import Transaction, TransactionType
-from api.schemas.transaction_schema import TransactionResponse
+from api.schemas.transaction_schema import TransactionResponse, TransferCreate, TransferBatchItemResult
 from api.utils.exceptions import InsufficientFundsError, AccountNotFoundError
 from api.dao.transaction_dao import TransactionDAO
+from api.database.locking import lock_accounts, movement_outcome, retry_on_lock_conflict
 from api.services.bank_account_service import BankAccountService
+from api.services.balance_shard_service import BalanceShardService
+from api.services.idempotency_service import IdempotencyService
+from api.utils.metrics import count_transactions, phase_timer
 import logging
-from api.config.config import CASH_HOLDING_ACCOUNT_ID, CASH_DISBURSEMENT_ACCOUNT_ID
+from api.config.config import (
+    CASH_HOLDING_ACCOUNT_ID,
+    CASH_DISBURSEMENT_ACCOUNT_ID,
+    TRANSFER_BATCH_MAX_SIZE,
+    TRANSACTION_ENGINE_MODE,
+)
 
 logger = logging.getLogger(__name__)
 
+ENGINE_MODES = ("pessimistic", "conditional")
+
+MOVEMENT_LABELS = {
+    TransactionType.DEPOSIT: "deposit",
+    TransactionType.TRANSFER: "transfer",
+    TransactionType.WITHDRAW: "withdrawal",
+}
+
+# Account type required on the (source, destination) side of a movement.
+MOVEMENT_ACCOUNT_TYPES = {
+    TransactionType.DEPOSIT: (AccountType.ADMINISTRATIVE, AccountType.USER),
+    TransactionType.WITHDRAW: (None, AccountType.ADMINISTRATIVE),
+    TransactionType.TRANSFER: (None, None),
+}
+
 
 class TransactionService:
 
-    def __init__(self, bank_account_service: BankAccountService, transaction_dao: TransactionDAO):
+    def __init__(
+        self,
+        bank_account_service: BankAccountService,
+        transaction_dao: TransactionDAO,
+        balance_shard_service: BalanceShardService = None,
+        idempotency_service: IdempotencyService = None,
+        engine_mode: str = None,
+        group_commit=None,
+    ):
         self.bank_account_service = bank_account_service
         self.transaction_dao = transaction_dao
-
-    
+        self.balance_shard_service = balance_shard_service or BalanceShardService()
+        self.idempotency_service = idempotency_service or IdempotencyService(transaction_dao=transaction_dao)
+        self.engine_mode = engine_mode or TRANSACTION_ENGINE_MODE
+        if self.engine_mode not in ENGINE_MODES:
+            raise ValueError(f"Unknown transaction engine mode {self.engine_mode}.")
+        self.group_commit = group_commit
+
+    @retry_on_lock_conflict
     def create_deposit_transaction(
         self,
         db: Session,
         amount: Decimal,
         source_account_id: int = None,
         destination_account_id: int = None,
+        idempotency_key: Optional[str] = None,
     ) -> Transaction:
         """
         Creates a deposit transaction with thread safety and validation logic.
         For deposits, the source account is the cash holding account and the destination account is the user account.
+        A request replayed with the same idempotency key returns the transaction it created the first time.
+        """
+        return self._create_movement(
+            db, TransactionType.DEPOSIT, amount, source_account_id, destination_account_id, idempotency_key
+        )
+
+    @retry_on_lock_conflict
+    def create_transfer(
+        self,
+        db: Session,
+        amount: Decimal,
+        source_account_id: int = None,
+        destination_account_id: int = None,
+        idempotency_key: Optional[str] = None,
+    ) -> Transaction:
+        """
+        Create a new transfer transaction with thread safety and validation logic.
+        """
+        return self._create_movement(
+            db, TransactionType.TRANSFER, amount, source_account_id, destination_account_id, idempotency_key
+        )
+
+    @retry_on_lock_conflict
+    def create_withdrawal(
+        self,
+        db: Session,
+        amount: Decimal,
+        source_account_id: int = None,
+        destination_account_id: int = None,
+        idempotency_key: Optional[str] = None,
+    ) -> Transaction:
+        """
+        Create a new withdrawal transaction with thread safety and validation logic.
         """
+        return self._create_movement(
+            db, TransactionType.WITHDRAW, amount, source_account_id, destination_account_id, idempotency_key
+        )
+
+    def _create_movement(
+        self,
+        db: Session,
+        transaction_type: TransactionType,
+        amount: Decimal,
+        source_account_id: Optional[int],
+        destination_account_id: Optional[int],
+        idempotency_key: Optional[str],
+    ) -> Transaction:
+        """
+        Apply one movement and commit it on its own, or hand it to the group commit writer when
+        one is configured.
+        """
+        if self.group_commit is not None:
+            return self.group_commit.execute(
+                transaction_type, amount, source_account_id, destination_account_id, idempotency_key
+            )
+
+        label = MOVEMENT_LABELS[transaction_type]
+        fingerprint = IdempotencyService.fingerprint(
+            transaction_type, amount, source_account_id, destination_account_id
+        )
         try:
-            if not destination_account_id:
-                raise ValueError("Destination account is required for deposits.")
+            transaction = self.apply_movement(
+                db, transaction_type, amount, source_account_id, destination_account_id, idempotency_key, fingerprint
+            )
+            with phase_timer("commit"):
+                db.commit()
+            if self.idempotency_service.is_replay(transaction):
+                count_transactions(transaction_type, "replayed")
+                return transaction
+            self.idempotency_service.remember(idempotency_key, fingerprint, transaction)
+            count_transactions(transaction_type, "completed")
+
+            logger.info("%s transaction created: %s", label.capitalize(), transaction.id)
+            return transaction
+        except IntegrityError:
+            replayed = self._replay_after_conflict(db, idempotency_key, fingerprint)
+            if replayed is None:
+                count_transactions(transaction_type, "failed")
+                raise
+            count_transactions(transaction_type, "replayed")
+            return replayed
+        except Exception as e:
+            db.rollback()
+            count_transactions(transaction_type, movement_outcome(e))
+            logger.error("Error during %s transaction: %s", label, e)
+            raise
+
+    def apply_movement(
+        self,
+        db: Session,
+        transaction_type: TransactionType,
+        amount: Decimal,
+        source_account_id: Optional[int],
+        destination_account_id: Optional[int],
+        idempotency_key: Optional[str],
+        fingerprint: str,
+    ) -> Transaction:
+        """
+        Validate and apply one movement in the current database transaction, without committing it.
+        Returns the stored transaction instead when the idempotency key was already used for this request.
+        """
+        apply = {
+            TransactionType.DEPOSIT: self._apply_deposit,
+            TransactionType.TRANSFER: self._apply_transfer,
+            TransactionType.WITHDRAW: self._apply_withdrawal,
+        }[transaction_type]
+        return apply(db, amount, source_account_id, destination_account_id, idempotency_key, fingerprint)
+
+    def _apply_deposit(
+        self,
+        db: Session,
+        amount: Decimal,
+        source_account_id: Optional[int],
+        destination_account_id: Optional[int],
+        idempotency_key: Optional[str],
+        fingerprint: str,
+    ) -> Transaction:
+        if not destination_account_id:
+            raise ValueError("Destination account is required for deposits.")
+
+        logger.debug("Processing deposit: %s to account: %s", amount, destination_account_id)
 
-            logger.info(f"Processing deposit: {amount} to account: {destination_account_id}")
+        amount_decimal = Decimal(str(amount))
 
-            amount_decimal = Decimal(str(amount))
+        if amount_decimal <= 0:
+            raise ValueError("Amount must be positive.")
 
-            if amount_decimal <= 0:
-                raise ValueError("Amount must be positive.")
+        replayed = self.idempotency_service.find(db, idempotency_key, fingerprint)
+        if replayed:
+            return replayed
 
-            # Get and validate destination account (user account)
-            destination_account = self._get_and_lock_account(db, destination_account_id)
-            if not destination_account:
-                raise AccountNotFoundError(f"Destination account {destination_account_id} not found.")
-            if destination_account.account_type != AccountType.USER:
-                raise ValueError("Destination account needs to be a user account.")
-            logger.info(f"Destination account found: {destination_account.id}")
+        self._check_accounts(db, TransactionType.DEPOSIT, source_account_id, destination_account_id)
 
-            # Get and validate source account (cash holding account)
-            cash_holding_account = self._get_and_lock_account(db, source_account_id)
-            if not cash_holding_account:
-                raise AccountNotFoundError(f"Cash Holding Account {source_account_id} not found.")
-            if cash_holding_account.account_type != AccountType.ADMINISTRATIVE:
-                raise ValueError("Source account must be an administrative account.")
-            logger.info(f"Cash holding account found: {cash_holding_account.id}")
+        if self.engine_mode == "conditional":
+            return self._move_conditionally(
+                db, TransactionType.DEPOSIT, amount_decimal, source_account_id, destination_account_id,
+                idempotency_key, fingerprint,
+            )
 
+        striped = self.balance_shard_service.enabled
+        accounts = lock_accounts(db, [destination_account_id] if striped else [source_account_id, destination_account_id])
+
+        # Get and validate destination account (user account)
+        destination_account = accounts.get(destination_account_id)
+        if not destination_account:
+            raise AccountNotFoundError(f"Destination account {destination_account_id} not found.")
+        if destination_account.account_type != AccountType.USER:
+            raise ValueError("Destination account needs to be a user account.")
+        logger.debug("Destination account found: %s", destination_account.id)
+
+        # Get and validate source account (cash holding account)
+        cash_holding_account = self._get_administrative_account(db, accounts, source_account_id)
+        if not cash_holding_account:
+            raise AccountNotFoundError(f"Cash Holding Account {source_account_id} not found.")
+        if cash_holding_account.account_type != AccountType.ADMINISTRATIVE:
+            raise ValueError("Source account must be an administrative account.")
+        logger.debug("Cash holding account found: %s", cash_holding_account.id)
+        self._ensure_open("Destination", destination_account)
+        self._ensure_open("Source", cash_holding_account)
+
+        account_dao = self.bank_account_service.account_dao
+        if striped:
+            account_dao.apply_balance_deltas(db, {destination_account.id: amount_decimal})
+            # Check sufficient funds and debit one of the cash holding account shards
+            self._move_through_shards(
+                db, {cash_holding_account.id: -amount_decimal}, "Insufficient funds in cash holding account."
+            )
+        else:
             # Check sufficient funds
             if cash_holding_account.balance < amount_decimal:
                 raise InsufficientFundsError("Insufficient funds in cash holding account.")
 
             # Perform the transfer
-            logger.info(f"Cash holding account balance before transfer: {cash_holding_account.balance}")
-            logger.info(f"Destination account balance before transfer: {destination_account.balance}")
-
-            cash_holding_account.balance -= amount_decimal
-            destination_account.balance += amount_decimal
-
-            logger.info(f"Cash holding account balance after transfer: {cash_holding_account.balance}")
-            logger.info(f"Destination account balance after transfer: {destination_account.balance}")
+            logger.debug("Cash holding account balance before transfer: %s", cash_holding_account.balance)
+            logger.debug("Destination account balance before transfer: %s", destination_account.balance)
+
+            balances = account_dao.move_balance(db, cash_holding_account.id, destination_account.id, amount_decimal)
+
+            logger.debug("Cash holding account balance after transfer: %s", balances[cash_holding_account.id])
+            logger.debug("Destination account balance after transfer: %s", balances[destination_account.id])
+
+        # Create and save transaction
+        transaction = Transaction(
+            amount=amount_decimal,
+            transaction_type=TransactionType.DEPOSIT,
+            source_account_id=cash_holding_account.id,
+            destination_account_id=destination_account.id,
+        )
+        self.transaction_dao.create_transaction(db, transaction)
+        self.idempotency_service.record(db, idempotency_key, fingerprint, transaction)
+        return transaction
+
+    def _apply_transfer(
+        self,
+        db: Session,
+        amount: Decimal,
+        source_account_id: Optional[int],
+        destination_account_id: Optional[int],
+        idempotency_key: Optional[str],
+        fingerprint: str,
+    ) -> Transaction:
+        if not source_account_id or not destination_account_id:
+            raise ValueError("Source and destination accounts are required for transfers.")
 
-            # Create and save transaction
-            transaction = Transaction(
-                amount=amount_decimal,
-                transaction_type=TransactionType.DEPOSIT,
-                source_account_id=cash_holding_account.id,
-                destination_account_id=destination_account.id,
-            )
-            db.add(transaction)
-            db.commit()
-            db.refresh(transaction)
+        amount_decimal = Decimal(str(amount))
 
-            logger.info(f"Deposit transaction created: {transaction.id}")
-            return transaction
+        if amount_decimal <= 0:
+            raise ValueError("Amount must be positive.")
 
-        except Exception as e:
-            db.rollback()
-            logger.error(f"Error during deposit transaction: {e}")
-            raise
+        replayed = self.idempotency_service.find(db, idempotency_key, fingerprint)
+        if replayed:
+            return replayed
 
+        self._check_accounts(db, TransactionType.TRANSFER, source_account_id, destination_account_id)
 
+        if self.engine_mode == "conditional":
+            return self._move_conditionally(
+                db, TransactionType.TRANSFER, amount_decimal, source_account_id, destination_account_id,
+                idempotency_key, fingerprint,
+            )
 
-    def create_transfer(
+        # Striped administrative accounts are not locked here: their side moves through their shards.
+        striped = self._striped_account_ids(db, source_account_id, destination_account_id)
+        accounts = lock_accounts(db, {source_account_id, destination_account_id} - striped)
+        source_account, destination_account = (
+            self._get_administrative_account(db, accounts, account_id) if account_id in striped else accounts.get(account_id)
+            for account_id in (source_account_id, destination_account_id)
+        )
+        if not source_account or not destination_account:
+            raise AccountNotFoundError("One or both accounts not found.")
+        self._ensure_open("Source", source_account)
+        self._ensure_open("Destination", destination_account)
+
+        if source_account_id not in striped and source_account.balance < amount_decimal:
+            raise InsufficientFundsError("Insufficient funds in the source account.")
+
+        account_dao = self.bank_account_service.account_dao
+        if striped:
+            deltas = self._movement_deltas(source_account_id, destination_account_id, amount_decimal)
+            account_dao.apply_balance_deltas(
+                db, {account_id: delta for account_id, delta in deltas.items() if account_id not in striped}
+            )
+            self._move_through_shards(
+                db,
+                {account_id: delta for account_id, delta in deltas.items() if account_id in striped},
+                "Insufficient funds in the source account.",
+            )
+        else:
+            account_dao.move_balance(db, source_account_id, destination_account_id, amount_decimal)
+
+        transaction = Transaction(
+            amount=amount_decimal,
+            transaction_type=TransactionType.TRANSFER,
+            source_account_id=source_account_id,
+            destination_account_id=destination_account_id,
+        )
+        self.transaction_dao.create_transaction(db, transaction)
+        self.idempotency_service.record(db, idempotency_key, fingerprint, transaction)
+        return transaction
+
+    def _apply_withdrawal(
         self,
         db: Session,
         amount: Decimal,
-        source_account_id: int = None,
-        destination_account_id: int = None,
+        source_account_id: Optional[int],
+        destination_account_id: Optional[int],
+        idempotency_key: Optional[str],
+        fingerprint: str,
     ) -> Transaction:
-        """
-        Create a new transfer transaction with thread safety and validation logic.
-        """
-        try:
-            if not source_account_id or not destination_account_id:
-                raise ValueError("Source and destination accounts are required for transfers.")
-
-            amount_decimal = Decimal(str(amount))
+        if not source_account_id:
+            raise ValueError("Source account is required for withdrawals.")
 
-            if amount_decimal <= 0:
-                raise ValueError("Amount must be positive.")
+        amount_decimal = Decimal(str(amount))
 
-            source_account = self._get_and_lock_account(db, source_account_id)
-            destination_account = self._get_and_lock_account(db, destination_account_id)
-            if not source_account or not destination_account:
-                raise AccountNotFoundError("One or both accounts not found.")
+        if amount_decimal <= 0:
+            raise ValueError("Amount must be positive.")
 
-            if source_account.balance < amount_decimal:
-                raise InsufficientFundsError("Insufficient funds in the source account.")
+        replayed = self.idempotency_service.find(db, idempotency_key, fingerprint)
+        if replayed:
+            return replayed
 
-            source_account.balance -= amount_decimal
-            destination_account.balance += amount_decimal
+        self._check_accounts(db, TransactionType.WITHDRAW, source_account_id, destination_account_id)
 
-            transaction = Transaction(
-                amount=amount_decimal,
-                transaction_type=TransactionType.TRANSFER,
-                source_account_id=source_account_id,
-                destination_account_id=destination_account_id,
+        if self.engine_mode == "conditional":
+            return self._move_conditionally(
+                db, TransactionType.WITHDRAW, amount_decimal, source_account_id, destination_account_id,
+                idempotency_key, fingerprint,
             )
-            db.add(transaction)
-            db.commit()
-            db.refresh(transaction)
 
-            logger.info(f"Transfer transaction created: {transaction.id}")
-            return transaction
+        striped = self.balance_shard_service.enabled
+        accounts = lock_accounts(db, [source_account_id] if striped else [source_account_id, destination_account_id])
+        source_account = accounts.get(source_account_id)
+        if not source_account:
+            raise AccountNotFoundError("Source account not found.")
+        self._ensure_open("Source", source_account)
+
+        if source_account.balance < amount_decimal:
+            raise InsufficientFundsError("Insufficient funds in the source account.")
+
+        cash_disbursement_account = self._get_administrative_account(db, accounts, destination_account_id)
+        if not cash_disbursement_account:
+            raise AccountNotFoundError("Cash Disbursement Account not found.")
+        if cash_disbursement_account.account_type != AccountType.ADMINISTRATIVE:
+            raise ValueError("Destination account must be an ADMINISTRATIVE account.")
+        self._ensure_open("Destination", cash_disbursement_account)
+
+        account_dao = self.bank_account_service.account_dao
+        if striped:
+            account_dao.apply_balance_deltas(db, {source_account_id: -amount_decimal})
+            self._move_through_shards(db, {cash_disbursement_account.id: amount_decimal})
+        else:
+            account_dao.move_balance(db, source_account_id, cash_disbursement_account.id, amount_decimal)
+
+        transaction = Transaction(
+            amount=amount_decimal,
+            transaction_type=TransactionType.WITHDRAW,
+            source_account_id=source_account_id,
+            destination_account_id=cash_disbursement_account.id,
+        )
+        self.transaction_dao.create_transaction(db, transaction)
+        self.idempotency_service.record(db, idempotency_key, fingerprint, transaction)
+        return transaction
+
+    @retry_on_lock_conflict
+    def create_transfer_batch(self, db: Session, transfers: List[TransferCreate]) -> List[TransferBatchItemResult]:
+        """
+        Settle many transfers in a single database transaction.
+        All involved accounts are locked once (in id order), balances are moved in memory and the
+        transaction rows are bulk inserted. Items that fail validation are reported and skipped,
+        the remaining ones are committed together.
+        With balance striping, administrative accounts are locked after the others together with
+        all of their shards, so their logical balance is checked; their net change goes to the row.
+        """
+        try:
+            if not transfers:
+                raise ValueError("At least one transfer is required.")
+            if len(transfers) > TRANSFER_BATCH_MAX_SIZE:
+                raise ValueError(f"A batch cannot contain more than {TRANSFER_BATCH_MAX_SIZE} transfers.")
+
+            account_ids = {transfer.source_account_id for transfer in transfers}
+            account_ids |= {transfer.destination_account_id for transfer in transfers}
+            striped = set()
+            if self.balance_shard_service.enabled:
+                striped = self.bank_account_service.account_dao.get_account_ids_of_type(
+                    db, account_ids, AccountType.ADMINISTRATIVE
+                )
+            accounts = lock_accounts(db, account_ids - striped)
+            shards = {}
+            for account_id in sorted(striped):
+                account, account_shards = self.balance_shard_service.lock_account(db, account_id)
+                if account:
+                    accounts[account_id] = account
+                    shards[account_id] = account_shards
+            balances = {
+                account_id: account.balance + sum(shard.balance for shard in shards.get(account_id, []))
+                for account_id, account in accounts.items()
+            }
+            initial_balances = dict(balances)
+            closed = {account_id for account_id, account in accounts.items() if account.status == AccountStatus.CLOSED}
+
+            results = []
+            pending = []
+            for index, transfer in enumerate(transfers):
+                amount_decimal = Decimal(str(transfer.amount))
+                source_account_id = transfer.source_account_id
+                destination_account_id = transfer.destination_account_id
+
+                if amount_decimal <= 0:
+                    error = "Amount must be positive."
+                elif source_account_id not in balances or destination_account_id not in balances:
+                    error = "One or both accounts not found."
+                elif source_account_id in closed or destination_account_id in closed:
+                    error = "Account is closed."
+                elif balances[source_account_id] < amount_decimal:
+                    error = "Insufficient funds in the source account."
+                else:
+                    error = None
+
+                if error:
+                    results.append(TransferBatchItemResult(index=index, status="FAILED", error=error))
+                    continue
+
+                balances[source_account_id] -= amount_decimal
+                balances[destination_account_id] += amount_decimal
+                pending.append((index, {
+                    "amount": amount_decimal,
+                    "transaction_type": TransactionType.TRANSFER,
+                    "source_account_id": source_account_id,
+                    "destination_account_id": destination_account_id,
+                }))
+
+            for account_id, account in accounts.items():
+                if account_id in shards:
+                    delta = balances[account_id] - initial_balances[account_id]
+                    if delta:
+                        self.balance_shard_service.settle(account, shards[account_id], delta)
+                elif account.balance != balances[account_id]:
+                    account.balance = balances[account_id]
+
+            if pending:
+                transaction_ids = self.transaction_dao.create_transactions(db, [row for _, row in pending])
+                results.extend(
+                    TransferBatchItemResult(index=index, status="COMPLETED", transaction_id=transaction_id)
+                    for (index, _), transaction_id in zip(pending, transaction_ids)
+                )
+            with phase_timer("commit"):
+                db.commit()
+            count_transactions(TransactionType.TRANSFER, "completed", len(pending))
+            count_transactions(TransactionType.TRANSFER, "failed", len(transfers) - len(pending))
+
+            results.sort(key=lambda result: result.index)
+            logger.info("Transfer batch settled: %d completed, %d failed", len(pending), len(transfers) - len(pending))
+            return results
         except Exception as e:
             db.rollback()
-            logger.error(f"Error during transfer transaction: {e}")
+            count_transactions(TransactionType.TRANSFER, movement_outcome(e), len(transfers))
+            logger.error("Error during transfer batch: %s", e)
             raise e
 
-    def create_withdrawal(
+    def _move_conditionally(
         self,
         db: Session,
+        transaction_type: TransactionType,
         amount: Decimal,
-        source_account_id: int = None,
-        destination_account_id: int = None,
+        source_account_id: Optional[int],
+        destination_account_id: Optional[int],
+        idempotency_key: Optional[str],
+        fingerprint: str,
     ) -> Transaction:
         """
-        Create a new withdrawal transaction with thread safety and validation logic.
+        Conditional engine mode: no SELECT ... FOR UPDATE, each balance is moved by a guarded UPDATE
+        (enough funds, expected account type, account still active) issued in account id order, and a row the UPDATE did not
+        match is looked up afterwards to report why. With balance striping the administrative side of
+        every movement still goes through its shards, after the guarded UPDATEs.
         """
-        try:
-            if not source_account_id:
-                raise ValueError("Source account is required for withdrawals.")
-            
-            amount_decimal = Decimal(str(amount))
-
-            if amount_decimal <= 0:
-                raise ValueError("Amount must be positive.")
-
-            source_account = self._get_and_lock_account(db, source_account_id)
-            if not source_account:
-                raise AccountNotFoundError("Source account not found.")
-
-            if source_account.balance < amount_decimal:
-                raise InsufficientFundsError("Insufficient funds in the source account.")
-
-            cash_disbursement_account = self._get_and_lock_account(db, destination_account_id)
-            if not cash_disbursement_account:
-                raise AccountNotFoundError("Cash Disbursement Account not found.")
-            if cash_disbursement_account.account_type != AccountType.ADMINISTRATIVE:
-                raise ValueError("Destination account must be an ADMINISTRATIVE account.")
-            
-            source_account.balance -= amount_decimal
-            cash_disbursement_account.balance += amount_decimal
-
-            transaction = Transaction(
-                amount=amount_decimal,
-                transaction_type=TransactionType.WITHDRAW,
-                source_account_id=source_account_id,
-                destination_account_id=cash_disbursement_account.id,
+        account_dao = self.bank_account_service.account_dao
+        source_type, destination_type = MOVEMENT_ACCOUNT_TYPES[transaction_type]
+        striped = self._striped_account_ids(db, source_account_id, destination_account_id)
+
+        updates = {}
+        for role, account_id, delta, account_type in (
+            ("Source", source_account_id, -amount, source_type),
+            ("Destination", destination_account_id, amount, destination_type),
+        ):
+            if account_id is None:
+                raise AccountNotFoundError(f"{role} account not found.")
+            if account_id in striped:
+                continue
+            guard = updates.setdefault(
+                account_id, {"role": role, "delta": Decimal(0), "min_balance": None, "account_type": account_type}
+            )
+            guard["delta"] += delta
+            if delta < 0:
+                guard["min_balance"] = -delta
+
+        for account_id in sorted(updates):
+            guard = updates[account_id]
+            balance = account_dao.conditional_update_balance(
+                db, account_id, guard["delta"], guard["min_balance"], guard["account_type"], require_active=True
+            )
+            if balance is None:
+                account = account_dao.get_account_by_id(db, account_id)
+                role = guard["role"]
+                raise (
+                    self._account_failure(account, account_id, role, guard["account_type"])
+                    or InsufficientFundsError(f"Insufficient funds in the {role.lower()} account.")
+                )
+
+        for account_id in sorted(striped):
+            role = "Source" if account_id == source_account_id else "Destination"
+            account = self._get_administrative_account(db, {}, account_id)
+            failure = self._account_failure(account, account_id, role, AccountType.ADMINISTRATIVE)
+            if failure:
+                raise failure
+        if striped:
+            deltas = self._movement_deltas(source_account_id, destination_account_id, amount)
+            self._move_through_shards(
+                db,
+                {account_id: delta for account_id, delta in deltas.items() if account_id in striped},
+                "Insufficient funds in cash holding account." if transaction_type == TransactionType.DEPOSIT
+                else "Insufficient funds in the source account.",
             )
-            db.add(transaction)
-            db.commit()
-            db.refresh(transaction)
-
-            logger.info(f"Withdrawal transaction created: {transaction.id}")
-            return transaction
-        except Exception as e:
-            db.rollback()
-            logger.error(f"Error during withdrawal transaction: {e}")
-            raise e
-
 
-    def _get_and_lock_account(self, db: Session, account_id: int) -> BankAccount:
+        transaction = Transaction(
+            amount=amount,
+            transaction_type=transaction_type,
+            source_account_id=source_account_id,
+            destination_account_id=destination_account_id,
+        )
+        self.transaction_dao.create_transaction(db, transaction)
+        self.idempotency_service.record(db, idempotency_key, fingerprint, transaction)
+        return transaction
+
+    def _check_accounts(
+        self,
+        db: Session,
+        transaction_type: TransactionType,
+        source_account_id: Optional[int],
+        destination_account_id: Optional[int],
+    ):
+        """
+        Reject movements on unknown, closed or wrongly typed accounts from the cached account
+        metadata, before any row is locked. The cache may lag behind an account being closed by
+        another process, so the status is checked again on the locked rows, and for striped
+        accounts when their shard or row is locked by BalanceShardService.
+        """
+        metadata_service = self.bank_account_service.account_metadata_service
+        source_type, destination_type = MOVEMENT_ACCOUNT_TYPES[transaction_type]
+        for role, account_id, account_type in (
+            ("Source", source_account_id, source_type),
+            ("Destination", destination_account_id, destination_type),
+        ):
+            if account_id is None:
+                continue
+            failure = self._account_failure(metadata_service.get(db, account_id), account_id, role, account_type)
+            if failure:
+                raise failure
+
+    @staticmethod
+    def _account_failure(account, account_id: int, role: str, account_type: Optional[AccountType]) -> Optional[Exception]:
+        """
+        Why an account (row or cached metadata) cannot take the given side of a movement, None when it can.
+        """
+        if account is None:
+            return AccountNotFoundError(f"{role} account {account_id} not found.")
+        if account_type is not None and account.account_type != account_type:
+            return ValueError(f"{role} account must be a {account_type.value} account.")
+        if account.status == AccountStatus.CLOSED:
+            return ValueError(f"{role} account {account_id} is closed.")
+        return None
+
+    @staticmethod
+    def _ensure_open(role: str, account: BankAccount):
+        if account.status == AccountStatus.CLOSED:
+            raise ValueError(f"{role} account {account.id} is closed.")
+
+    def _replay_after_conflict(self, db: Session, idempotency_key: Optional[str], fingerprint: str) -> Transaction:
         """
-        Fetch and lock a bank account for thread safety.
+        A concurrent request with the same idempotency key committed first and our insert of the
+        key failed on its primary key; answer with the transaction of the winner instead.
         """
-        account = db.execute(
-            select(BankAccount)
-            .where(BankAccount.id == account_id)
-            .with_for_update()
-        ).scalar_one_or_none()
+        db.rollback()
+        if idempotency_key is None:
+            return None
+        return self.idempotency_service.find(db, idempotency_key, fingerprint)
 
-        if not account:
-            raise AccountNotFoundError(f"Account {account_id} not found")
+    def _get_administrative_account(self, db: Session, locked_accounts: dict, account_id: int):
+        """
+        With balance striping the administrative account row is not locked up front, nor read:
+        its cached metadata is enough to fail early, and its status is checked again when its
+        shards (or, without a usable shard, its row) are locked to move the money.
+        """
+        if not self.balance_shard_service.enabled:
+            return locked_accounts.get(account_id)
+        if account_id is None:
+            return None
+        return self.bank_account_service.account_metadata_service.get(db, account_id)
 
-        return account
+    def _striped_account_ids(self, db: Session, *account_ids: Optional[int]) -> Set[int]:
+        """
+        The administrative accounts among account_ids when balance striping is on, from the cached
+        account metadata. Their money moves through their shards instead of a lock on their row.
+        """
+        if not self.balance_shard_service.enabled:
+            return set()
+        metadata_service = self.bank_account_service.account_metadata_service
+        striped = set()
+        for account_id in account_ids:
+            if account_id is None:
+                continue
+            metadata = metadata_service.get(db, account_id)
+            if metadata is not None and metadata.account_type == AccountType.ADMINISTRATIVE:
+                striped.add(account_id)
+        return striped
+
+    def _move_through_shards(self, db: Session, deltas: Dict[int, Decimal], insufficient_funds: str = None):
+        """
+        Move the balance of striped accounts through their shards, one account at a time in id
+        order, once every other account of the movement is locked or updated.
+        """
+        for account_id in sorted(deltas):
+            delta = deltas[account_id]
+            if delta < 0:
+                if not self.balance_shard_service.debit(db, account_id, -delta):
+                    raise InsufficientFundsError(insufficient_funds)
+            elif delta > 0:
+                self.balance_shard_service.credit(db, account_id, delta)
+
+    @staticmethod
+    def _movement_deltas(source_account_id: int, destination_account_id: int, amount: Decimal) -> Dict[int, Decimal]:
+        deltas = {source_account_id: -amount}
+        deltas[destination_account_id] = deltas.get(destination_account_id, Decimal(0)) + amount
+        return deltas
 
     def get_transaction_by_id(self, db: Session, transaction_id: int) -> Transaction:
         """
@@ -0,0 +1,109 @@
+import json
+from typing import Any, AsyncIterator, Iterable, Iterator, Optional
+import anyio.from_thread
+from fastapi import HTTPException, Request
+from sqlalchemy.util.concurrency import await_only, in_greenlet
+from api.schemas.onboarding_schema import BulkCreateResponse, BulkItemResult
+from api.utils.responses import NDJSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is listed in requirements.txt
+    orjson = None
+
+NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+
+def _loads(data):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _receive(chunks: AsyncIterator[bytes]) -> Optional[bytes]:
+    """
+    Next chunk of a request body read from sync code: a threadpool worker in sync mode, or the
+    database greenlet of an async route (see api.controllers.async_routing). None at the end.
+    """
+    async def next_chunk():
+        try:
+            return await chunks.__anext__()
+        except StopAsyncIteration:
+            return None
+
+    if in_greenlet():
+        return await_only(next_chunk())
+    return anyio.from_thread.run(next_chunk)
+
+
+class BulkItems:
+    """
+    Items of a bulk request body: a JSON array, or one JSON document per line (NDJSON).
+    NDJSON bodies are read from the request stream and decoded line by line while the rows are
+    inserted, so neither the upload nor the results are ever held in memory as a whole. A line
+    that is not valid JSON is passed on as its raw text, so it fails validation as its own row
+    instead of failing the whole request.
+    """
+
+    def __init__(self, body: bytes = b"", ndjson: bool = False, chunks: AsyncIterator[bytes] = None):
+        self.ndjson = ndjson
+        self._chunks = chunks
+        self._items = None
+        if not ndjson:
+            try:
+                self._items = _loads(body)
+            except ValueError:
+                raise HTTPException(status_code=400, detail="The body must be a JSON array.")
+            if not isinstance(self._items, list):
+                raise HTTPException(status_code=400, detail="The body must be a JSON array.")
+
+    def __iter__(self) -> Iterator[Any]:
+        if not self.ndjson:
+            yield from self._items
+            return
+        pending = b""
+        while True:
+            chunk = _receive(self._chunks)
+            if chunk is None:
+                break
+            *lines, pending = (pending + chunk).split(b"\n")
+            for line in lines:
+                yield from _decode_line(line)
+        yield from _decode_line(pending)
+
+
+def _decode_line(line: bytes) -> Iterator[Any]:
+    if not line.strip():
+        return
+    try:
+        yield _loads(line)
+    except ValueError:
+        yield line.decode("utf-8", errors="replace")
+
+
+class BulkNDJSONResponse(NDJSONResponse):
+    """
+    NDJSON results streamed while the request body is still being read. The rows iterator is the
+    only reader of the ASGI receive channel: Starlette's disconnect listener (ASGI < 2.4) would
+    otherwise swallow the body chunks. A client that goes away fails the body read instead.
+    """
+
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+
+
+async def read_bulk_items(request: Request) -> BulkItems:
+    media_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if media_type in NDJSON_MEDIA_TYPES:
+        return BulkItems(ndjson=True, chunks=request.stream())
+    return BulkItems(await request.body())
+
+
+def bulk_response(results: Iterable[BulkItemResult], ndjson: bool):
+    """
+    Per-row results in the format of the request: one JSON line per row for NDJSON, streamed as
+    the chunks are committed, else a summary.
+    """
+    if ndjson:
+        return BulkNDJSONResponse(result.model_dump_json(exclude_none=True) + "\n" for result in results)
+    results = list(results)
+    created = sum(1 for result in results if result.status == "CREATED")
+    return BulkCreateResponse(created=created, failed=len(results) - created, results=results)
@@ -12,3 +12,19 @@ class AccountNotFoundError(Exception):
     def __init__(self, message="Account not found."):
         self.message = message
         super().__init__(self.message)
+
+
+class IdempotencyKeyReuseError(Exception):
+    """An idempotency key was sent again with a different request."""
+
+    def __init__(self, message="Idempotency key was already used for a different request."):
+        self.message = message
+        super().__init__(self.message)
+
+
+class IdempotencyKeyArchivedError(Exception):
+    """An idempotency key was sent again after its transaction was archived."""
+
+    def __init__(self, message="The transaction of this idempotency key was archived; send the request with a new key."):
+        self.message = message
+        super().__init__(self.message)
@@ -0,0 +1,99 @@
+import os
+import time
+from typing import Tuple
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest
+from prometheus_client import multiprocess
+
+# With several uvicorn workers every process writes its samples to PROMETHEUS_MULTIPROC_DIR and
+# /metrics sums the files of all of them. The variable must be set, and the directory emptied,
+# before the workers start.
+MULTIPROCESS_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+# Upper bounds (seconds) of the transaction phase buckets; the phases are mostly sub-millisecond.
+PHASE_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+PHASES = ("lock", "update", "insert", "commit")
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template, method and status code.",
+    ["method", "route", "status"],
+)
+TRANSACTIONS = Counter(
+    "bank_transactions",
+    "Money movements by transaction type and outcome (completed, replayed, failed or conflict).",
+    ["transaction_type", "outcome"],
+)
+TRANSACTION_PHASE_DURATION = Histogram(
+    "bank_transaction_phase_duration_seconds",
+    "Time money movements spend locking rows, updating balances, inserting rows and committing.",
+    ["phase"],
+    buckets=PHASE_BUCKETS,
+)
+
+# Label lookups are resolved once, the hot paths only observe.
+_phase_histograms = {phase: TRANSACTION_PHASE_DURATION.labels(phase=phase) for phase in PHASES}
+
+
+def observe_phase(phase: str, seconds: float):
+    _phase_histograms[phase].observe(seconds)
+
+
+def phase_timer(phase: str):
+    """
+    Context manager timing one phase of a money movement.
+    """
+    return _phase_histograms[phase].time()
+
+
+def count_transactions(transaction_type, outcome: str, count: int = 1):
+    if count:
+        TRANSACTIONS.labels(transaction_type=transaction_type.value, outcome=outcome).inc(count)
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """
+    The metrics of this process, or of every worker when running in multiprocess mode,
+    in the Prometheus text format.
+    """
+    if os.environ.get(MULTIPROCESS_ENV):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording the latency of every HTTP request. Requests are labelled with the
+    template of the matched route (/api/v1/transactions/{account_id}), never the raw path, so the
+    number of series stays bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            REQUEST_DURATION.labels(
+                method=scope["method"],
+                route=route.path if route is not None else "unmatched",
+                status=str(status),
+            ).observe(time.perf_counter() - started)
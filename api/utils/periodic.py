@@ -0,0 +1,40 @@
+import logging
+import threading
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicJob:
+    """
+    Runs a function every interval_seconds on a daemon thread until stopped.
+    Errors are logged and do not stop the job.
+    """
+
+    def __init__(self, name: str, interval_seconds: float, target: Callable[[], None]):
+        self.name = name
+        self.interval_seconds = interval_seconds
+        self.target = target
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+        logger.info("Started periodic job %s every %ss", self.name, self.interval_seconds)
+
+    def stop(self, timeout: float = 5.0):
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout)
+        logger.info("Stopped periodic job %s", self.name)
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval_seconds):
+            try:
+                self.target()
+            except Exception as e:
+                logger.error("Periodic job %s failed: %s", self.name, e)
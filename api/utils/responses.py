@@ -0,0 +1,58 @@
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Iterable, Iterator
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy.engine import Row
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is listed in requirements.txt
+    orjson = None
+
+
+class NDJSONResponse(StreamingResponse):
+    """
+    Streams one JSON document per line. The source iterator is kept so the async routes
+    can drive it from within the database greenlet (see api.controllers.async_routing).
+    """
+    media_type = "application/x-ndjson"
+
+    def __init__(self, lines: Iterator[str], **kwargs):
+        self.lines = lines
+        super().__init__(lines, media_type=self.media_type, **kwargs)
+
+
+def _encode_default(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response encoded with orjson, for lists of plain rows that need no validation.
+    Returning it from a route skips the response_model validation and serialization pass,
+    so the rows must already have the shape of the declared response model.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content, default=_encode_default)
+        return json.dumps(content, default=_encode_default, separators=(",", ":")).encode("utf-8")
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Row], **kwargs) -> "FastJSONResponse":
+        content = []
+        fields = None
+        for row in rows:
+            if fields is None:
+                # Column names may be str subclasses (quoted_name), which orjson rejects as keys.
+                fields = [str(field) for field in row._fields]
+            content.append(dict(zip(fields, row)))
+        return cls(content, **kwargs)
@@ -4,7 +4,7 @@ import os
 os.environ["ENVIRONMENT"] = "local"
 
 from api.main import api
-from api.database.session import get_db
+from api.database.session import get_db, get_read_db
 from api.database.base import Base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy import create_engine
@@ -40,6 +40,7 @@ def before_all(context):
 
     # Override the database dependency
     api.dependency_overrides[get_db] = override_get_db
+    api.dependency_overrides[get_read_db] = override_get_db
 
     # Create test client
     context.client = TestClient(api)
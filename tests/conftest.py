@@ -0,0 +1,4 @@
+import os
+
+# Strict mode must be on before the models are imported: a lazy load of an eager-only relationship raises.
+os.environ.setdefault("STRICT_LAZY_LOADS", "True")
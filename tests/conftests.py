@@ -1,14 +1,28 @@
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from api.database.base import Base
 from api.models.bank_account import BankAccount
 from api.models.customer import Customer
 from api.models.transaction import Transaction
 from api.models.administrative_entity import AdministrativeEntity
+from api.models.account_balance_shard import AccountBalanceShard
+from api.models.ledger_entry import LedgerEntry
+from api.models.balance_checkpoint import BalanceCheckpoint
+from api.models.idempotency_key import IdempotencyKey
+from api.models.account_number_counter import AccountNumberCounter
+from api.models.transaction_rollup import RollupWatermark, TransactionRollup
+from api.services.account_metadata_service import account_metadata_cache, account_number_cache
+from api.services.idempotency_service import idempotency_cache
 
 
 
+def clear_process_caches():
+    # Ids are reused once a test database is rolled back or recreated, so the process wide caches start empty.
+    for cache in (account_metadata_cache, account_number_cache, idempotency_cache):
+        cache.clear()
+
+
 @pytest.fixture(scope="session")
 def engine():
     # I decided to use an in-memory SQLite database for tests
@@ -25,6 +39,7 @@ def tables(engine):
 @pytest.fixture
 def db_session(engine, tables):
     """Returns a SQLAlchemy session, and after the test tears down everything properly."""
+    clear_process_caches()
     connection = engine.connect()
     transaction = connection.begin()
     Session = sessionmaker(bind=connection)
@@ -35,3 +50,16 @@ def db_session(engine, tables):
     session.close()
     transaction.rollback()
     connection.close()
+
+
+@pytest.fixture
+def query_counter(engine):
+    """Collects the SQL statements sent to the database while the test runs."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(engine, "before_cursor_execute", before_cursor_execute)
@@ -0,0 +1,109 @@
+import os
+import pytest
+from types import SimpleNamespace
+
+os.environ.setdefault("ENVIRONMENT", "local")
+
+from sqlalchemy import select
+from api.dao.bank_account_dao import BankAccountDAO
+from api.database.account_numbers import (
+    AccountNumberGenerator,
+    SequenceBlockAccountNumberGenerator,
+    UUIDAccountNumberGenerator,
+    build_account_number_generator,
+    format_account_number,
+    is_valid_account_number,
+    luhn_check_digit,
+)
+from api.models.account_number_counter import AccountNumberCounter
+from api.models.bank_account import AccountStatus, AccountType
+from api.schemas.bank_account_schema import BankAccountCreate
+from tests.conftests import db_session, engine, tables
+
+
+class PostgresBlockGenerator(SequenceBlockAccountNumberGenerator):
+    """
+    Block generator taking its sequence values from a counter instead of account_number_seq.
+    """
+
+    def __init__(self, block_size):
+        super().__init__(block_size)
+        self.next_value = 1
+
+    def _reserve_block(self, db, size):
+        values = list(range(self.next_value, self.next_value + size))
+        self.next_value += size
+        self.blocks_reserved += 1
+        return values
+
+
+POSTGRES_SESSION = SimpleNamespace(get_bind=lambda: SimpleNamespace(dialect=SimpleNamespace(name="postgresql")))
+
+
+class TestAccountNumberFormat:
+
+    def test_luhn_check_digit(self):
+        assert luhn_check_digit("7992739871") == "3"
+        assert format_account_number(AccountType.USER, 1234) == "C0000000012344"
+        assert format_account_number(AccountType.ADMINISTRATIVE, 1234) == "A0000000012344"
+
+    def test_check_digit_catches_typos(self):
+        number = format_account_number(AccountType.USER, 987654321)
+
+        assert is_valid_account_number(number)
+        assert not is_valid_account_number(number[:5] + str((int(number[5]) + 1) % 10) + number[6:])
+        assert not is_valid_account_number(UUIDAccountNumberGenerator().generate(None, AccountType.USER)[0])
+
+    def test_sequence_value_must_fit(self):
+        with pytest.raises(ValueError):
+            format_account_number(AccountType.USER, 10 ** 12)
+
+    def test_unknown_scheme(self):
+        with pytest.raises(ValueError):
+            build_account_number_generator("random")
+
+    def test_generator_without_generate_cannot_be_created(self):
+        class IncompleteGenerator(AccountNumberGenerator):
+            pass
+
+        with pytest.raises(TypeError):
+            IncompleteGenerator()
+
+
+class TestSequenceBlockAccountNumberGenerator:
+
+    def test_counter_hands_out_increasing_numbers(self, db_session):
+        generator = SequenceBlockAccountNumberGenerator(block_size=100)
+
+        first = generator.generate(db_session, AccountType.USER, 3)
+        second = generator.generate(db_session, AccountType.ADMINISTRATIVE)
+
+        assert first == [format_account_number(AccountType.USER, value) for value in (1, 2, 3)]
+        assert second == [format_account_number(AccountType.ADMINISTRATIVE, 4)]
+        assert db_session.scalars(select(AccountNumberCounter.last_value)).one() == 4
+
+    def test_rolled_back_numbers_are_handed_out_again(self, db_session):
+        generator = SequenceBlockAccountNumberGenerator()
+        savepoint = db_session.begin_nested()
+        generator.generate(db_session, AccountType.USER, 5)
+        savepoint.rollback()
+
+        assert generator.generate(db_session, AccountType.USER) == [format_account_number(AccountType.USER, 1)]
+
+    def test_blocks_are_reserved_per_process(self):
+        generator = PostgresBlockGenerator(block_size=10)
+
+        numbers = [generator.generate(POSTGRES_SESSION, AccountType.USER)[0] for _ in range(25)]
+        numbers += generator.generate(POSTGRES_SESSION, AccountType.USER, 30)
+
+        assert numbers == [format_account_number(AccountType.USER, value) for value in range(1, 56)]
+        # 3 blocks for the single numbers, one more covering the 25 missing for the bulk request.
+        assert generator.blocks_reserved == 4
+
+    def test_dao_uses_the_generator(self, db_session):
+        dao = BankAccountDAO(account_number_generator=SequenceBlockAccountNumberGenerator())
+
+        account = dao.create_account(db_session, BankAccountCreate(owner_id=1, balance=10, account_type=AccountType.USER, status=AccountStatus.ACTIVE))
+
+        assert account.account_number == format_account_number(AccountType.USER, 1)
+        assert is_valid_account_number(account.account_number)
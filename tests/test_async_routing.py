@@ -0,0 +1,154 @@
+import asyncio
+import inspect
+import json
+import os
+import pytest
+
+os.environ.setdefault("ENVIRONMENT", "local")
+
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Header
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+from api.controllers.async_routing import to_async_router
+from api.controllers.bank_account_controller import router as account_router
+from api.controllers.transaction_controller import router as transaction_router
+from api.database import async_session
+from api.database.async_session import get_async_db, get_async_read_db, to_async_url
+from api.database.base import Base
+from api.database.session import get_read_db
+from api.database.replicas import ReplicaRouter
+from tests.conftests import tables
+
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+
+
+@pytest.fixture
+def client():
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+
+    async def create_tables():
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+
+    asyncio.run(create_tables())
+    session_factory = async_sessionmaker(bind=engine, autoflush=False)
+
+    async def override_get_async_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            await db.close()
+
+    app = FastAPI()
+    app.include_router(to_async_router(account_router), prefix="/api/v1")
+    app.include_router(to_async_router(transaction_router), prefix="/api/v1")
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_async_read_db] = override_get_async_db
+    yield TestClient(app)
+    asyncio.run(engine.dispose())
+
+
+def create_account(client, account_type, balance):
+    response = client.post("/api/v1/bank-accounts", json={
+        "owner_id": 1, "balance": balance, "account_type": account_type, "status": "ACTIVE"
+    })
+    assert response.status_code == 200
+    return response.json()
+
+
+class TestAsyncRouting:
+
+    def test_async_router_endpoints_are_coroutines(self):
+        async_router = to_async_router(transaction_router)
+
+        assert all(inspect.iscoroutinefunction(route.endpoint) for route in async_router.routes)
+        assert {route.path for route in async_router.routes} == {route.path for route in transaction_router.routes}
+
+    def test_sync_and_async_modes_expose_the_same_api(self):
+        from api.main import routers
+
+        sync_app, async_app = FastAPI(), FastAPI()
+        for router, tag in routers:
+            sync_app.include_router(router, prefix="/api/v1", tags=[tag])
+            async_app.include_router(to_async_router(router), prefix="/api/v1", tags=[tag])
+
+        assert async_app.openapi() == sync_app.openapi()
+
+    def test_route_dependencies_run_in_async_mode(self, client):
+        def require_token(x_token: str = Header(None)):
+            if x_token != "secret":
+                raise HTTPException(status_code=401)
+
+        router = APIRouter()
+
+        @router.get("/guarded", dependencies=[Depends(require_token)], include_in_schema=False)
+        def guarded(db=Depends(get_read_db)):
+            return {"ok": True}
+
+        client.app.include_router(to_async_router(router))
+
+        assert client.get("/guarded").status_code == 401
+        assert client.get("/guarded", headers={"X-Token": "secret"}).json() == {"ok": True}
+        assert "/guarded" not in client.app.openapi()["paths"]
+
+    def test_ndjson_bulk_onboarding_through_async_session(self, client):
+        from api.controllers.customer_controller import router as customer_router
+
+        client.app.include_router(to_async_router(customer_router), prefix="/api/v1")
+        ndjson = {"Content-Type": "application/x-ndjson"}
+
+        customers = client.post("/api/v1/customers:bulk", content='{"customer_name": "Ada"}\n', headers=ndjson)
+        owner_id = json.loads(customers.text)["id"]
+        accounts = client.post("/api/v1/bank-accounts:bulk", headers=ndjson, content="".join(
+            json.dumps({"owner_id": owner_id, "balance": balance, "account_type": "USER", "status": "ACTIVE"}) + "\n"
+            for balance in (1, 2)
+        ))
+
+        assert [json.loads(line)["status"] for line in accounts.text.splitlines()] == ["CREATED", "CREATED"]
+
+    def test_async_reads_follow_the_replica_router(self, monkeypatch):
+        session_factories = {
+            name: async_sessionmaker(bind=create_async_engine("sqlite+aiosqlite://")) for name in ("primary", "replica")
+        }
+        lag = {"seconds": 0.5}
+        router = ReplicaRouter(
+            None, [create_engine("sqlite://")], max_lag_seconds=5.0, lag_check_interval=0,
+            lag_probe=lambda connection: lag["seconds"],
+        )
+        monkeypatch.setattr(async_session, "replica_router", router)
+        monkeypatch.setattr(async_session, "_async_engine", session_factories["primary"].kw["bind"])
+        monkeypatch.setattr(async_session, "_async_session_factory", session_factories["primary"])
+        monkeypatch.setattr(async_session, "_async_replica_session_factories", [session_factories["replica"]])
+
+        app = FastAPI()
+
+        @app.get("/read-from")
+        async def read_from(db=Depends(get_async_read_db)):
+            return next(name for name, factory in session_factories.items() if db.bind is factory.kw["bind"])
+
+        client = TestClient(app)
+        assert client.get("/read-from").json() == "replica"
+        assert client.get("/read-from", headers={"X-Read-From": "primary"}).json() == "primary"
+        lag["seconds"] = 30.0
+        assert client.get("/read-from").json() == "primary"
+
+    def test_to_async_url(self):
+        assert to_async_url("postgresql://user:pw@db:5432/bank") == "postgresql+asyncpg://user:pw@db:5432/bank"
+        assert to_async_url("sqlite:///./test.db") == "sqlite+aiosqlite:///./test.db"
+
+    def test_deposit_and_history_through_async_session(self, client):
+        cash_holding = create_account(client, "ADMINISTRATIVE", 1000)
+        user = create_account(client, "USER", 10)
+
+        response = client.post("/api/v1/transactions/deposit", json={
+            "amount": 5, "source_account_id": cash_holding["id"], "destination_account_id": user["id"]
+        })
+        assert response.status_code == 200
+
+        assert client.get(f"/api/v1/bank-accounts/{user['id']}").json()["balance"] == 15.0
+        history = client.get(f"/api/v1/transactions/{user['id']}", params={"format": "ndjson"})
+        assert len(history.text.splitlines()) == 1
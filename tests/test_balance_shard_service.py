@@ -0,0 +1,218 @@
+import pytest
+from decimal import Decimal
+from sqlalchemy import select
+from api.models.account_balance_shard import AccountBalanceShard
+from api.models.bank_account import AccountStatus
+from api.schemas.transaction_schema import TransferCreate
+from api.services import balance_shard_service as balance_shard_service_module
+from api.services import transaction_service as transaction_service_module
+from api.services.balance_shard_service import BalanceShardService
+from api.services.transaction_service import TransactionService
+from api.services.bank_account_service import BankAccountService
+from api.dao.bank_account_dao import BankAccountDAO
+from api.dao.transaction_dao import TransactionDAO
+from api.database.locking import lock_accounts
+from api.utils.exceptions import InsufficientFundsError
+from tests.conftests import db_session, engine, tables
+from tests.fixtures import cash_holding_account, cash_disbursement_account, system_customer, user_account
+
+
+@pytest.fixture
+def balance_shard_service():
+    return BalanceShardService(shard_count=4)
+
+
+@pytest.fixture
+def transaction_service(balance_shard_service):
+    return TransactionService(BankAccountService(BankAccountDAO()), TransactionDAO(), balance_shard_service)
+
+
+@pytest.fixture
+def conditional_transaction_service(balance_shard_service):
+    return TransactionService(
+        BankAccountService(BankAccountDAO()), TransactionDAO(), balance_shard_service, engine_mode="conditional"
+    )
+
+
+def shard_balances(db_session, account_id):
+    return db_session.execute(
+        select(AccountBalanceShard.balance)
+        .where(AccountBalanceShard.account_id == account_id)
+        .order_by(AccountBalanceShard.shard_index)
+    ).scalars().all()
+
+
+def logical_balance(db_session, account):
+    db_session.refresh(account)
+    return account.balance + sum(shard_balances(db_session, account.id))
+
+
+class TestBalanceShardService:
+
+    def test_consolidate_spreads_balance_over_shards(self, db_session, cash_holding_account, balance_shard_service):
+        balance_shard_service.consolidate(db_session, cash_holding_account.id)
+
+        assert shard_balances(db_session, cash_holding_account.id) == [Decimal('2500')] * 4
+        assert logical_balance(db_session, cash_holding_account) == Decimal('10000')
+
+    def test_deposit_debits_a_shard(self, db_session, cash_holding_account, user_account, balance_shard_service, transaction_service):
+        balance_shard_service.consolidate(db_session, cash_holding_account.id)
+
+        transaction_service.create_deposit_transaction(
+            db_session,
+            amount=Decimal('100'),
+            source_account_id=cash_holding_account.id,
+            destination_account_id=user_account.id
+        )
+
+        db_session.refresh(user_account)
+        assert sorted(shard_balances(db_session, cash_holding_account.id)) == [Decimal('2400')] + [Decimal('2500')] * 3
+        assert logical_balance(db_session, cash_holding_account) == Decimal('9900')
+        assert user_account.balance == Decimal('1100')
+
+    def test_deposit_larger_than_any_shard_folds_shards(self, db_session, cash_holding_account, user_account, balance_shard_service, transaction_service):
+        balance_shard_service.consolidate(db_session, cash_holding_account.id)
+
+        transaction_service.create_deposit_transaction(
+            db_session,
+            amount=Decimal('3000'),
+            source_account_id=cash_holding_account.id,
+            destination_account_id=user_account.id
+        )
+
+        assert shard_balances(db_session, cash_holding_account.id) == [Decimal('0')] * 4
+        assert logical_balance(db_session, cash_holding_account) == Decimal('7000')
+
+    def test_deposit_above_logical_balance_fails(self, db_session, cash_holding_account, user_account, balance_shard_service, transaction_service):
+        balance_shard_service.consolidate(db_session, cash_holding_account.id)
+
+        with pytest.raises(InsufficientFundsError):
+            transaction_service.create_deposit_transaction(
+                db_session,
+                amount=Decimal('20000'),
+                source_account_id=cash_holding_account.id,
+                destination_account_id=user_account.id
+            )
+
+    def test_withdrawal_credits_a_shard(self, db_session, cash_disbursement_account, user_account, balance_shard_service, transaction_service):
+        balance_shard_service.consolidate(db_session, cash_disbursement_account.id)
+
+        transaction_service.create_withdrawal(
+            db_session,
+            amount=Decimal('100'),
+            source_account_id=user_account.id,
+            destination_account_id=cash_disbursement_account.id
+        )
+
+        db_session.refresh(user_account)
+        assert logical_balance(db_session, cash_disbursement_account) == Decimal('10100')
+        assert user_account.balance == Decimal('900')
+
+    def test_account_responses_report_logical_balance(self, db_session, cash_holding_account, balance_shard_service):
+        balance_shard_service.consolidate(db_session, cash_holding_account.id)
+
+        account = BankAccountService(BankAccountDAO()).get_account_by_id(db_session, cash_holding_account.id)
+
+        assert account.balance == 10000.0
+
+    def test_transfer_from_striped_account_uses_its_shards(self, db_session, cash_holding_account, user_account, balance_shard_service, transaction_service):
+        balance_shard_service.consolidate(db_session, cash_holding_account.id)
+
+        transaction_service.create_transfer(
+            db_session,
+            amount=Decimal('100'),
+            source_account_id=cash_holding_account.id,
+            destination_account_id=user_account.id
+        )
+        transaction_service.create_transfer(
+            db_session,
+            amount=Decimal('50'),
+            source_account_id=user_account.id,
+            destination_account_id=cash_holding_account.id
+        )
+
+        db_session.refresh(user_account)
+        assert logical_balance(db_session, cash_holding_account) == Decimal('9950')
+        assert user_account.balance == Decimal('1050')
+
+    def test_conditional_transfer_from_striped_account_uses_its_shards(self, db_session, cash_holding_account, user_account, balance_shard_service, conditional_transaction_service):
+        balance_shard_service.consolidate(db_session, cash_holding_account.id)
+
+        conditional_transaction_service.create_transfer(
+            db_session,
+            amount=Decimal('3000'),
+            source_account_id=cash_holding_account.id,
+            destination_account_id=user_account.id
+        )
+
+        db_session.refresh(user_account)
+        assert logical_balance(db_session, cash_holding_account) == Decimal('7000')
+        assert user_account.balance == Decimal('4000')
+        with pytest.raises(InsufficientFundsError):
+            conditional_transaction_service.create_transfer(
+                db_session,
+                amount=Decimal('8000'),
+                source_account_id=cash_holding_account.id,
+                destination_account_id=user_account.id
+            )
+
+    def test_transfer_batch_checks_the_logical_balance_of_striped_accounts(self, db_session, cash_holding_account, user_account, balance_shard_service, transaction_service):
+        balance_shard_service.consolidate(db_session, cash_holding_account.id)
+
+        results = transaction_service.create_transfer_batch(db_session, [
+            TransferCreate(amount=6000, source_account_id=cash_holding_account.id, destination_account_id=user_account.id),
+            TransferCreate(amount=5000, source_account_id=cash_holding_account.id, destination_account_id=user_account.id),
+            TransferCreate(amount=500, source_account_id=user_account.id, destination_account_id=cash_holding_account.id),
+        ])
+
+        db_session.refresh(user_account)
+        assert [result.status for result in results] == ["COMPLETED", "FAILED", "COMPLETED"]
+        assert logical_balance(db_session, cash_holding_account) == Decimal('4500')
+        assert user_account.balance == Decimal('6500')
+
+    def test_striped_movements_lock_user_rows_first(self, db_session, monkeypatch, cash_holding_account, user_account, balance_shard_service, transaction_service):
+        # The cash holding account has the lower id, yet every striped path locks it after the user row.
+        assert cash_holding_account.id < user_account.id
+        locked = []
+
+        def recording_lock_accounts(db, account_ids):
+            locked.append(sorted(set(account_ids)))
+            return lock_accounts(db, account_ids)
+
+        monkeypatch.setattr(transaction_service_module, "lock_accounts", recording_lock_accounts)
+        monkeypatch.setattr(balance_shard_service_module, "lock_accounts", recording_lock_accounts)
+
+        # Without shards every movement falls back to the account row.
+        transaction_service.create_deposit_transaction(
+            db_session, amount=Decimal('10'), source_account_id=cash_holding_account.id, destination_account_id=user_account.id
+        )
+        transaction_service.create_transfer(
+            db_session, amount=Decimal('10'), source_account_id=cash_holding_account.id, destination_account_id=user_account.id
+        )
+
+        assert locked == [[user_account.id], [cash_holding_account.id]] * 2
+
+    def test_striped_account_closed_behind_the_metadata_cache_is_rejected(self, db_session, cash_disbursement_account, user_account, balance_shard_service, transaction_service):
+        balance_shard_service.consolidate(db_session, cash_disbursement_account.id)
+        transaction_service.bank_account_service.account_metadata_service.get(db_session, cash_disbursement_account.id)
+        # Closed by another process: the cached metadata still says ACTIVE.
+        cash_disbursement_account.status = AccountStatus.CLOSED
+        db_session.flush()
+
+        with pytest.raises(ValueError, match="is closed"):
+            transaction_service.create_withdrawal(
+                db_session,
+                amount=Decimal('100'),
+                source_account_id=user_account.id,
+                destination_account_id=cash_disbursement_account.id
+            )
+
+    def test_closing_an_account_deletes_its_shards(self, db_session, cash_disbursement_account, balance_shard_service):
+        cash_disbursement_account.balance = Decimal('0')
+        balance_shard_service.consolidate(db_session, cash_disbursement_account.id)
+        assert shard_balances(db_session, cash_disbursement_account.id) == [Decimal('0')] * 4
+
+        BankAccountDAO().close_account(db_session, cash_disbursement_account.id)
+        balance_shard_service.consolidate(db_session, cash_disbursement_account.id)
+
+        assert shard_balances(db_session, cash_disbursement_account.id) == []
@@ -8,6 +8,7 @@ from sqlalchemy.orm import attributes
 from tests.fixtures import system_customer
 from tests.conftests import db_session, engine, tables
 from api.models.bank_account import AccountStatus
+from api.utils.exceptions import AccountNotFoundError
 
 
 @pytest.fixture
@@ -87,3 +88,49 @@ class TestBankAccountService:
     def test_get_account_by_id_not_found(self, db_session, bank_account_service):
         retrieved_account = bank_account_service.get_account_by_id(db_session, 999)
         assert retrieved_account is None
+
+    def test_close_account(self, db_session, bank_account_service, system_customer):
+        account = BankAccountDAO().create_account(db_session, BankAccountCreate(balance=0, account_type=AccountType.USER, status=AccountStatus.ACTIVE, owner_id=system_customer.id))
+        metadata_service = bank_account_service.account_metadata_service
+        assert metadata_service.get(db_session, account.id).status == AccountStatus.ACTIVE
+
+        closed_account = bank_account_service.close_account(db_session, account.id)
+
+        assert closed_account.status == AccountStatus.CLOSED
+        assert metadata_service.get(db_session, account.id).status == AccountStatus.CLOSED
+
+    def test_close_account_with_balance(self, db_session, bank_account_service, system_customer):
+        account = BankAccountDAO().create_account(db_session, BankAccountCreate(balance=10, account_type=AccountType.USER, status=AccountStatus.ACTIVE, owner_id=system_customer.id))
+
+        with pytest.raises(ValueError, match="zero balance"):
+            bank_account_service.close_account(db_session, account.id)
+
+    def test_close_account_not_found(self, db_session, bank_account_service):
+        with pytest.raises(AccountNotFoundError):
+            bank_account_service.close_account(db_session, 999)
+
+
+class TestAccountMetadataService:
+
+    def test_lookups_are_cached(self, db_session, bank_account_service, system_customer):
+        account = BankAccountDAO().create_account(db_session, BankAccountCreate(balance=0, account_type=AccountType.USER, status=AccountStatus.ACTIVE, owner_id=system_customer.id))
+        metadata_service = bank_account_service.account_metadata_service
+
+        metadata = metadata_service.get(db_session, account.id)
+        db_session.delete(account)
+        db_session.flush()
+
+        assert metadata.account_type == AccountType.USER
+        assert metadata_service.get(db_session, account.id) == metadata
+        assert metadata_service.get_by_account_number(db_session, account.account_number) == metadata
+
+        metadata_service.invalidate(account.id)
+        assert metadata_service.get(db_session, account.id) is None
+
+    def test_unknown_accounts_are_not_cached(self, db_session, bank_account_service, system_customer):
+        metadata_service = bank_account_service.account_metadata_service
+        assert metadata_service.get(db_session, 999) is None
+
+        account = BankAccountDAO().create_account(db_session, BankAccountCreate(balance=0, account_type=AccountType.USER, status=AccountStatus.ACTIVE, owner_id=system_customer.id))
+
+        assert metadata_service.get_by_account_number(db_session, account.account_number).id == account.id
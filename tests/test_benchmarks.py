@@ -0,0 +1,70 @@
+import pytest
+from benchmarks import account_numbers, list_endpoints
+from api.database.account_numbers import ACCOUNT_NUMBER_SCHEMES
+from benchmarks.transaction_engine import ENGINE_MODES, PATTERNS, build_operations, compare_with_baseline, run_benchmark, scenario_key
+
+
+@pytest.mark.parametrize("engine_mode", ENGINE_MODES)
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_benchmark_run_conserves_money(tmp_path, pattern, engine_mode):
+    result = run_benchmark(
+        f"sqlite:///{tmp_path / 'benchmark.db'}",
+        pattern=pattern, engine_mode=engine_mode, workers=4, operations=60, user_accounts=5,
+    )
+
+    assert result["money_conserved"]
+    assert result["completed"] == 60
+    assert result["errors"] == 0
+    assert result["latency_ms"]["p50"] <= result["latency_ms"]["p99"]
+
+
+def test_pingpong_alternates_between_two_accounts():
+    accounts = {"cash_holding": 1, "cash_disbursement": 2, "users": [3, 4, 5]}
+
+    movements = build_operations("pingpong", 4, accounts, seed=1)
+
+    assert [(source, destination) for _, _, source, destination in movements] == [(3, 4), (4, 3), (3, 4), (4, 3)]
+
+
+def test_compare_with_baseline_reports_regressions():
+    baseline = {"ops_per_second": 100.0, "latency_ms": {"p99": 10.0}}
+
+    assert compare_with_baseline({"ops_per_second": 90.0, "latency_ms": {"p99": 11.0}}, baseline, 0.2) == []
+    regressions = compare_with_baseline({"ops_per_second": 70.0, "latency_ms": {"p99": 15.0}}, baseline, 0.2)
+    assert len(regressions) == 2
+
+
+def test_scenarios_of_different_sizes_have_their_own_baseline():
+    key = scenario_key("service", "hotspot", "pessimistic", 8, operations=2000, user_accounts=100)
+
+    assert key != scenario_key("service", "hotspot", "pessimistic", 8, operations=5000, user_accounts=100)
+    assert key != scenario_key("service", "hotspot", "pessimistic", 8, operations=2000, user_accounts=1000)
+
+
+def test_list_endpoint_paths_produce_the_same_json(tmp_path):
+    result = list_endpoints.run_benchmark(f"sqlite:///{tmp_path / 'benchmark.db'}", rows=50, repeat=1)
+
+    assert set(result["endpoints"]) == set(list_endpoints.ENDPOINTS)
+    assert all(timings["identical"] for timings in result["endpoints"].values())
+
+
+@pytest.mark.parametrize("mode", account_numbers.MODES)
+def test_account_number_schemes_insert_unique_numbers(tmp_path, mode):
+    result = account_numbers.run_benchmark(f"sqlite:///{tmp_path / 'benchmark.db'}", accounts=30, existing=20, chunk_size=8, mode=mode)
+
+    assert set(result["schemes"]) == set(ACCOUNT_NUMBER_SCHEMES)
+    assert all(timings["unique"] for timings in result["schemes"].values())
+
+
+def test_http_runs_restore_the_engine_mode(tmp_path):
+    from api.services import transaction_service
+
+    configured = transaction_service.TRANSACTION_ENGINE_MODE
+    result = run_benchmark(
+        f"sqlite:///{tmp_path / 'benchmark.db'}", target="http",
+        engine_mode="conditional" if configured != "conditional" else "pessimistic",
+        workers=2, operations=10, user_accounts=3,
+    )
+
+    assert result["money_conserved"]
+    assert transaction_service.TRANSACTION_ENGINE_MODE == configured
@@ -0,0 +1,77 @@
+import uuid
+import pytest
+from decimal import Decimal
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from api.database.base import Base
+from api.models.bank_account import AccountType, BankAccount
+from api.models.transaction import Transaction, TransactionType
+from api.services.group_commit_service import GroupCommitWriter
+from api.utils.exceptions import InsufficientFundsError
+from tests.conftests import clear_process_caches  # also registers every model on Base.metadata
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    clear_process_caches()
+    engine = create_engine(f"sqlite:///{tmp_path / 'group_commit.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine, autoflush=False)
+    engine.dispose()
+
+
+@pytest.fixture
+def accounts(session_factory):
+    with session_factory() as db:
+        accounts = [
+            BankAccount(account_number=str(uuid.uuid4()), balance=balance, account_type=account_type)
+            for balance, account_type in (
+                (Decimal('1000'), AccountType.USER),
+                (Decimal('0'), AccountType.USER),
+                (Decimal('5000'), AccountType.ADMINISTRATIVE),
+            )
+        ]
+        db.add_all(accounts)
+        db.commit()
+        return [account.id for account in accounts]
+
+
+@pytest.fixture
+def writer(session_factory):
+    writer = GroupCommitWriter(session_factory, max_delay_ms=200, max_batch=50)
+    writer.start()
+    yield writer
+    writer.stop()
+
+
+def test_movements_are_committed_together(session_factory, accounts, writer):
+    user, other, cash_holding = accounts
+    futures = [writer.submit(TransactionType.TRANSFER, Decimal('100'), user, other) for _ in range(5)]
+    futures.append(writer.submit(TransactionType.DEPOSIT, Decimal('50'), cash_holding, user))
+
+    transactions = [future.result(timeout=10) for future in futures]
+
+    assert len({transaction.id for transaction in transactions}) == 6
+    assert writer.stats()["groups"] < writer.stats()["movements"]
+    with session_factory() as db:
+        assert db.get(BankAccount, user).balance == Decimal('550')
+        assert db.get(BankAccount, other).balance == Decimal('500')
+        assert db.get(BankAccount, cash_holding).balance == Decimal('4950')
+        assert db.query(Transaction).count() == 6
+
+
+def test_failed_movement_does_not_affect_its_group(session_factory, accounts, writer):
+    user, other, _ = accounts
+    first = writer.submit(TransactionType.TRANSFER, Decimal('800'), user, other)
+    overdraft = writer.submit(TransactionType.TRANSFER, Decimal('800'), user, other)
+    last = writer.submit(TransactionType.TRANSFER, Decimal('100'), user, other)
+
+    first.result(timeout=10)
+    last.result(timeout=10)
+    with pytest.raises(InsufficientFundsError):
+        overdraft.result(timeout=10)
+
+    with session_factory() as db:
+        assert db.get(BankAccount, user).balance == Decimal('100')
+        assert db.get(BankAccount, other).balance == Decimal('900')
+        assert db.query(Transaction).count() == 2
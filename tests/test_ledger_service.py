@@ -0,0 +1,103 @@
+import pytest
+from datetime import datetime, timedelta
+from decimal import Decimal
+from sqlalchemy import update
+from api.dao.bank_account_dao import BankAccountDAO
+from api.dao.transaction_dao import TransactionDAO
+from api.models.balance_checkpoint import BalanceCheckpoint
+from api.models.bank_account import AccountType, AccountStatus
+from api.models.ledger_entry import EntryType, LedgerEntry
+from api.schemas.bank_account_schema import BankAccountCreate
+from api.services import ledger_service
+from api.services.bank_account_service import BankAccountService
+from api.services.ledger_service import LedgerService
+from api.services.transaction_service import TransactionService
+from tests.conftests import db_session, engine, tables
+from tests.fixtures import cash_holding_account, system_customer, user_account
+
+
+@pytest.fixture
+def transaction_service():
+    return TransactionService(BankAccountService(BankAccountDAO()), TransactionDAO())
+
+
+@pytest.fixture
+def ledger():
+    return LedgerService()
+
+
+def create_account(db_session, owner_id, account_type, balance):
+    return BankAccountDAO().create_account(db_session, BankAccountCreate(
+        balance=balance, account_type=account_type, status=AccountStatus.ACTIVE, owner_id=owner_id
+    ))
+
+
+class TestLedgerService:
+
+    def test_transaction_writes_debit_and_credit_entries(self, db_session, cash_holding_account, user_account, transaction_service):
+        transaction = transaction_service.create_deposit_transaction(
+            db_session,
+            amount=Decimal('100'),
+            source_account_id=cash_holding_account.id,
+            destination_account_id=user_account.id
+        )
+
+        entries = db_session.query(LedgerEntry).filter(LedgerEntry.transaction_id == transaction.id).all()
+
+        assert {(entry.account_id, entry.entry_type, entry.amount) for entry in entries} == {
+            (cash_holding_account.id, EntryType.DEBIT, Decimal('100')),
+            (user_account.id, EntryType.CREDIT, Decimal('100')),
+        }
+
+    def test_balance_as_of_with_and_without_checkpoint(self, db_session, system_customer, transaction_service, ledger):
+        admin_account = create_account(db_session, system_customer.id, AccountType.ADMINISTRATIVE, 10000)
+        account = create_account(db_session, system_customer.id, AccountType.USER, 1000)
+        two_days_ago = datetime.utcnow() - timedelta(days=2)
+        db_session.execute(update(LedgerEntry).values(created_at=two_days_ago))
+
+        transaction_service.create_deposit_transaction(
+            db_session,
+            amount=Decimal('250'),
+            source_account_id=admin_account.id,
+            destination_account_id=account.id
+        )
+        yesterday = datetime.utcnow() - timedelta(days=1)
+
+        assert ledger.get_balance_as_of(db_session, account.id) == Decimal('1250')
+        assert ledger.get_balance_as_of(db_session, account.id, yesterday) == Decimal('1000')
+
+        assert ledger.checkpoint_balances(db_session) >= 2
+        assert ledger.checkpoint_balances(db_session) == 0
+        assert ledger.get_balance_as_of(db_session, account.id) == Decimal('1250')
+        assert ledger.get_balance_as_of(db_session, account.id, yesterday) == Decimal('1000')
+        assert ledger.get_balance_as_of(db_session, admin_account.id) == Decimal('9750')
+
+    def test_checkpoint_follows_commit_order(self, db_session, monkeypatch, user_account, ledger):
+        # The entry with the lower id belongs to a transaction that committed later (higher xid).
+        late = LedgerEntry(account_id=user_account.id, entry_type=EntryType.CREDIT, amount=Decimal('10'), xid=12)
+        early = LedgerEntry(account_id=user_account.id, entry_type=EntryType.CREDIT, amount=Decimal('5'), xid=10)
+        db_session.add(late)
+        db_session.flush()
+        db_session.add(early)
+        db_session.flush()
+        assert late.id < early.id
+
+        # Transaction 11 is still running: only the entries written below it are checkpointed.
+        monkeypatch.setattr(ledger_service, "settled_xid_horizon", lambda db: 11)
+        assert ledger.checkpoint_balances(db_session) == 1
+        checkpoint = db_session.get(BalanceCheckpoint, user_account.id)
+        assert (checkpoint.balance, checkpoint.last_xid, checkpoint.last_entry_id) == (Decimal('5'), 10, early.id)
+        assert ledger.get_balance_as_of(db_session, user_account.id) == Decimal('15')
+
+        monkeypatch.setattr(ledger_service, "settled_xid_horizon", lambda db: 13)
+        assert ledger.checkpoint_balances(db_session) == 1
+        db_session.refresh(checkpoint)
+        assert (checkpoint.balance, checkpoint.last_xid, checkpoint.last_entry_id) == (Decimal('15'), 12, late.id)
+        assert ledger.get_balance_as_of(db_session, user_account.id) == Decimal('15')
+
+    def test_backfill_explains_existing_balances(self, db_session, user_account, ledger):
+        assert ledger.get_balance_as_of(db_session, user_account.id) == Decimal('0')
+
+        ledger.backfill_opening_entries(db_session)
+
+        assert ledger.get_balance_as_of(db_session, user_account.id) == Decimal('1000')
@@ -0,0 +1,154 @@
+import os
+import uuid
+import pytest
+from decimal import Decimal
+
+os.environ.setdefault("ENVIRONMENT", "local")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from api.controllers.bank_account_controller import router as account_router
+from api.controllers.customer_controller import router as customer_router
+from api.controllers.transaction_controller import router as transaction_router
+from api.database.base import Base
+from api.database.session import get_db, get_read_db
+from api.models.account_balance_shard import AccountBalanceShard
+from api.models.administrative_entity import AdministrativeEntity
+from api.models.bank_account import AccountType, BankAccount
+from api.models.customer import Customer
+from api.models.transaction import Transaction, TransactionType
+from api.schemas.bank_account_schema import BankAccountResponse
+from api.schemas.customer_schema import CustomerResponse
+from api.schemas.transaction_schema import TransactionResponse
+from api.utils.responses import FastJSONResponse
+from tests.conftests import clear_process_caches
+
+
+@pytest.fixture
+def db_session():
+    # The test client serves requests from another thread, so the in-memory database is shared.
+    clear_process_caches()
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine, autoflush=False)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def client(db_session):
+    def override_get_db():
+        yield db_session
+
+    app = FastAPI()
+    for router in (account_router, customer_router, transaction_router):
+        app.include_router(router, prefix="/api/v1")
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    return TestClient(app)
+
+
+@pytest.fixture
+def accounts(db_session):
+    customer = Customer(customer_name="Ada")
+    entity = AdministrativeEntity(tax_id="123", corporate_name="Bank")
+    db_session.add_all([customer, entity])
+    db_session.flush()
+    accounts = [
+        BankAccount(account_number=str(uuid.uuid4()), balance=Decimal("12.50"), account_type=AccountType.USER, customer_id=customer.id),
+        BankAccount(account_number=str(uuid.uuid4()), balance=Decimal("100"), account_type=AccountType.ADMINISTRATIVE,
+                    administrative_entity_id=entity.id),
+    ]
+    db_session.add_all(accounts)
+    db_session.flush()
+    db_session.add(AccountBalanceShard(account_id=accounts[1].id, shard_index=0, balance=Decimal("7.25")))
+    db_session.add_all([
+        Transaction(amount=Decimal(amount), transaction_type=TransactionType.TRANSFER,
+                    source_account_id=accounts[1].id, destination_account_id=accounts[0].id)
+        for amount in ("1.10", "2.20", "3.30")
+    ])
+    db_session.flush()
+    return accounts
+
+
+class TestFastListResponses:
+
+    def test_accounts_match_the_response_model(self, client, db_session, accounts):
+        expected = [
+            BankAccountResponse(id=account.id, account_number=account.account_number, balance=float(balance),
+                                account_type=account.account_type, status=account.status).model_dump(mode="json")
+            for account, balance in zip(accounts, (Decimal("12.50"), Decimal("107.25")))
+        ]
+
+        assert client.get("/api/v1/bank-accounts").json() == expected
+
+    def test_customers_match_the_response_model(self, client, db_session, accounts):
+        customers = db_session.query(Customer).order_by(Customer.id).all()
+        expected = [CustomerResponse(id=customer.id, customer_name=customer.customer_name).model_dump(mode="json") for customer in customers]
+
+        assert client.get("/api/v1/customers").json() == expected
+
+    def test_transactions_match_the_response_model(self, client, db_session, accounts):
+        transactions = db_session.query(Transaction).order_by(Transaction.timestamp, Transaction.id).all()
+        expected = [TransactionResponse.from_transaction(transaction).model_dump(mode="json") for transaction in transactions]
+
+        assert client.get(f"/api/v1/transactions/{accounts[0].id}").json() == expected
+
+        first_page = client.get(f"/api/v1/transactions/{accounts[0].id}", params={"limit": 2})
+        second_page = client.get(
+            f"/api/v1/transactions/{accounts[0].id}", params={"limit": 2, "after": first_page.headers["X-Next-Cursor"]}
+        )
+        assert first_page.json() + second_page.json() == expected
+        assert "X-Next-Cursor" not in second_page.headers
+
+    def test_encodes_decimals_and_enums(self):
+        response = FastJSONResponse([{"amount": Decimal("1.5"), "type": TransactionType.DEPOSIT}])
+
+        assert response.body == b'[{"amount":1.5,"type":"DEPOSIT"}]'
+
+
+class TestAccountListing:
+
+    def test_keyset_pages(self, client, db_session, accounts):
+        first_page = client.get("/api/v1/bank-accounts", params={"limit": 1})
+        second_page = client.get("/api/v1/bank-accounts", params={"limit": 1, "after": first_page.headers["X-Next-Cursor"]})
+        last_page = client.get("/api/v1/bank-accounts", params={"limit": 1, "after": second_page.headers["X-Next-Cursor"]})
+
+        assert [account["id"] for account in first_page.json() + second_page.json()] == [account.id for account in accounts]
+        assert last_page.json() == []
+        assert "X-Next-Cursor" not in last_page.headers
+
+    def test_filters(self, client, db_session, accounts):
+        user, administrative = accounts
+
+        def listed_ids(**params):
+            return [account["id"] for account in client.get("/api/v1/bank-accounts", params=params).json()]
+
+        assert listed_ids(account_type="ADMINISTRATIVE") == [administrative.id]
+        assert listed_ids(customer_id=user.customer_id) == [user.id]
+        assert listed_ids(status="CLOSED") == []
+        # The balance range applies to the logical balance: 100 on the row plus 7.25 on a shard.
+        entity_id = administrative.administrative_entity_id
+        assert listed_ids(administrative_entity_id=entity_id, min_balance="105") == [administrative.id]
+        assert listed_ids(administrative_entity_id=entity_id, min_balance="108") == []
+        assert listed_ids(customer_id=user.customer_id, min_balance="10", max_balance="13") == [user.id]
+
+    def test_balance_range_needs_an_owner(self, client, db_session, accounts):
+        response = client.get("/api/v1/bank-accounts", params={"min_balance": "10"})
+
+        assert response.status_code == 400
+
+    def test_total_count(self, client, db_session, accounts):
+        response = client.get("/api/v1/bank-accounts", params={"limit": 1, "account_type": "USER", "with_count": True})
+
+        assert response.headers["X-Total-Count"] == "1"
+        # sqlite keeps no planner statistics, so the count is exact there.
+        assert response.headers["X-Total-Count-Exact"] == "true"
+        assert "X-Total-Count" not in client.get("/api/v1/bank-accounts").headers
+
+    def test_invalid_cursor(self, client, db_session, accounts):
+        assert client.get("/api/v1/bank-accounts", params={"after": "not-a-cursor"}).status_code == 400
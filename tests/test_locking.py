@@ -0,0 +1,74 @@
+import uuid
+import pytest
+from decimal import Decimal
+from sqlalchemy.exc import OperationalError
+from api.models.bank_account import BankAccount
+from api.database import locking
+from api.database.locking import lock_accounts, retry_on_lock_conflict, lock_stats
+from tests.conftests import db_session, engine, tables
+
+
+class DeadlockDetected(Exception):
+    pgcode = "40P01"
+
+
+def deadlock_error():
+    return OperationalError("UPDATE bank_accounts ...", {}, DeadlockDetected("deadlock detected"))
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(locking, "_backoff_seconds", lambda attempt: 0)
+    lock_stats.reset()
+
+
+class TestLocking:
+
+    def test_lock_accounts_returns_existing_accounts_by_id(self, db_session):
+        accounts = [BankAccount(account_number=str(uuid.uuid4()), balance=Decimal('10')) for _ in range(2)]
+        db_session.add_all(accounts)
+        db_session.flush()
+
+        locked = lock_accounts(db_session, [accounts[1].id, accounts[0].id, 999999, None])
+
+        assert set(locked) == {accounts[0].id, accounts[1].id}
+        assert lock_stats.snapshot()["lock_acquisitions"] == 1
+
+    def test_retry_on_lock_conflict_retries_deadlocks(self):
+        calls = []
+
+        @retry_on_lock_conflict
+        def movement():
+            calls.append(1)
+            if len(calls) < 3:
+                raise deadlock_error()
+            return "done"
+
+        assert movement() == "done"
+        assert len(calls) == 3
+        assert lock_stats.snapshot()["retries"] == 2
+
+    def test_retry_on_lock_conflict_is_bounded(self):
+        @retry_on_lock_conflict
+        def movement():
+            raise deadlock_error()
+
+        with pytest.raises(OperationalError):
+            movement()
+
+        snapshot = lock_stats.snapshot()
+        assert snapshot["conflicts"] == locking.LOCK_RETRY_MAX_ATTEMPTS
+        assert snapshot["exhausted"] == 1
+
+    def test_retry_on_lock_conflict_ignores_other_errors(self):
+        calls = []
+
+        @retry_on_lock_conflict
+        def movement():
+            calls.append(1)
+            raise OperationalError("SELECT 1", {}, Exception("no such table"))
+
+        with pytest.raises(OperationalError):
+            movement()
+
+        assert len(calls) == 1
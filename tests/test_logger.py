@@ -0,0 +1,113 @@
+import io
+import json
+import logging
+import queue
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from api.utils.logger import (
+    CorrelationIdMiddleware,
+    DroppingQueueHandler,
+    SamplingFilter,
+    configure_logging,
+    correlation_id,
+    stop_logging,
+)
+
+
+@pytest.fixture
+def log_output():
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    output = io.StringIO()
+    yield output
+    stop_logging()
+    root.handlers, root.level = handlers, level
+
+
+def records(output: io.StringIO):
+    return [json.loads(line) for line in output.getvalue().splitlines()]
+
+
+class TestStructuredLogging:
+
+    def test_records_are_written_as_json_by_the_writer_thread(self, log_output):
+        configure_logging(level="INFO", log_format="json", sample_rates={}, stream=log_output)
+        logger = logging.getLogger("api.tests.json")
+
+        token = correlation_id.set("req-1")
+        try:
+            logger.info("Deposit %s to account %s", "10.00", 7)
+            logger.debug("Not written: %s", "below the level")
+            try:
+                raise ValueError("boom")
+            except ValueError:
+                logger.exception("Failed")
+        finally:
+            correlation_id.reset(token)
+        stop_logging()
+
+        written = records(log_output)
+        assert [record["message"] for record in written] == ["Deposit 10.00 to account 7", "Failed"]
+        assert written[0]["logger"] == "api.tests.json"
+        assert written[0]["level"] == "INFO"
+        assert all(record["correlation_id"] == "req-1" for record in written)
+        assert "ValueError: boom" in written[1]["exception"]
+
+    def test_debug_lines_are_sampled_per_logger(self, log_output):
+        configure_logging(level="DEBUG", log_format="json", sample_rates={"api.tests.sampled": 0}, stream=log_output)
+
+        for _ in range(10):
+            logging.getLogger("api.tests.sampled.child").debug("dropped")
+            logging.getLogger("api.tests.other").debug("kept")
+        logging.getLogger("api.tests.sampled").info("not sampled above DEBUG")
+        stop_logging()
+
+        assert [record["message"] for record in records(log_output)] == ["kept"] * 10 + ["not sampled above DEBUG"]
+
+    def test_sampling_rate_resolution(self):
+        sampling = SamplingFilter({"api": 0.5, "api.services": 0.1})
+
+        assert sampling.rate_for("api.services.transaction_service") == 0.1
+        assert sampling.rate_for("api.dao.bank_account_dao") == 0.5
+        assert sampling.rate_for("apix") == 1.0
+
+    def test_full_queue_drops_records_without_blocking(self):
+        handler = DroppingQueueHandler(queue.Queue(1))
+        logger = logging.getLogger("api.tests.full")
+        logger.addHandler(handler)
+        logger.propagate = False
+        try:
+            for index in range(3):
+                logger.warning("record %d", index)
+        finally:
+            logger.removeHandler(handler)
+            logger.propagate = True
+
+        assert handler.queue.get_nowait().msg == "record 0"
+        assert handler.dropped == 2
+
+
+class TestCorrelationIdMiddleware:
+
+    def _client(self):
+        app = FastAPI()
+        app.add_middleware(CorrelationIdMiddleware)
+
+        @app.get("/whoami")
+        def whoami():
+            return {"correlation_id": correlation_id.get()}
+
+        return TestClient(app)
+
+    def test_request_id_is_propagated(self):
+        response = self._client().get("/whoami", headers={"X-Request-ID": "abc-123"})
+
+        assert response.json() == {"correlation_id": "abc-123"}
+        assert response.headers["X-Request-ID"] == "abc-123"
+
+    def test_request_id_is_generated(self):
+        response = self._client().get("/whoami")
+
+        assert len(response.headers["X-Request-ID"]) == 32
+        assert response.json()["correlation_id"] == response.headers["X-Request-ID"]
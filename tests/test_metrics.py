@@ -0,0 +1,91 @@
+import pytest
+from decimal import Decimal
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from api.dao.bank_account_dao import BankAccountDAO
+from api.dao.transaction_dao import TransactionDAO
+from api.models.transaction import TransactionType
+from api.services.bank_account_service import BankAccountService
+from api.services.transaction_service import TransactionService
+from api.utils.exceptions import InsufficientFundsError
+from api.utils.metrics import MetricsMiddleware, PHASES, render_metrics
+from tests.conftests import db_session, engine, tables
+from tests.fixtures import cash_holding_account, system_customer, user_account
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+@pytest.fixture
+def transaction_service():
+    return TransactionService(BankAccountService(BankAccountDAO()), TransactionDAO())
+
+
+class TestMetricsMiddleware:
+
+    def test_requests_are_labelled_with_the_route_template(self):
+        app = FastAPI()
+        app.add_middleware(MetricsMiddleware)
+
+        @app.get("/items/{item_id}")
+        def get_item(item_id: int):
+            if item_id == 0:
+                raise HTTPException(status_code=404)
+            return {"id": item_id}
+
+        ok = dict(method="GET", route="/items/{item_id}", status="200")
+        missing = dict(method="GET", route="/items/{item_id}", status="404")
+        unmatched = dict(method="GET", route="unmatched", status="404")
+        before = [sample("http_request_duration_seconds_count", **labels) for labels in (ok, missing, unmatched)]
+
+        client = TestClient(app)
+        client.get("/items/1")
+        client.get("/items/2")
+        client.get("/items/0")
+        client.get("/nowhere")
+
+        after = [sample("http_request_duration_seconds_count", **labels) for labels in (ok, missing, unmatched)]
+        assert [a - b for a, b in zip(after, before)] == [2, 1, 1]
+
+
+class TestTransactionMetrics:
+
+    def test_movements_are_counted_and_timed(self, db_session, cash_holding_account, user_account, transaction_service):
+        phases_before = {phase: sample("bank_transaction_phase_duration_seconds_count", phase=phase) for phase in PHASES}
+        completed = sample("bank_transactions_total", transaction_type="DEPOSIT", outcome="completed")
+        failed = sample("bank_transactions_total", transaction_type="TRANSFER", outcome="failed")
+
+        transaction_service.create_deposit_transaction(
+            db_session, amount=Decimal("10"), source_account_id=cash_holding_account.id, destination_account_id=user_account.id
+        )
+        with pytest.raises(InsufficientFundsError):
+            transaction_service.create_transfer(
+                db_session, amount=Decimal("5000"), source_account_id=user_account.id, destination_account_id=cash_holding_account.id
+            )
+
+        assert sample("bank_transactions_total", transaction_type="DEPOSIT", outcome="completed") == completed + 1
+        assert sample("bank_transactions_total", transaction_type="TRANSFER", outcome="failed") == failed + 1
+        for phase in PHASES:
+            assert sample("bank_transaction_phase_duration_seconds_count", phase=phase) > phases_before[phase]
+
+    def test_idempotent_replays_are_counted_apart(self, db_session, cash_holding_account, user_account, transaction_service):
+        completed = sample("bank_transactions_total", transaction_type="DEPOSIT", outcome="completed")
+        replayed = sample("bank_transactions_total", transaction_type="DEPOSIT", outcome="replayed")
+
+        for _ in range(2):
+            transaction_service.create_deposit_transaction(
+                db_session, amount=Decimal("10"), source_account_id=cash_holding_account.id,
+                destination_account_id=user_account.id, idempotency_key="replayed-deposit",
+            )
+
+        assert sample("bank_transactions_total", transaction_type="DEPOSIT", outcome="completed") == completed + 1
+        assert sample("bank_transactions_total", transaction_type="DEPOSIT", outcome="replayed") == replayed + 1
+
+    def test_metrics_are_rendered_in_the_text_format(self):
+        content, content_type = render_metrics()
+
+        assert content_type.startswith("text/plain")
+        assert b"# TYPE bank_transaction_phase_duration_seconds histogram" in content
+        assert b"# TYPE http_request_duration_seconds histogram" in content
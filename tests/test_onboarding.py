@@ -0,0 +1,154 @@
+import anyio
+import json
+import os
+import pytest
+from decimal import Decimal
+
+os.environ.setdefault("ENVIRONMENT", "local")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from api.controllers.bank_account_controller import router as account_router
+from api.controllers.customer_controller import router as customer_router
+from api.database.base import Base
+from api.database.session import get_db
+from api.models.administrative_entity import AdministrativeEntity
+from api.models.bank_account import AccountType, BankAccount
+from api.models.customer import Customer
+from api.models.ledger_entry import LedgerEntry
+from api.services.onboarding_service import OnboardingService
+from api.utils.bulk import BulkItems, bulk_response
+from tests.conftests import db_session, engine, tables
+
+
+class TestOnboardingService:
+
+    def test_customers_are_inserted_per_chunk(self, db_session):
+        items = [{"customer_name": f"Customer {index}"} for index in range(5)]
+        items.insert(2, {"customer_name": ""})
+        items.insert(4, {"name": "typo"})
+
+        results = list(OnboardingService(chunk_size=3).create_customers(db_session, items))
+
+        assert [result.index for result in results] == list(range(7))
+        assert [result.status for result in results] == ["CREATED", "CREATED", "FAILED", "CREATED", "FAILED", "CREATED", "CREATED"]
+        assert results[4].error.startswith("customer_name")
+        # Ids come back in row order.
+        names = {customer.id: customer.customer_name for customer in db_session.scalars(select(Customer)).all()}
+        assert [names[result.id] for result in results if result.id] == [f"Customer {index}" for index in range(5)]
+
+    def test_accounts_get_numbers_and_opening_entries(self, db_session):
+        customer = Customer(customer_name="Ada")
+        entity = AdministrativeEntity(tax_id="1", corporate_name="Bank")
+        db_session.add_all([customer, entity])
+        db_session.flush()
+        items = [
+            {"owner_id": customer.id, "balance": 10.5, "account_type": "USER", "status": "ACTIVE"},
+            {"owner_id": entity.id, "balance": 0, "account_type": "ADMINISTRATIVE", "status": "ACTIVE"},
+            {"owner_id": 999, "balance": 1, "account_type": "USER", "status": "ACTIVE"},
+            {"owner_id": customer.id, "balance": 1, "account_type": "SAVINGS", "status": "ACTIVE"},
+        ]
+
+        results = list(OnboardingService().create_accounts(db_session, items))
+
+        assert [result.status for result in results] == ["CREATED", "CREATED", "FAILED", "FAILED"]
+        assert results[2].error == "Customer 999 not found."
+        user_account = db_session.get(BankAccount, results[0].id)
+        assert user_account.account_number == results[0].account_number
+        assert user_account.account_number.startswith("C")
+        assert user_account.customer_id == customer.id
+        assert user_account.balance == Decimal("10.50")
+        assert db_session.get(BankAccount, results[1].id).administrative_entity_id == entity.id
+        entries = db_session.scalars(select(LedgerEntry).where(LedgerEntry.account_id.in_([results[0].id, results[1].id]))).all()
+        assert [(entry.account_id, entry.amount) for entry in entries] == [(results[0].id, Decimal("10.50"))]
+
+
+class TestBulkEndpoints:
+
+    @pytest.fixture
+    def client(self):
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Base.metadata.create_all(engine)
+        session_factory = sessionmaker(bind=engine, autoflush=False)
+
+        def override_get_db():
+            db = session_factory()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app = FastAPI()
+        app.include_router(customer_router, prefix="/api/v1")
+        app.include_router(account_router, prefix="/api/v1")
+        app.dependency_overrides[get_db] = override_get_db
+        yield TestClient(app)
+        engine.dispose()
+
+    def test_json_array(self, client):
+        response = client.post("/api/v1/customers:bulk", json=[{"customer_name": "Ada"}, {"customer_name": "Grace"}])
+
+        assert response.status_code == 200
+        assert response.json()["created"] == 2
+        assert response.json()["failed"] == 0
+
+    def test_ndjson_stream(self, client):
+        customer_id = client.post("/api/v1/customers:bulk", json=[{"customer_name": "Ada"}]).json()["results"][0]["id"]
+        lines = [
+            json.dumps({"owner_id": customer_id, "balance": 5, "account_type": "USER", "status": "ACTIVE"}),
+            "{not json",
+            json.dumps({"owner_id": customer_id, "balance": 7, "account_type": "USER", "status": "ACTIVE"}),
+        ]
+
+        response = client.post(
+            "/api/v1/bank-accounts:bulk", content="\n".join(lines) + "\n",
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+
+        results = [json.loads(line) for line in response.text.splitlines()]
+        assert [result["status"] for result in results] == ["CREATED", "FAILED", "CREATED"]
+        assert all(result["account_number"].startswith("C") for result in results if result["status"] == "CREATED")
+
+    def test_body_must_be_an_array(self, client):
+        assert client.post("/api/v1/customers:bulk", json={"customer_name": "Ada"}).status_code == 400
+
+
+class TestStreamedBulkRequests:
+
+    @pytest.fixture
+    def thread_safe_session(self):
+        # The rows are read and inserted on a worker thread, as in the sync routes.
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Base.metadata.create_all(engine)
+        with sessionmaker(bind=engine, autoflush=False)() as db:
+            yield db
+        engine.dispose()
+
+    def test_ndjson_rows_are_read_and_answered_as_they_arrive(self, thread_safe_session):
+        db_session = thread_safe_session
+        received = []
+
+        async def chunks():
+            for chunk in (b'{"customer_name": "Ada"}\n{"custo', b'mer_name": "Grace"}\n', b'{"customer_name": "Linus"}'):
+                received.append(chunk)
+                yield chunk
+
+        def first_line_then_rest():
+            items = BulkItems(ndjson=True, chunks=chunks())
+            response = bulk_response(OnboardingService(chunk_size=1).create_customers(db_session, items), ndjson=True)
+            first = next(response.lines)
+            read_before_first_result = len(received)
+            return first, read_before_first_result, list(response.lines)
+
+        async def run_in_worker_thread():
+            return await anyio.to_thread.run_sync(first_line_then_rest)
+
+        first, read_before_first_result, rest = anyio.run(run_in_worker_thread)
+
+        assert json.loads(first)["status"] == "CREATED"
+        assert read_before_first_result == 1
+        assert [json.loads(line)["status"] for line in rest] == ["CREATED", "CREATED"]
+        assert db_session.scalars(select(Customer.customer_name).order_by(Customer.id)).all() == ["Ada", "Grace", "Linus"]
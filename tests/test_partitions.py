@@ -0,0 +1,117 @@
+import pytest
+from datetime import date
+from pathlib import Path
+from sqlalchemy.exc import OperationalError
+from api.database import partitions
+from api.database.partitions import (
+    Partition,
+    add_months,
+    archive_partitions,
+    detach_partition,
+    ensure_partitions,
+    is_partitioned,
+    partition_name,
+)
+from api.models.idempotency_key import IdempotencyKey
+from api.models.ledger_entry import LedgerEntry
+from tests.conftests import db_session, engine, tables
+
+
+class TestPartitions:
+
+    def test_month_arithmetic(self):
+        assert add_months(date(2026, 11, 1), 1) == date(2026, 12, 1)
+        assert add_months(date(2026, 11, 1), 3) == date(2027, 2, 1)
+        assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+        assert Partition("transactions_y2026m12", date(2026, 12, 1)).upper_bound == date(2027, 1, 1)
+
+    def test_partition_name(self):
+        assert partition_name(date(2026, 3, 1)) == "transactions_y2026m03"
+
+    def test_sqlite_keeps_a_plain_table(self, db_session, tmp_path: Path):
+        assert not is_partitioned(db_session)
+        assert ensure_partitions(db_session, months_ahead=3) == []
+        assert archive_partitions(db_session, date(2030, 1, 1), tmp_path / "archive") == []
+        assert not (tmp_path / "archive").exists()
+
+    def test_no_foreign_key_to_the_partitioned_table(self):
+        # Matches the migrated Postgres schema, so autogenerate does not add them back.
+        assert not LedgerEntry.__table__.c.transaction_id.foreign_keys
+        assert not IdempotencyKey.__table__.c.transaction_id.foreign_keys
+
+    def test_detach_retries_after_a_lock_timeout(self, monkeypatch):
+        monkeypatch.setattr(partitions.time, "sleep", lambda seconds: None)
+        db = FakeSession(lock_timeouts=2)
+
+        detach_partition(db, "transactions_y2024m01")
+
+        assert db.statements.count('ALTER TABLE transactions DETACH PARTITION "transactions_y2024m01"') == 3
+        assert all(statement.startswith("SELECT pg_try_advisory_xact_lock") for statement in db.statements[::3])
+        assert all(statement.startswith("SET LOCAL lock_timeout") for statement in db.statements[1::3])
+        assert (db.rollbacks, db.commits) == (2, 1)
+
+    def test_detach_gives_up_after_the_last_attempt(self, monkeypatch):
+        monkeypatch.setattr(partitions.time, "sleep", lambda seconds: None)
+        monkeypatch.setattr(partitions, "TRANSACTION_PARTITION_DDL_ATTEMPTS", 3)
+        db = FakeSession(lock_timeouts=5)
+
+        with pytest.raises(OperationalError):
+            detach_partition(db, "transactions_y2024m01")
+        assert db.rollbacks == 3
+
+    def test_partitions_are_created_by_one_process(self, monkeypatch):
+        monkeypatch.setattr(partitions, "is_partitioned", lambda db: True)
+        monkeypatch.setattr(partitions, "list_partitions", lambda db: [])
+        busy = FakeSession(lock_timeouts=0, maintenance_locked=True)
+        idle = FakeSession(lock_timeouts=0)
+
+        assert ensure_partitions(busy, months_ahead=2, today=date(2026, 11, 5)) == []
+        assert not any("CREATE TABLE" in statement for statement in busy.statements)
+        assert ensure_partitions(idle, months_ahead=2, today=date(2026, 11, 5)) == [
+            "transactions_y2026m11", "transactions_y2026m12", "transactions_y2027m01",
+        ]
+        # One transaction per partition, each under lock_timeout.
+        assert sum("SET LOCAL lock_timeout" in statement for statement in idle.statements) == 3
+        assert idle.commits >= 3
+
+
+class LockNotAvailable(Exception):
+    pgcode = "55P03"
+
+
+class FakeResult:
+
+    def __init__(self, value):
+        self.value = value
+
+    def scalar(self):
+        return self.value
+
+
+class FakeSession:
+    """
+    Records statements; the first lock_timeouts DETACH statements fail as if lock_timeout expired.
+    With maintenance_locked, another process holds the maintenance advisory lock.
+    """
+
+    def __init__(self, lock_timeouts: int, maintenance_locked: bool = False):
+        self.lock_timeouts = lock_timeouts
+        self.maintenance_locked = maintenance_locked
+        self.statements = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    def execute(self, statement, parameters=None):
+        self.statements.append(str(statement))
+        if "pg_try_advisory_xact_lock" in str(statement):
+            return FakeResult(not self.maintenance_locked)
+        if "DETACH" in str(statement) and self.lock_timeouts:
+            self.lock_timeouts -= 1
+            raise OperationalError(str(statement), {}, LockNotAvailable())
+        return FakeResult(None)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
@@ -0,0 +1,45 @@
+import sqlite3
+import pytest
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from api.database.pool_metrics import InstrumentedQueuePool, PoolWaitStats, pool_status, pool_wait_stats
+
+
+@pytest.fixture
+def pool():
+    pool_wait_stats.reset()
+    pool = InstrumentedQueuePool(lambda: sqlite3.connect(":memory:"), pool_size=1, max_overflow=0, timeout=0.05)
+    yield pool
+    pool.dispose()
+
+
+def test_checkouts_are_timed(pool):
+    connection = pool.connect()
+    status = pool_status(pool)
+    connection.close()
+
+    snapshot = pool_wait_stats.snapshot()
+    assert snapshot["wait_count"] == 1
+    assert snapshot["wait_seconds_histogram"]["+Inf"] == 1
+    assert status["pool_class"] == "InstrumentedQueuePool"
+    assert status["size"] == 1
+    assert status["checked_out"] == 1
+    assert pool_status(pool)["checked_in"] == 1
+
+
+def test_exhausted_pool_records_timeout(pool):
+    connection = pool.connect()
+    with pytest.raises(PoolTimeoutError):
+        pool.connect()
+    connection.close()
+
+    snapshot = pool_wait_stats.snapshot()
+    assert snapshot["timeouts"] == 1
+    assert snapshot["wait_count"] == 1
+
+
+def test_histogram_is_cumulative():
+    stats = PoolWaitStats(buckets=(0.01, 0.1))
+    for seconds in (0.001, 0.05, 0.05, 2.0):
+        stats.record_wait(seconds)
+
+    assert stats.snapshot()["wait_seconds_histogram"] == {"0.01": 1, "0.1": 3, "+Inf": 4}
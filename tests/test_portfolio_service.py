@@ -0,0 +1,66 @@
+import uuid
+import pytest
+from decimal import Decimal
+from api.dao.administrative_entity_dao import AdministrativeEntityDAO
+from api.dao.customer_dao import CustomerDAO
+from api.models.account_balance_shard import AccountBalanceShard
+from api.models.administrative_entity import AdministrativeEntity
+from api.models.bank_account import AccountType, BankAccount
+from api.models.customer import Customer
+from api.services.administrative_entity_service import AdministrativeEntityService
+from api.services.customer_service import CustomerService
+from tests.conftests import db_session, engine, tables, query_counter
+
+
+def open_accounts(db_session, account_type, balances, **owner):
+    accounts = [
+        BankAccount(account_number=str(uuid.uuid4()), balance=Decimal(balance), account_type=account_type, **owner)
+        for balance in balances
+    ]
+    db_session.add_all(accounts)
+    db_session.flush()
+    return accounts
+
+
+class TestPortfolios:
+
+    def test_customer_portfolio_in_two_queries(self, db_session, query_counter):
+        customer = Customer(customer_name="Ada")
+        db_session.add(customer)
+        db_session.flush()
+        accounts = open_accounts(db_session, AccountType.USER, ["0.10", "0.20", "0.40"], customer_id=customer.id)
+        db_session.expunge_all()
+        query_counter.clear()
+
+        portfolio = CustomerService(CustomerDAO()).get_customer_portfolio(db_session, customer.id)
+
+        assert len(query_counter) == 2, query_counter
+        assert [account.id for account in portfolio.accounts] == [account.id for account in accounts]
+        # Summed as Decimal: adding the float balances would give 0.7000000000000001.
+        assert portfolio.total_balance == 0.7
+
+    def test_entity_portfolio_includes_shards_in_two_queries(self, db_session, query_counter):
+        entity = AdministrativeEntity(tax_id="123", corporate_name="Bank")
+        db_session.add(entity)
+        db_session.flush()
+        cash_holding, cash_disbursement = open_accounts(
+            db_session, AccountType.ADMINISTRATIVE, ["100", "200"], administrative_entity_id=entity.id
+        )
+        db_session.add_all([
+            AccountBalanceShard(account_id=cash_holding.id, shard_index=index, balance=Decimal("5"))
+            for index in range(3)
+        ])
+        db_session.flush()
+        db_session.expunge_all()
+        query_counter.clear()
+
+        portfolio = AdministrativeEntityService(AdministrativeEntityDAO()).get_administrative_entity_portfolio(db_session, entity.id)
+
+        assert len(query_counter) == 2, query_counter
+        assert [account.balance for account in portfolio.accounts] == [115.0, 200.0]
+        assert portfolio.total_balance == 315.0
+
+    def test_missing_owners(self, db_session):
+        assert CustomerService(CustomerDAO()).get_customer_portfolio(db_session, 999) is None
+        with pytest.raises(ValueError):
+            AdministrativeEntityService(AdministrativeEntityDAO()).get_administrative_entity_portfolio(db_session, 999)
@@ -0,0 +1,91 @@
+import logging
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from api.database import query_stats
+from api.database.query_stats import QueryStatsMiddleware, instrument_engine, parameter_shape, track_queries
+from api.models.bank_account import AccountType, BankAccount
+from api.models.customer import Customer
+from tests.conftests import db_session, engine, tables
+
+
+@pytest.fixture
+def instrumented_engine():
+    engine = instrument_engine(
+        create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    )
+    yield engine
+    engine.dispose()
+
+
+class TestQueryStats:
+
+    def test_statements_are_counted_per_context(self, instrumented_engine):
+        with instrumented_engine.connect() as connection:
+            with track_queries() as stats:
+                connection.execute(text("SELECT 1"))
+                connection.execute(text("SELECT 2"))
+            connection.execute(text("SELECT 3"))
+
+        assert stats.statements == 2
+        assert stats.seconds > 0
+
+    def test_request_headers(self, instrumented_engine):
+        session_factory = sessionmaker(bind=instrumented_engine)
+
+        def get_session():
+            with session_factory() as db:
+                yield db
+
+        app = FastAPI()
+        app.add_middleware(QueryStatsMiddleware)
+
+        @app.get("/numbers")
+        def numbers(db=Depends(get_session)):
+            return [db.execute(text(f"SELECT {value}")).scalar_one() for value in range(3)]
+
+        response = TestClient(app).get("/numbers")
+
+        assert response.json() == [0, 1, 2]
+        assert response.headers["X-DB-Query-Count"] == "3"
+        assert float(response.headers["X-DB-Query-Time-Ms"]) > 0
+
+    def test_slow_queries_are_logged_without_values(self, instrumented_engine, monkeypatch, caplog):
+        monkeypatch.setattr(query_stats, "SLOW_QUERY_THRESHOLD_MS", 1e-6)
+
+        with caplog.at_level(logging.WARNING, logger="api.database.query_stats"):
+            with instrumented_engine.connect() as connection:
+                connection.execute(text("SELECT :number, :name"), {"number": 42, "name": "C0000000012344"})
+
+        assert "SELECT ?, ?" in caplog.text
+        assert "parameters: (int, str)" in caplog.text
+        assert "C0000000012344" not in caplog.text
+
+    def test_parameter_shape(self):
+        assert parameter_shape({"id": 1, "amount": 2.5}) == "{id: int, amount: float}"
+        assert parameter_shape([(1, "a"), (2, "b")], executemany=True) == "2 x (int, str)"
+
+
+class TestStrictLoading:
+
+    def test_lazy_loading_accounts_raises(self, db_session):
+        customer = Customer(customer_name="Ada")
+        db_session.add(customer)
+        db_session.flush()
+        db_session.add(BankAccount(
+            account_number="C1", balance=0, account_type=AccountType.USER, status="ACTIVE", customer_id=customer.id,
+        ))
+        db_session.flush()
+        db_session.expunge_all()
+
+        customer = db_session.scalars(select(Customer)).one()
+        with pytest.raises(InvalidRequestError):
+            customer.bank_accounts
+
+        account = db_session.scalars(select(BankAccount)).one()
+        # The owner is already in the identity map: no SQL needed, so no error.
+        assert account.customer is customer
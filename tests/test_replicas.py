@@ -0,0 +1,115 @@
+import os
+import threading
+import pytest
+
+os.environ.setdefault("ENVIRONMENT", "local")
+
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session, sessionmaker
+from api.database import session as session_module
+from api.database.replicas import ReplicaRouter
+
+
+def database_name(db: Session) -> str:
+    return db.execute(text("SELECT name FROM origin")).scalar_one()
+
+
+@pytest.fixture
+def engines(tmp_path):
+    engines = {}
+    for name in ("primary", "replica"):
+        engine = create_engine(f"sqlite:///{tmp_path / name}.db", connect_args={"check_same_thread": False})
+        with engine.begin() as connection:
+            connection.execute(text("CREATE TABLE origin (name TEXT)"))
+            connection.execute(text("INSERT INTO origin VALUES (:name)"), {"name": name})
+        engines[name] = engine
+    yield engines
+    for engine in engines.values():
+        engine.dispose()
+
+
+def make_router(engines, lag, max_lag_seconds=5.0):
+    def lag_probe(connection):
+        if isinstance(lag, Exception):
+            raise lag
+        return lag
+
+    return ReplicaRouter(
+        sessionmaker(bind=engines["primary"]), [engines["replica"]],
+        max_lag_seconds=max_lag_seconds, lag_check_interval=60, lag_probe=lag_probe,
+    )
+
+
+def test_reads_go_to_a_fresh_replica(engines):
+    router = make_router(engines, lag=0.5)
+
+    with router.choose()() as db:
+        assert database_name(db) == "replica"
+    with router.choose(prefer_primary=True)() as db:
+        assert database_name(db) == "primary"
+
+
+@pytest.mark.parametrize("lag", [30.0, None, RuntimeError("replica is down")])
+def test_stale_or_failing_replica_falls_back_to_primary(engines, lag):
+    router = make_router(engines, lag=lag)
+
+    with router.choose()() as db:
+        assert database_name(db) == "primary"
+
+
+def test_read_from_header(engines, monkeypatch):
+    monkeypatch.setattr(session_module, "replica_router", make_router(engines, lag=0.0))
+    app = FastAPI()
+
+    @app.get("/origin")
+    def origin(db: Session = Depends(session_module.get_read_db)):
+        return database_name(db)
+
+    client = TestClient(app)
+    assert client.get("/origin").json() == "replica"
+    assert client.get("/origin", headers={"X-Read-From": "primary"}).json() == "primary"
+    assert client.get("/origin", headers={"X-Read-From": "elsewhere"}).status_code == 422
+
+
+def test_expired_lag_is_checked_by_one_request_at_a_time(engines):
+    probing = threading.Event()
+    release = threading.Event()
+    probes = []
+
+    def slow_probe(connection):
+        probes.append(threading.current_thread().name)
+        probing.set()
+        release.wait(5)
+        return 0.0
+
+    router = ReplicaRouter(
+        sessionmaker(bind=engines["primary"]), [engines["replica"]],
+        max_lag_seconds=5.0, lag_check_interval=60, lag_probe=slow_probe,
+    )
+    checking = threading.Thread(target=router.replica_lag, args=(0,))
+    checking.start()
+    probing.wait(5)
+
+    # While the check is running, other requests use the previous (unknown) lag: the primary.
+    with router.choose()() as db:
+        assert database_name(db) == "primary"
+    release.set()
+    checking.join(5)
+
+    assert len(probes) == 1
+    assert router.replica_lag(0) == 0.0
+
+
+def test_background_checks_keep_requests_off_the_replica_connection(engines):
+    router = make_router(engines, lag=RuntimeError("requests must not probe"))
+    router.background_checks = True
+
+    with router.choose()() as db:
+        assert database_name(db) == "primary"
+
+    router.lag_probe = lambda connection: 0.5
+    router.refresh()
+    with router.choose()() as db:
+        assert database_name(db) == "replica"
@@ -0,0 +1,131 @@
+import pytest
+from datetime import date, datetime
+from decimal import Decimal
+from api.dao.rollup_dao import RollupDAO
+from api.models.ledger_entry import EntryType
+from api.models.transaction import Transaction, TransactionType
+from api.services import reporting_service
+from api.services.reporting_service import DAILY_ROLLUP, ReportingService
+from api.utils.exceptions import AccountNotFoundError
+from tests.conftests import db_session, engine, tables
+from tests.fixtures import cash_disbursement_account, cash_holding_account, system_customer, user_account
+
+
+@pytest.fixture
+def reporting():
+    return ReportingService()
+
+
+def add_transaction(db_session, amount, transaction_type, source, destination, timestamp, xid=0):
+    transaction = Transaction(
+        amount=Decimal(amount),
+        transaction_type=transaction_type,
+        source_account_id=source.id,
+        destination_account_id=destination.id,
+        timestamp=timestamp,
+        xid=xid,
+    )
+    db_session.add(transaction)
+    db_session.flush()
+    return transaction
+
+
+def summary(report):
+    return [
+        (row.day, row.transaction_type, row.entry_type, row.transaction_count, row.total_amount, row.min_amount, row.max_amount)
+        for row in report.days
+    ]
+
+
+class TestReportingService:
+
+    def test_catch_up_rolls_up_admin_accounts_per_day(
+        self, db_session, reporting, cash_holding_account, cash_disbursement_account, user_account
+    ):
+        first_day, second_day = datetime(2026, 3, 1, 9), datetime(2026, 3, 2, 9)
+        add_transaction(db_session, 100, TransactionType.DEPOSIT, cash_holding_account, user_account, first_day)
+        add_transaction(db_session, 50, TransactionType.DEPOSIT, cash_holding_account, user_account, first_day)
+        add_transaction(db_session, 20, TransactionType.DEPOSIT, cash_holding_account, user_account, second_day)
+        last = add_transaction(db_session, 30, TransactionType.WITHDRAW, user_account, cash_disbursement_account, second_day)
+
+        assert reporting.catch_up(db_session, batch_size=3) == (0, last.id)
+
+        holding = reporting.get_daily_volume(db_session, cash_holding_account.id, start_day=date(2026, 3, 1), end_day=date(2026, 3, 31))
+        assert holding.rolled_up_at is not None
+        assert summary(holding) == [
+            (date(2026, 3, 1), TransactionType.DEPOSIT, EntryType.DEBIT, 2, 150.0, 50.0, 100.0),
+            (date(2026, 3, 2), TransactionType.DEPOSIT, EntryType.DEBIT, 1, 20.0, 20.0, 20.0),
+        ]
+        disbursement = reporting.get_daily_volume(
+            db_session, cash_disbursement_account.id, start_day=date(2026, 3, 2), end_day=date(2026, 3, 2)
+        )
+        assert summary(disbursement) == [(date(2026, 3, 2), TransactionType.WITHDRAW, EntryType.CREDIT, 1, 30.0, 30.0, 30.0)]
+        assert {row.account_id for row in reporting.get_daily_volume(db_session, end_day=date(2026, 3, 2)).days} == {
+            cash_holding_account.id, cash_disbursement_account.id,
+        }
+
+    def test_catch_up_merges_into_existing_rollups(self, db_session, reporting, cash_holding_account, user_account):
+        day = datetime(2026, 3, 1, 9)
+        add_transaction(db_session, 100, TransactionType.DEPOSIT, cash_holding_account, user_account, day)
+        reporting.catch_up(db_session)
+        add_transaction(db_session, 10, TransactionType.DEPOSIT, cash_holding_account, user_account, day)
+        reporting.catch_up(db_session)
+
+        report = reporting.get_daily_volume(
+            db_session, cash_holding_account.id, end_day=date(2026, 3, 1), transaction_type=TransactionType.DEPOSIT
+        )
+
+        assert summary(report) == [(date(2026, 3, 1), TransactionType.DEPOSIT, EntryType.DEBIT, 2, 110.0, 10.0, 100.0)]
+
+    def test_late_commit_is_rolled_up_by_the_next_run(self, db_session, reporting, monkeypatch, cash_holding_account, user_account):
+        day = datetime(2026, 3, 1, 9)
+        # The transaction with the lower id was written by a database transaction that committed later (higher xid).
+        late = add_transaction(db_session, 10, TransactionType.DEPOSIT, cash_holding_account, user_account, day, xid=12)
+        early = add_transaction(db_session, 20, TransactionType.DEPOSIT, cash_holding_account, user_account, day, xid=10)
+
+        # Transaction 11 is still running: only what was written below it is rolled up.
+        monkeypatch.setattr(reporting_service, "settled_xid_horizon", lambda db: 11)
+        assert reporting.catch_up(db_session) == (10, early.id)
+        assert summary(reporting.get_daily_volume(db_session, cash_holding_account.id, end_day=day.date()))[0][3:5] == (1, 20.0)
+
+        monkeypatch.setattr(reporting_service, "settled_xid_horizon", lambda db: 13)
+        assert reporting.catch_up(db_session) == (12, late.id)
+        assert summary(reporting.get_daily_volume(db_session, cash_holding_account.id, end_day=day.date()))[0][3:5] == (2, 30.0)
+
+    def test_rolled_up_at_is_the_time_everything_committed_before_is_included(self, db_session, reporting, monkeypatch):
+        assert reporting.get_daily_volume(db_session).rolled_up_at is None
+
+        monkeypatch.setattr(reporting_service, "settled_before", lambda db: datetime(2026, 3, 1, 12))
+        reporting.catch_up(db_session)
+        assert reporting.get_daily_volume(db_session).rolled_up_at == datetime(2026, 3, 1, 12)
+
+        # A run that started earlier but finished later does not move it back.
+        monkeypatch.setattr(reporting_service, "settled_before", lambda db: datetime(2026, 3, 1, 11))
+        reporting.catch_up(db_session)
+        assert reporting.get_daily_volume(db_session).rolled_up_at == datetime(2026, 3, 1, 12)
+
+    def test_watermark_moved_concurrently(self, db_session):
+        rollup_dao = RollupDAO()
+
+        assert rollup_dao.advance_watermark(db_session, DAILY_ROLLUP, (0, 0), (0, 10))
+        assert not rollup_dao.advance_watermark(db_session, DAILY_ROLLUP, (0, 0), (0, 5))
+        assert rollup_dao.get_watermark_position(db_session, DAILY_ROLLUP) == (0, 10)
+
+    def test_reports_cover_a_bounded_range_of_days(self, db_session, reporting, monkeypatch, cash_holding_account, user_account):
+        add_transaction(db_session, 10, TransactionType.DEPOSIT, cash_holding_account, user_account, datetime.utcnow())
+        add_transaction(db_session, 20, TransactionType.DEPOSIT, cash_holding_account, user_account, datetime(2020, 1, 1))
+        reporting.catch_up(db_session)
+
+        # Without a range: the last REPORT_DEFAULT_DAYS days only.
+        assert [row.total_amount for row in reporting.get_daily_volume(db_session, cash_holding_account.id).days] == [10.0]
+        monkeypatch.setattr(reporting_service, "REPORT_MAX_DAYS", 30)
+        with pytest.raises(ValueError):
+            reporting.get_daily_volume(db_session, start_day=date(2026, 3, 1), end_day=date(2026, 3, 31))
+        with pytest.raises(ValueError):
+            reporting.get_daily_volume(db_session, start_day=date(2026, 3, 2), end_day=date(2026, 3, 1))
+
+    def test_only_administrative_accounts_are_reported(self, db_session, reporting, user_account):
+        with pytest.raises(ValueError):
+            reporting.get_daily_volume(db_session, user_account.id)
+        with pytest.raises(AccountNotFoundError):
+            reporting.get_daily_volume(db_session, user_account.id + 1000)
@@ -0,0 +1,95 @@
+import re
+import pytest
+from datetime import datetime, timedelta
+from decimal import Decimal
+from api.dao.transaction_dao import TransactionDAO
+from api.models.transaction import Transaction, TransactionType
+from tests.conftests import db_session, engine, tables
+from tests.fixtures import cash_holding_account, system_customer, user_account
+
+
+@pytest.fixture
+def transaction_dao():
+    return TransactionDAO()
+
+
+@pytest.fixture
+def history(db_session, cash_holding_account, user_account):
+    start = datetime(2024, 1, 1)
+    transactions = [
+        Transaction(
+            amount=Decimal(index + 1),
+            transaction_type=TransactionType.DEPOSIT,
+            source_account_id=cash_holding_account.id,
+            destination_account_id=user_account.id,
+            # two transactions share each timestamp, so the id has to break ties
+            timestamp=start + timedelta(minutes=index // 2),
+        )
+        for index in range(5)
+    ]
+    db_session.add_all(transactions)
+    db_session.flush()
+    return transactions
+
+
+def query_plan(db_session, stmt):
+    """Run EXPLAIN QUERY PLAN (SQLite) for a statement and return the plan details."""
+    compiled = stmt.compile(db_session.get_bind())
+    params = compiled.construct_params()
+    values = tuple(
+        str(params[name]) if isinstance(params[name], datetime) else params[name]
+        for name in compiled.positiontup
+    )
+    rows = db_session.connection().exec_driver_sql("EXPLAIN QUERY PLAN " + str(compiled), values).all()
+    return [row[-1] for row in rows]
+
+
+class TestTransactionDAO:
+
+    def test_keyset_pages_cover_history_in_order(self, db_session, transaction_dao, user_account, history):
+        seen = []
+        after = None
+        while True:
+            page = transaction_dao.get_transactions_page(db_session, user_account.id, 2, after=after)
+            seen.extend(transaction.id for transaction in page)
+            if len(page) < 2:
+                break
+            after = (page[-1].timestamp, page[-1].id)
+
+        assert seen == [transaction.id for transaction in history]
+
+    def test_stream_transactions_yields_rows_after_cursor(self, db_session, transaction_dao, user_account, history):
+        after = (history[1].timestamp, history[1].id)
+
+        rows = list(transaction_dao.stream_transactions(db_session, user_account.id, batch_size=2, after=after))
+
+        assert [row.id for row in rows] == [transaction.id for transaction in history[2:]]
+        assert rows[0].amount == Decimal('3')
+
+    @pytest.mark.parametrize("after", [None, (datetime(2024, 1, 1), 1)])
+    def test_history_query_uses_account_indexes(self, db_session, transaction_dao, user_account, after):
+        plan = query_plan(db_session, transaction_dao._history_query(user_account.id, after=after, limit=10))
+
+        assert any(re.search(r"SEARCH transactions USING .*INDEX ix_transactions_source_account_id_timestamp_id", step) for step in plan)
+        assert any(re.search(r"SEARCH transactions USING .*INDEX ix_transactions_destination_account_id_timestamp_id", step) for step in plan)
+        assert not any(step.startswith("SCAN transactions") for step in plan)
+
+    def test_history_returns_self_transfers_once(self, db_session, transaction_dao, user_account):
+        db_session.add(Transaction(
+            amount=Decimal('1'),
+            transaction_type=TransactionType.TRANSFER,
+            source_account_id=user_account.id,
+            destination_account_id=user_account.id,
+        ))
+        db_session.flush()
+
+        assert len(transaction_dao.get_transactions_by_account_id(db_session, user_account.id)) == 1
+
+    def test_history_is_bounded_by_since_and_until(self, db_session, transaction_dao, user_account, history):
+        since, until = history[2].timestamp, history[4].timestamp
+
+        page = transaction_dao.get_transactions_page(db_session, user_account.id, 10, since=since, until=until)
+        rows = list(transaction_dao.stream_transactions(db_session, user_account.id, batch_size=2, since=since))
+
+        assert [transaction.id for transaction in page] == [history[2].id, history[3].id]
+        assert [row.id for row in rows] == [transaction.id for transaction in history[2:]]
@@ -1,15 +1,18 @@
 import uuid
 import pytest
 from decimal import Decimal
-from api.models.bank_account import BankAccount
+from sqlalchemy import delete
+from api.models.bank_account import AccountStatus, BankAccount
 from api.models.transaction import Transaction, TransactionType
 from api.services.transaction_service import TransactionService
-from api.utils.exceptions import InsufficientFundsError, AccountNotFoundError
+from api.schemas.transaction_schema import TransferCreate
+from api.utils.exceptions import InsufficientFundsError, AccountNotFoundError, IdempotencyKeyArchivedError, IdempotencyKeyReuseError
 from api.dao.transaction_dao import TransactionDAO
 from api.services.bank_account_service import BankAccountService
-from tests.conftests import db_session, engine, tables
+from tests.conftests import db_session, engine, tables, query_counter
 from tests.fixtures import cash_holding_account, system_customer, user_account, cash_disbursement_account
 from api.dao.bank_account_dao import BankAccountDAO
+from api.services.idempotency_service import idempotency_cache
 
 
 @pytest.fixture
@@ -31,6 +34,17 @@ def transaction_service(bank_account_service, transaction_dao):
     return TransactionService(bank_account_service, transaction_dao)
 
 
+@pytest.fixture
+def conditional_transaction_service(bank_account_service, transaction_dao):
+    return TransactionService(bank_account_service, transaction_dao, engine_mode="conditional")
+
+
+def _warm_account_metadata(db_session, transaction_service, *accounts):
+    metadata_service = transaction_service.bank_account_service.account_metadata_service
+    for account in accounts:
+        metadata_service.get(db_session, account.id)
+
+
 class TestTransactionService:
     def test_successful_deposit(self, db_session, cash_holding_account, user_account, transaction_service):
         amount = Decimal('100')
@@ -146,3 +160,209 @@ class TestTransactionService:
         assert transaction.amount == amount
         assert transaction.transaction_type == TransactionType.WITHDRAW
         assert transaction.source_account_id == user_account.id
+
+    def test_transfer_batch_settles_all_items(self, db_session, user_account, transaction_service):
+        other_account = BankAccount(
+            account_number=str(uuid.uuid4()),
+            balance=Decimal('500')
+        )
+        db_session.add(other_account)
+        db_session.flush()
+
+        results = transaction_service.create_transfer_batch(db_session, [
+            TransferCreate(amount=100, source_account_id=user_account.id, destination_account_id=other_account.id),
+            TransferCreate(amount=50, source_account_id=other_account.id, destination_account_id=user_account.id),
+        ])
+
+        db_session.refresh(user_account)
+        db_session.refresh(other_account)
+
+        assert [result.status for result in results] == ["COMPLETED", "COMPLETED"]
+        assert all(result.transaction_id is not None for result in results)
+        assert user_account.balance == Decimal('950')
+        assert other_account.balance == Decimal('550')
+
+    def test_transfer_batch_reports_failed_items(self, db_session, user_account, transaction_service):
+        other_account = BankAccount(
+            account_number=str(uuid.uuid4()),
+            balance=Decimal('500')
+        )
+        db_session.add(other_account)
+        db_session.flush()
+
+        results = transaction_service.create_transfer_batch(db_session, [
+            TransferCreate(amount=900, source_account_id=user_account.id, destination_account_id=other_account.id),
+            TransferCreate(amount=200, source_account_id=user_account.id, destination_account_id=other_account.id),
+            TransferCreate(amount=10, source_account_id=user_account.id, destination_account_id=999999),
+        ])
+
+        db_session.refresh(user_account)
+        db_session.refresh(other_account)
+
+        assert [result.status for result in results] == ["COMPLETED", "FAILED", "FAILED"]
+        assert "Insufficient funds" in results[1].error
+        assert "not found" in results[2].error
+        assert user_account.balance == Decimal('100')
+        assert other_account.balance == Decimal('1400')
+        transactions = db_session.query(Transaction).filter(Transaction.source_account_id == user_account.id).all()
+        assert len(transactions) == 1
+
+    def test_transfer_replayed_with_idempotency_key(self, db_session, user_account, cash_holding_account, transaction_service):
+        key = str(uuid.uuid4())
+
+        first = transaction_service.create_transfer(
+            db_session, amount=Decimal('100'), source_account_id=user_account.id,
+            destination_account_id=cash_holding_account.id, idempotency_key=key,
+        )
+        # Replays served from the database as well as from the process cache.
+        idempotency_cache.pop(key)
+        second = transaction_service.create_transfer(
+            db_session, amount=Decimal('100'), source_account_id=user_account.id,
+            destination_account_id=cash_holding_account.id, idempotency_key=key,
+        )
+        third = transaction_service.create_transfer(
+            db_session, amount=Decimal('100'), source_account_id=user_account.id,
+            destination_account_id=cash_holding_account.id, idempotency_key=key,
+        )
+
+        db_session.refresh(user_account)
+
+        assert first.id == second.id == third.id
+        assert user_account.balance == Decimal('900')
+        transactions = db_session.query(Transaction).filter(Transaction.source_account_id == user_account.id).all()
+        assert len(transactions) == 1
+
+    def test_idempotency_key_reused_for_different_request(self, db_session, user_account, cash_holding_account, transaction_service):
+        key = str(uuid.uuid4())
+        transaction_service.create_transfer(
+            db_session, amount=Decimal('100'), source_account_id=user_account.id,
+            destination_account_id=cash_holding_account.id, idempotency_key=key,
+        )
+
+        with pytest.raises(IdempotencyKeyReuseError):
+            transaction_service.create_transfer(
+                db_session, amount=Decimal('200'), source_account_id=user_account.id,
+                destination_account_id=cash_holding_account.id, idempotency_key=key,
+            )
+
+    def test_idempotency_key_of_archived_transaction_is_not_replayed(self, db_session, user_account, cash_holding_account, transaction_service):
+        key = str(uuid.uuid4())
+        transaction = transaction_service.create_transfer(
+            db_session, amount=Decimal('100'), source_account_id=user_account.id,
+            destination_account_id=cash_holding_account.id, idempotency_key=key,
+        )
+        # Archived with its partition: the key stays, the transaction row is gone.
+        db_session.execute(delete(Transaction).where(Transaction.id == transaction.id))
+
+        with pytest.raises(IdempotencyKeyArchivedError):
+            transaction_service.create_transfer(
+                db_session, amount=Decimal('100'), source_account_id=user_account.id,
+                destination_account_id=cash_holding_account.id, idempotency_key=key,
+            )
+
+    def test_transfer_statement_count(self, db_session, user_account, cash_holding_account, transaction_service, query_counter):
+        _warm_account_metadata(db_session, transaction_service, user_account, cash_holding_account)
+        query_counter.clear()
+
+        transaction = transaction_service.create_transfer(
+            db_session, amount=Decimal('100'), source_account_id=user_account.id,
+            destination_account_id=cash_holding_account.id,
+        )
+
+        # Lock both accounts, move both balances, insert the transaction and its ledger entries.
+        assert len(query_counter) == 4, query_counter
+        assert transaction.id is not None
+        assert transaction.timestamp is not None
+
+
+class TestClosedAccounts:
+    def test_transfer_to_closed_account_is_rejected(self, db_session, user_account, cash_holding_account, transaction_service, query_counter):
+        cash_holding_account.status = AccountStatus.CLOSED
+        db_session.flush()
+        query_counter.clear()
+
+        with pytest.raises(ValueError, match="is closed"):
+            transaction_service.create_transfer(
+                db_session, amount=Decimal('100'), source_account_id=user_account.id,
+                destination_account_id=cash_holding_account.id,
+            )
+
+        # Rejected from the account metadata, before any row was locked.
+        assert not any("FOR UPDATE" in statement for statement in query_counter)
+
+    def test_closed_account_is_rechecked_on_the_locked_row(self, db_session, user_account, cash_holding_account, transaction_service):
+        _warm_account_metadata(db_session, transaction_service, user_account, cash_holding_account)
+        cash_holding_account.status = AccountStatus.CLOSED
+        db_session.flush()
+
+        with pytest.raises(ValueError, match="is closed"):
+            transaction_service.create_transfer(
+                db_session, amount=Decimal('100'), source_account_id=user_account.id,
+                destination_account_id=cash_holding_account.id,
+            )
+
+    def test_conditional_withdrawal_from_closed_account_is_rejected(self, db_session, user_account, cash_disbursement_account, conditional_transaction_service):
+        _warm_account_metadata(db_session, conditional_transaction_service, user_account, cash_disbursement_account)
+        user_account.status = AccountStatus.CLOSED
+        db_session.flush()
+
+        with pytest.raises(ValueError, match="is closed"):
+            conditional_transaction_service.create_withdrawal(
+                db_session, amount=Decimal('100'), source_account_id=user_account.id,
+                destination_account_id=cash_disbursement_account.id,
+            )
+
+
+class TestConditionalEngineMode:
+    def test_deposit_and_withdrawal(self, db_session, cash_holding_account, cash_disbursement_account, user_account, conditional_transaction_service):
+        conditional_transaction_service.create_deposit_transaction(
+            db_session, amount=Decimal('100'), source_account_id=cash_holding_account.id,
+            destination_account_id=user_account.id,
+        )
+        transaction = conditional_transaction_service.create_withdrawal(
+            db_session, amount=Decimal('300'), source_account_id=user_account.id,
+            destination_account_id=cash_disbursement_account.id,
+        )
+
+        db_session.refresh(cash_holding_account)
+        db_session.refresh(cash_disbursement_account)
+        db_session.refresh(user_account)
+
+        assert transaction.transaction_type == TransactionType.WITHDRAW
+        assert cash_holding_account.balance == Decimal('9900')
+        assert cash_disbursement_account.balance == Decimal('10300')
+        assert user_account.balance == Decimal('800')
+
+    def test_transfer_without_funds_is_rejected(self, db_session, user_account, cash_holding_account, conditional_transaction_service):
+        with pytest.raises(InsufficientFundsError):
+            conditional_transaction_service.create_transfer(
+                db_session, amount=Decimal('2000'), source_account_id=user_account.id,
+                destination_account_id=cash_holding_account.id,
+            )
+
+    def test_transfer_to_missing_account_is_rejected(self, db_session, user_account, conditional_transaction_service):
+        with pytest.raises(AccountNotFoundError):
+            conditional_transaction_service.create_transfer(
+                db_session, amount=Decimal('10'), source_account_id=user_account.id,
+                destination_account_id=999999,
+            )
+
+    def test_deposit_into_administrative_account_is_rejected(self, db_session, cash_holding_account, cash_disbursement_account, conditional_transaction_service):
+        with pytest.raises(ValueError):
+            conditional_transaction_service.create_deposit_transaction(
+                db_session, amount=Decimal('10'), source_account_id=cash_holding_account.id,
+                destination_account_id=cash_disbursement_account.id,
+            )
+
+    def test_transfer_statement_count(self, db_session, user_account, cash_holding_account, conditional_transaction_service, query_counter):
+        _warm_account_metadata(db_session, conditional_transaction_service, user_account, cash_holding_account)
+        query_counter.clear()
+
+        conditional_transaction_service.create_transfer(
+            db_session, amount=Decimal('100'), source_account_id=user_account.id,
+            destination_account_id=cash_holding_account.id,
+        )
+
+        # One guarded UPDATE per account, the transaction and its ledger entries; no locking SELECT.
+        assert len(query_counter) == 4, query_counter
+        assert not any("FOR UPDATE" in statement for statement in query_counter)